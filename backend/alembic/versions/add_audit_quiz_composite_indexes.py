@@ -0,0 +1,40 @@
+"""add_audit_quiz_composite_indexes
+
+Revision ID: add_audit_quiz_composite_indexes
+Revises: question_type_to_string
+Create Date: 2026-10-16 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'j8k9l0m1n2o3'
+down_revision = 'i7j8k9l0m1n2'
+branch_labels = None
+depends_on = 'add_audit_security_tables'
+
+# (table, single-column index it replaces, composite index, columns). Each composite
+# keeps the old column as its prefix, so equality lookups still use it, and adds
+# timestamp so "recent events for X" is a range scan instead of a sort.
+AUDIT_COMPOSITE_INDEXES = [
+    ('audit_logs', 'idx_audit_logs_client_ip', 'idx_audit_logs_client_ip_ts', ['client_ip', 'timestamp']),
+    ('security_events', 'idx_security_events_type', 'idx_security_events_type_ts', ['event_type', 'timestamp']),
+]
+
+
+def upgrade():
+    for table_name, old_index, new_index, columns in AUDIT_COMPOSITE_INDEXES:
+        op.create_index(new_index, table_name, columns)
+        op.drop_index(old_index, table_name=table_name)
+    
+    # "Has this user attempted this quiz" lookups
+    op.create_index('ix_quiz_attempts_user_quiz', 'quiz_attempts', ['user_id', 'quiz_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_quiz_attempts_user_quiz', table_name='quiz_attempts')
+    
+    for table_name, old_index, new_index, columns in reversed(AUDIT_COMPOSITE_INDEXES):
+        op.create_index(old_index, table_name, columns[:1])
+        op.drop_index(new_index, table_name=table_name)
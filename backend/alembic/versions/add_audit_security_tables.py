@@ -15,73 +15,180 @@ down_revision = None  # Replace with actual previous revision
 branch_labels = None
 depends_on = None
 
+# Monthly RANGE partitions on MySQL: first partition month and how many to pre-create.
+# Later months are added by the roll_monthly_partition() procedure, and retention is
+# a metadata-only ALTER TABLE ... DROP PARTITION instead of a bulk DELETE.
+PARTITION_START = (2025, 1)
+PARTITION_MONTHS = 24
+PARTITIONED_TABLES = ('audit_logs', 'security_events')
+
+
+def _monthly_partitions_sql(start=PARTITION_START, months=PARTITION_MONTHS):
+    """Build the PARTITION BY RANGE clause for monthly timestamp partitions."""
+    year, month = start
+    partitions = []
+    for _ in range(months):
+        next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+        partitions.append(
+            f"PARTITION p{year:04d}{month:02d} "
+            f"VALUES LESS THAN (TO_DAYS('{next_year:04d}-{next_month:02d}-01'))"
+        )
+        year, month = next_year, next_month
+    partitions.append("PARTITION pmax VALUES LESS THAN MAXVALUE")
+    return "PARTITION BY RANGE (TO_DAYS(timestamp)) (\n    " + ",\n    ".join(partitions) + "\n)"
+
+
+# Audit rows repeat the same methods, paths and user agents, so InnoDB page compression
+# roughly halves the pages read by scans. Requires innodb_file_per_table=ON (the default
+# since MySQL 5.6); other dialects ignore these options.
+COMPRESSED_TABLE_KWARGS = {'mysql_row_format': 'COMPRESSED', 'mysql_key_block_size': '8'}
+
+
+ROLL_PARTITION_PROCEDURE = """
+CREATE PROCEDURE roll_monthly_partition(IN tbl VARCHAR(64))
+BEGIN
+    DECLARE next_month DATE;
+
+    SELECT DATE_ADD(MAX(STR_TO_DATE(CONCAT(SUBSTRING(PARTITION_NAME, 2), '01'), '%Y%m%d')), INTERVAL 1 MONTH)
+      INTO next_month
+      FROM INFORMATION_SCHEMA.PARTITIONS
+     WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = tbl AND PARTITION_NAME <> 'pmax';
+
+    SET @ddl = CONCAT(
+        'ALTER TABLE ', tbl, ' REORGANIZE PARTITION pmax INTO (',
+        'PARTITION p', DATE_FORMAT(next_month, '%Y%m'),
+        ' VALUES LESS THAN (TO_DAYS(''', DATE_ADD(next_month, INTERVAL 1 MONTH), ''')), ',
+        'PARTITION pmax VALUES LESS THAN MAXVALUE)'
+    );
+    PREPARE stmt FROM @ddl;
+    EXECUTE stmt;
+    DEALLOCATE PREPARE stmt;
+END
+"""
+
 
 def upgrade():
+    # MySQL cannot partition tables that take part in foreign keys, and every unique key
+    # (including the primary key) must contain the partitioning column.
+    # The primary key is (timestamp, id) so the clustered index itself is the time axis
+    # and time-range reads need a single B-tree traversal.
+    partitioned = op.get_bind().dialect.name == 'mysql'
+    
+    # Pre-truncated timestamps so day/hour rollups group on an indexed column
+    # instead of evaluating DATE()/DATE_FORMAT() per row. The expressions are
+    # MySQL syntax, so like the JSON keys in add_settings_json_generated_columns they live
+    # in the migration only and not on the model.
+    rollup_columns = []
+    if op.get_bind().dialect.name == 'mysql':
+        rollup_columns = [
+            sa.Column('timestamp_day', sa.Date(), sa.Computed("DATE(timestamp)", persisted=True)),
+            sa.Column('timestamp_hour', sa.DateTime(), sa.Computed("DATE_ADD(DATE(timestamp), INTERVAL HOUR(timestamp) HOUR)", persisted=True)),
+        ]
+    
     # Create audit_logs table
     op.create_table('audit_logs',
-        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.BigInteger(), nullable=False, autoincrement=not partitioned),
         sa.Column('method', sa.String(length=10), nullable=False),
         sa.Column('path', sa.String(length=500), nullable=False),
         sa.Column('client_ip', sa.String(length=45), nullable=False),
-        sa.Column('user_agent', sa.Text(), nullable=True),
+        sa.Column('user_agent', sa.String(length=1024), nullable=True),
         sa.Column('user_id', sa.Integer(), nullable=True),
         sa.Column('user_role', sa.String(length=50), nullable=True),
         sa.Column('query_params', sa.Text(), nullable=True),
         sa.Column('request_body', sa.Text(), nullable=True),
         sa.Column('status_code', sa.Integer(), nullable=False),
         sa.Column('response_time_ms', sa.Integer(), nullable=True),
-        sa.Column('success', sa.Boolean(), nullable=False, default=False),
+        sa.Column('success', sa.Boolean(), nullable=False, server_default=sa.false()),
         sa.Column('error_message', sa.Text(), nullable=True),
         sa.Column('timestamp', sa.DateTime(), nullable=False),
-        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
-        sa.PrimaryKeyConstraint('id')
+        *rollup_columns,
+        sa.PrimaryKeyConstraint('timestamp', 'id'),
+        **COMPRESSED_TABLE_KWARGS
     )
     
     # Create indexes for audit_logs
-    op.create_index('idx_audit_logs_user', 'audit_logs', ['user_id'])
-    op.create_index('idx_audit_logs_timestamp', 'audit_logs', ['timestamp'])
-    op.create_index('idx_audit_logs_method', 'audit_logs', ['method'])
-    op.create_index('idx_audit_logs_path', 'audit_logs', ['path'])
+    # (user_id, timestamp) covers "activity for user in window" and the user_id foreign key
+    op.create_index('idx_audit_logs_user_ts', 'audit_logs', ['user_id', 'timestamp'])
+    if op.get_bind().dialect.name == 'mysql':
+        op.create_index('idx_audit_logs_day', 'audit_logs', ['timestamp_day'])
+        op.create_index('idx_audit_logs_hour', 'audit_logs', ['timestamp_hour'])
+    # Prefix index: API paths are distinguishable within 64 bytes, and a full
+    # VARCHAR(500) key would bloat every leaf entry
+    op.create_index('idx_audit_logs_path', 'audit_logs', ['path'], mysql_length={'path': 64})
     op.create_index('idx_audit_logs_client_ip', 'audit_logs', ['client_ip'])
     
     # Create security_events table
     op.create_table('security_events',
-        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('id', sa.BigInteger(), nullable=False, autoincrement=not partitioned),
         sa.Column('event_type', sa.String(length=50), nullable=False),
         sa.Column('severity', sa.String(length=20), nullable=False),
-        sa.Column('description', sa.Text(), nullable=False),
+        sa.Column('description', sa.String(length=2000), nullable=False),
         sa.Column('client_ip', sa.String(length=45), nullable=False),
-        sa.Column('user_agent', sa.Text(), nullable=True),
+        sa.Column('user_agent', sa.String(length=1024), nullable=True),
         sa.Column('user_id', sa.Integer(), nullable=True),
         sa.Column('details', sa.Text(), nullable=True),
-        sa.Column('resolved', sa.Boolean(), nullable=False, default=False),
+        sa.Column('resolved', sa.Boolean(), nullable=False, server_default=sa.false()),
         sa.Column('resolved_at', sa.DateTime(), nullable=True),
         sa.Column('resolved_by', sa.Integer(), nullable=True),
         sa.Column('timestamp', sa.DateTime(), nullable=False),
-        sa.ForeignKeyConstraint(['resolved_by'], ['users.id'], ),
-        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
-        sa.PrimaryKeyConstraint('id')
+        sa.PrimaryKeyConstraint('timestamp', 'id'),
+        **COMPRESSED_TABLE_KWARGS
     )
     
     # Create indexes for security_events
     op.create_index('idx_security_events_type', 'security_events', ['event_type'])
-    op.create_index('idx_security_events_severity', 'security_events', ['severity'])
-    op.create_index('idx_security_events_timestamp', 'security_events', ['timestamp'])
-    op.create_index('idx_security_events_resolved', 'security_events', ['resolved'])
+    
+    # method, severity and resolved are too low-cardinality for a B-tree to pay for its
+    # per-insert maintenance. Where partial indexes exist, keep one for critical events only.
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "CREATE INDEX idx_security_events_critical ON security_events (timestamp) "
+            "WHERE severity = 'CRITICAL'"
+        )
+    
+    # id is no longer the leading primary key column, so it needs its own key for
+    # lookups by id. On MySQL that key must exist before id can be AUTO_INCREMENT, and
+    # it cannot be UNIQUE because unique keys on a partitioned table must include timestamp.
+    for table_name in PARTITIONED_TABLES:
+        if partitioned:
+            op.execute(
+                f"ALTER TABLE {table_name} ADD INDEX idx_{table_name}_id (id), "
+                "MODIFY id BIGINT NOT NULL AUTO_INCREMENT"
+            )
+        else:
+            op.create_index(f'idx_{table_name}_id', table_name, ['id'])
+    
+    if partitioned:
+        for table_name in PARTITIONED_TABLES:
+            op.execute(f"ALTER TABLE {table_name} {_monthly_partitions_sql()}")
+        op.execute(ROLL_PARTITION_PROCEDURE)
+    else:
+        op.create_foreign_key('fk_audit_logs_user_id', 'audit_logs', 'users', ['user_id'], ['id'])
+        op.create_foreign_key('fk_security_events_user_id', 'security_events', 'users', ['user_id'], ['id'])
+        op.create_foreign_key('fk_security_events_resolved_by', 'security_events', 'users', ['resolved_by'], ['id'])
+    
+    # Backfills of historical audit/security data should go through
+    # app.utils.bulk_load.bulk_insert(op.get_bind(), table, rows), which loads
+    # in 10k-row executemany batches instead of row-at-a-time inserts.
 
 
 def downgrade():
+    if op.get_bind().dialect.name == 'mysql':
+        op.execute("DROP PROCEDURE IF EXISTS roll_monthly_partition")
+    
+    # idx_<table>_id goes with its table: MySQL refuses to drop the key backing AUTO_INCREMENT
+    
     # Drop security_events table and indexes
-    op.drop_index('idx_security_events_resolved', table_name='security_events')
-    op.drop_index('idx_security_events_timestamp', table_name='security_events')
-    op.drop_index('idx_security_events_severity', table_name='security_events')
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('idx_security_events_critical', table_name='security_events')
     op.drop_index('idx_security_events_type', table_name='security_events')
     op.drop_table('security_events')
     
     # Drop audit_logs table and indexes
     op.drop_index('idx_audit_logs_client_ip', table_name='audit_logs')
     op.drop_index('idx_audit_logs_path', table_name='audit_logs')
-    op.drop_index('idx_audit_logs_method', table_name='audit_logs')
-    op.drop_index('idx_audit_logs_timestamp', table_name='audit_logs')
-    op.drop_index('idx_audit_logs_user', table_name='audit_logs')
+    if op.get_bind().dialect.name == 'mysql':
+        op.drop_index('idx_audit_logs_hour', table_name='audit_logs')
+        op.drop_index('idx_audit_logs_day', table_name='audit_logs')
+    op.drop_index('idx_audit_logs_user_ts', table_name='audit_logs')
     op.drop_table('audit_logs')
\ No newline at end of file
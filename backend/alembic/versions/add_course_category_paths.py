@@ -0,0 +1,47 @@
+"""add_course_category_paths
+
+Revision ID: add_course_category_paths
+Revises: add_covering_list_indexes
+Create Date: 2026-10-16 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 't8u9v0w1x2y3'
+down_revision = 's7t8u9v0w1x2'
+branch_labels = None
+depends_on = None
+
+# Walks the adjacency list once to give every existing category its "root/.../id/" path
+CATEGORY_TREE_CTE = (
+    "WITH RECURSIVE tree (id, path) AS ("
+    "SELECT id, CAST(CONCAT(id, '/') AS {text_type}) FROM course_categories WHERE parent_id IS NULL "
+    "UNION ALL "
+    "SELECT c.id, CONCAT(tree.path, c.id, '/') FROM course_categories c JOIN tree ON c.parent_id = tree.id"
+    ")"
+)
+
+
+def upgrade():
+    op.add_column('course_categories', sa.Column('path', sa.String(length=255), nullable=True))
+    op.create_index(op.f('ix_course_categories_path'), 'course_categories', ['path'], unique=False)
+
+    if op.get_bind().dialect.name == 'mysql':
+        op.execute(
+            "UPDATE course_categories JOIN ("
+            + CATEGORY_TREE_CTE.format(text_type='CHAR(255)')
+            + " SELECT id, path FROM tree) AS tree ON tree.id = course_categories.id "
+            "SET course_categories.path = tree.path"
+        )
+    else:
+        op.execute(
+            CATEGORY_TREE_CTE.format(text_type='VARCHAR(255)')
+            + " UPDATE course_categories SET path = tree.path FROM tree WHERE tree.id = course_categories.id"
+        )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_course_categories_path'), table_name='course_categories')
+    op.drop_column('course_categories', 'path')
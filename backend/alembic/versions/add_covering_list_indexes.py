@@ -0,0 +1,28 @@
+"""add_covering_list_indexes
+
+Revision ID: add_covering_list_indexes
+Revises: store_media_keys
+Create Date: 2026-10-16 16:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 's7t8u9v0w1x2'
+down_revision = 'r6s7t8u9v0w1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # PostgreSQL covers the catalog columns and keeps only published courses
+    # (status code 1); on MySQL the key columns plus the primary key are covered.
+    op.create_index('ix_courses_published_list', 'courses', ['status', 'created_at', 'price_cents'], unique=False,
+        postgresql_include=['title', 'thumbnail_key'],
+        postgresql_where=sa.text('status = 1')
+    )
+
+
+def downgrade():
+    op.drop_index('ix_courses_published_list', table_name='courses')
@@ -0,0 +1,30 @@
+"""add_enrollment_progress_composite_indexes
+
+Revision ID: add_enrollment_progress_composite_indexes
+Revises: add_audit_quiz_composite_indexes
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'k9l0m1n2o3p4'
+down_revision = 'j8k9l0m1n2o3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # One row per (user, course) and per (user, lecture); the unique indexes also
+    # serve "progress for this user in this course/lecture" as a single probe.
+    # InnoDB builds secondary indexes online, so reads and writes continue meanwhile.
+    op.create_index('ix_enrollment_user_course', 'enrollments', ['user_id', 'course_id'], unique=True)
+    op.create_index('ix_enrollment_course_progress', 'enrollments', ['course_id', 'is_completed'], unique=False)
+    op.create_index('ix_lecprog_user_lecture', 'lecture_progress', ['user_id', 'lecture_id'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_lecprog_user_lecture', table_name='lecture_progress')
+    op.drop_index('ix_enrollment_course_progress', table_name='enrollments')
+    op.drop_index('ix_enrollment_user_course', table_name='enrollments')
@@ -0,0 +1,136 @@
+"""add_lecture_totals_triggers
+
+Revision ID: add_lecture_totals_triggers
+Revises: add_pending_predicate_indexes
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'o3p4q5r6s7t8'
+down_revision = 'n2o3p4q5r6s7'
+branch_labels = None
+depends_on = None
+
+# Section and course totals are kept by the database: every lecture change applies
+# its delta to the owning section and course. Deleting a section subtracts whatever
+# it still counts from its course (zero when its lectures were deleted first).
+
+
+def _mysql_apply(sign, row):
+    """Statements adding (sign '+') or removing (sign '-') a lecture row's totals."""
+    return (
+        f"UPDATE sections SET total_duration = total_duration {sign} {row}.duration, "
+        f"total_lectures = total_lectures {sign} 1 WHERE id = {row}.section_id; "
+        f"UPDATE courses JOIN sections ON sections.course_id = courses.id "
+        f"SET courses.total_duration = courses.total_duration {sign} {row}.duration, "
+        f"courses.total_lectures = courses.total_lectures {sign} 1 "
+        f"WHERE sections.id = {row}.section_id;"
+    )
+
+
+MYSQL_TRIGGERS = {
+    'lectures_totals_insert': f"AFTER INSERT ON lectures FOR EACH ROW BEGIN {_mysql_apply('+', 'NEW')} END",
+    'lectures_totals_update': (
+        "AFTER UPDATE ON lectures FOR EACH ROW BEGIN "
+        "IF NEW.duration <> OLD.duration OR NEW.section_id <> OLD.section_id THEN "
+        f"{_mysql_apply('-', 'OLD')} {_mysql_apply('+', 'NEW')} "
+        "END IF; END"
+    ),
+    'lectures_totals_delete': f"AFTER DELETE ON lectures FOR EACH ROW BEGIN {_mysql_apply('-', 'OLD')} END",
+    'sections_totals_delete': (
+        "AFTER DELETE ON sections FOR EACH ROW "
+        "UPDATE courses SET total_duration = total_duration - OLD.total_duration, "
+        "total_lectures = total_lectures - OLD.total_lectures WHERE id = OLD.course_id"
+    ),
+}
+
+POSTGRESQL_FUNCTIONS = {
+    'bump_section_and_course_totals': """
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE sections SET total_duration = total_duration - OLD.duration,
+                    total_lectures = total_lectures - 1 WHERE id = OLD.section_id;
+                UPDATE courses SET total_duration = courses.total_duration - OLD.duration,
+                    total_lectures = courses.total_lectures - 1
+                    FROM sections WHERE sections.course_id = courses.id AND sections.id = OLD.section_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE sections SET total_duration = total_duration + NEW.duration,
+                    total_lectures = total_lectures + 1 WHERE id = NEW.section_id;
+                UPDATE courses SET total_duration = courses.total_duration + NEW.duration,
+                    total_lectures = courses.total_lectures + 1
+                    FROM sections WHERE sections.course_id = courses.id AND sections.id = NEW.section_id;
+            END IF;
+            RETURN NULL;
+        END
+    """,
+    'drop_section_totals_from_course': """
+        BEGIN
+            UPDATE courses SET total_duration = total_duration - OLD.total_duration,
+                total_lectures = total_lectures - OLD.total_lectures WHERE id = OLD.course_id;
+            RETURN NULL;
+        END
+    """,
+}
+
+POSTGRESQL_TRIGGERS = {
+    'lectures_maintain_totals': (
+        "AFTER INSERT OR DELETE OR UPDATE OF duration, section_id ON lectures "
+        "FOR EACH ROW EXECUTE FUNCTION bump_section_and_course_totals()"
+    ),
+    'sections_totals_delete': (
+        "AFTER DELETE ON sections FOR EACH ROW EXECUTE FUNCTION drop_section_totals_from_course()"
+    ),
+}
+
+TRIGGER_TABLES = {
+    'lectures_maintain_totals': 'lectures',
+    'sections_totals_delete': 'sections',
+}
+
+# Bring existing totals in line before the triggers start applying deltas
+RECOMPUTE_TOTALS = [
+    "UPDATE sections SET "
+    "total_duration = (SELECT COALESCE(SUM(duration), 0) FROM lectures WHERE lectures.section_id = sections.id), "
+    "total_lectures = (SELECT COUNT(*) FROM lectures WHERE lectures.section_id = sections.id)",
+    "UPDATE courses SET "
+    "total_duration = (SELECT COALESCE(SUM(total_duration), 0) FROM sections WHERE sections.course_id = courses.id), "
+    "total_lectures = (SELECT COALESCE(SUM(total_lectures), 0) FROM sections WHERE sections.course_id = courses.id)",
+]
+
+
+def upgrade():
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name not in ('mysql', 'postgresql'):
+        return
+
+    for statement in RECOMPUTE_TOTALS:
+        op.execute(statement)
+
+    if dialect_name == 'mysql':
+        for trigger_name, definition in MYSQL_TRIGGERS.items():
+            op.execute(f"CREATE TRIGGER {trigger_name} {definition}")
+        return
+
+    for function_name, body in POSTGRESQL_FUNCTIONS.items():
+        op.execute(
+            f"CREATE OR REPLACE FUNCTION {function_name}() RETURNS trigger "
+            f"LANGUAGE plpgsql AS $${body}$$"
+        )
+    for trigger_name, definition in POSTGRESQL_TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {trigger_name} {definition}")
+
+
+def downgrade():
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name == 'mysql':
+        for trigger_name in reversed(list(MYSQL_TRIGGERS)):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+    elif dialect_name == 'postgresql':
+        for trigger_name in reversed(list(POSTGRESQL_TRIGGERS)):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger_name} ON {TRIGGER_TABLES[trigger_name]}")
+        for function_name in reversed(list(POSTGRESQL_FUNCTIONS)):
+            op.execute(f"DROP FUNCTION IF EXISTS {function_name}()")
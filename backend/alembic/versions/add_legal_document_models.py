@@ -33,11 +33,8 @@ def upgrade():
         sa.Column('requires_acceptance', sa.Boolean(), nullable=False),
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
-        sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
-        sa.ForeignKeyConstraint(['previous_version_id'], ['legal_documents.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_legal_documents_id'), 'legal_documents', ['id'], unique=False)
     op.create_index(op.f('ix_legal_documents_document_type'), 'legal_documents', ['document_type'], unique=False)
     op.create_index(op.f('ix_legal_documents_slug'), 'legal_documents', ['slug'], unique=False)
 
@@ -48,14 +45,11 @@ def upgrade():
         sa.Column('document_id', sa.Integer(), nullable=False),
         sa.Column('accepted_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('ip_address', sa.String(length=45), nullable=True),
-        sa.Column('user_agent', sa.Text(), nullable=True),
+        sa.Column('user_agent', sa.String(length=1024), nullable=True),
         sa.Column('document_version', sa.String(length=20), nullable=False),
         sa.Column('document_type', sa.String(length=50), nullable=False),
-        sa.ForeignKeyConstraint(['document_id'], ['legal_documents.id'], ),
-        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_user_policy_acceptances_id'), 'user_policy_acceptances', ['id'], unique=False)
 
     # Create policy_update_notifications table
     op.create_table('policy_update_notifications',
@@ -66,20 +60,23 @@ def upgrade():
         sa.Column('sent_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.Column('viewed_at', sa.DateTime(timezone=True), nullable=True),
         sa.Column('acknowledged_at', sa.DateTime(timezone=True), nullable=True),
-        sa.ForeignKeyConstraint(['document_id'], ['legal_documents.id'], ),
-        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_policy_update_notifications_id'), 'policy_update_notifications', ['id'], unique=False)
+
+    # Foreign keys are added after the tables (and any data loaded into them) exist,
+    # so bulk loads don't pay a per-row constraint probe
+    op.create_foreign_key('fk_legal_documents_created_by', 'legal_documents', 'users', ['created_by'], ['id'])
+    op.create_foreign_key('fk_legal_documents_previous_version_id', 'legal_documents', 'legal_documents', ['previous_version_id'], ['id'])
+    op.create_foreign_key('fk_user_policy_acceptances_document_id', 'user_policy_acceptances', 'legal_documents', ['document_id'], ['id'])
+    op.create_foreign_key('fk_user_policy_acceptances_user_id', 'user_policy_acceptances', 'users', ['user_id'], ['id'])
+    op.create_foreign_key('fk_policy_update_notifications_document_id', 'policy_update_notifications', 'legal_documents', ['document_id'], ['id'])
+    op.create_foreign_key('fk_policy_update_notifications_user_id', 'policy_update_notifications', 'users', ['user_id'], ['id'])
 
 
 def downgrade():
     # Drop tables in reverse order
-    op.drop_index(op.f('ix_policy_update_notifications_id'), table_name='policy_update_notifications')
     op.drop_table('policy_update_notifications')
-    op.drop_index(op.f('ix_user_policy_acceptances_id'), table_name='user_policy_acceptances')
     op.drop_table('user_policy_acceptances')
     op.drop_index(op.f('ix_legal_documents_slug'), table_name='legal_documents')
     op.drop_index(op.f('ix_legal_documents_document_type'), table_name='legal_documents')
-    op.drop_index(op.f('ix_legal_documents_id'), table_name='legal_documents')
     op.drop_table('legal_documents')
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""add_legal_document_root_ids
+
+Revision ID: add_legal_document_root_ids
+Revises: unique_current_legal_documents
+Create Date: 2026-10-16 20:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'a5b6c7d8e9f0'
+down_revision = 'z4a5b6c7d8e9'
+branch_labels = None
+depends_on = None
+
+# Walks each previous_version chain once to find the first version of every document
+VERSION_CHAIN_CTE = (
+    "WITH RECURSIVE chain (id, root_id) AS ("
+    "SELECT id, id FROM legal_documents WHERE previous_version_id IS NULL "
+    "UNION ALL "
+    "SELECT d.id, chain.root_id FROM legal_documents d JOIN chain ON d.previous_version_id = chain.id"
+    ")"
+)
+
+
+def upgrade():
+    op.add_column('legal_documents', sa.Column('root_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_legal_documents_root_id'), 'legal_documents', ['root_id'], unique=False)
+    op.create_foreign_key(
+        'fk_legal_documents_root_id', 'legal_documents', 'legal_documents', ['root_id'], ['id']
+    )
+
+    if op.get_bind().dialect.name == 'mysql':
+        op.execute(
+            "UPDATE legal_documents JOIN ("
+            + VERSION_CHAIN_CTE
+            + " SELECT id, root_id FROM chain) AS chain ON chain.id = legal_documents.id "
+            "SET legal_documents.root_id = chain.root_id"
+        )
+    else:
+        op.execute(
+            VERSION_CHAIN_CTE
+            + " UPDATE legal_documents SET root_id = chain.root_id FROM chain WHERE chain.id = legal_documents.id"
+        )
+
+
+def downgrade():
+    op.drop_constraint('fk_legal_documents_root_id', 'legal_documents', type_='foreignkey')
+    op.drop_index(op.f('ix_legal_documents_root_id'), table_name='legal_documents')
+    op.drop_column('legal_documents', 'root_id')
@@ -0,0 +1,49 @@
+"""add_on_delete_cascade_foreign_keys
+
+Revision ID: add_on_delete_cascade_foreign_keys
+Revises: course_price_to_cents
+Create Date: 2026-10-16 15:30:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'q5r6s7t8u9v0'
+down_revision = 'p4q5r6s7t8u9'
+branch_labels = None
+depends_on = None
+
+# (table, column, referred table, position of the FK in the initial schema).
+# These child rows are deleted by the database when their parent goes, so the
+# ORM no longer loads them just to issue one DELETE per row.
+CASCADE_FOREIGN_KEYS = [
+    ('enrollments', 'course_id', 'courses', 1),
+    ('course_progress', 'course_id', 'courses', 1),
+    ('transactions', 'course_id', 'courses', 1),
+    ('lecture_progress', 'lecture_id', 'lectures', 1),
+]
+
+
+def _default_name(table_name, column, position):
+    """Name the database gave the unnamed constraint from the initial schema."""
+    if op.get_context().dialect.name == 'mysql':
+        return f'{table_name}_ibfk_{position}'
+    return f'{table_name}_{column}_fkey'
+
+
+def upgrade():
+    for table_name, column, referred_table, position in CASCADE_FOREIGN_KEYS:
+        op.drop_constraint(_default_name(table_name, column, position), table_name, type_='foreignkey')
+        op.create_foreign_key(
+            f'fk_{table_name}_{column}', table_name, referred_table,
+            [column], ['id'], ondelete='CASCADE'
+        )
+
+
+def downgrade():
+    for table_name, column, referred_table, position in reversed(CASCADE_FOREIGN_KEYS):
+        op.drop_constraint(f'fk_{table_name}_{column}', table_name, type_='foreignkey')
+        op.create_foreign_key(
+            _default_name(table_name, column, position), table_name, referred_table,
+            [column], ['id']
+        )
@@ -0,0 +1,35 @@
+"""add_pending_predicate_indexes
+
+Revision ID: add_pending_predicate_indexes
+Revises: add_course_progress_completion_index
+Create Date: 2026-10-16 13:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'n2o3p4q5r6s7'
+down_revision = 'm1n2o3p4q5r6'
+branch_labels = None
+depends_on = None
+
+# (index, table, columns, predicate). PostgreSQL keeps only the rows matching the
+# predicate; MySQL has no partial indexes, so the predicate column is part of the
+# key instead and the same lookups seek straight to the matching rows.
+PREDICATE_INDEXES = [
+    ('ix_qa_unanswered', 'qa_questions', ['lecture_id', 'is_answered'], 'is_answered = false'),
+    ('ix_enroll_incomplete', 'enrollments', ['user_id', 'is_completed'], 'is_completed = false'),
+]
+
+
+def upgrade():
+    for index_name, table_name, columns, predicate in PREDICATE_INDEXES:
+        op.create_index(index_name, table_name, columns, unique=False,
+            postgresql_where=sa.text(predicate)
+        )
+
+
+def downgrade():
+    for index_name, table_name, _, _ in reversed(PREDICATE_INDEXES):
+        op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,37 @@
+"""add_policy_and_download_indexes
+
+Revision ID: add_policy_and_download_indexes
+Revises: enum_strings_to_smallint
+Create Date: 2026-10-16 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'x2y3z4a5b6c7'
+down_revision = 'w1x2y3z4a5b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_upa_user_doc', 'user_policy_acceptances', ['user_id', 'document_id'], unique=False)
+    op.create_index('ix_upa_document_version', 'user_policy_acceptances', ['document_id', 'document_version'], unique=False)
+    op.create_index('ix_rd_user_resource', 'resource_downloads', ['user_id', 'resource_id'], unique=False)
+    op.create_index('ix_rd_resource_downloaded_at', 'resource_downloads', ['resource_id', 'downloaded_at'], unique=False)
+    op.create_index('ix_transactions_user_status_created', 'transactions', ['user_id', 'status', 'created_at'], unique=False)
+    # PostgreSQL keeps only current documents; MySQL has no partial indexes, so
+    # is_current rides in the key instead
+    op.create_index('ix_legal_documents_current', 'legal_documents', ['document_type', 'is_current'], unique=False,
+        postgresql_where=sa.text('is_current')
+    )
+
+
+def downgrade():
+    op.drop_index('ix_legal_documents_current', table_name='legal_documents')
+    op.drop_index('ix_transactions_user_status_created', table_name='transactions')
+    op.drop_index('ix_rd_resource_downloaded_at', table_name='resource_downloads')
+    op.drop_index('ix_rd_user_resource', table_name='resource_downloads')
+    op.drop_index('ix_upa_document_version', table_name='user_policy_acceptances')
+    op.drop_index('ix_upa_user_doc', table_name='user_policy_acceptances')
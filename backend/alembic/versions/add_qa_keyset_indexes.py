@@ -0,0 +1,26 @@
+"""add_qa_keyset_indexes
+
+Revision ID: add_qa_keyset_indexes
+Revises: add_course_category_paths
+Create Date: 2026-10-16 17:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'u9v0w1x2y3z4'
+down_revision = 't8u9v0w1x2y3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination seeks on (created_at, id) within a lecture or question
+    op.create_index('ix_qa_q_lecture_created', 'qa_questions', ['lecture_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_qa_a_question_created', 'qa_answers', ['question_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_qa_a_question_created', table_name='qa_answers')
+    op.drop_index('ix_qa_q_lecture_created', table_name='qa_questions')
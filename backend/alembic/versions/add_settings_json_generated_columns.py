@@ -0,0 +1,48 @@
+"""add_settings_json_generated_columns
+
+Revision ID: add_settings_json_generated_columns
+Revises: shrink_short_text_columns
+Create Date: 2026-10-16 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'h6i7j8k9l0m1'
+down_revision = 'g5h6i7j8k9l0'
+branch_labels = None
+depends_on = None
+
+# (table, column, type, JSON source column, JSON path) for hot keys read out of
+# JSON settings. Stored generated columns let lookups seek an index instead of
+# parsing every row's document.
+JSON_GENERATED_COLUMNS = [
+    ('payment_gateway_configurations', 'cfg_currency', sa.String(length=8), 'configuration', '$.currency'),
+    ('system_settings', 'json_enabled', sa.Boolean(), 'json_value', '$.enabled'),
+]
+
+
+def upgrade():
+    # JSON_EXTRACT/JSON_UNQUOTE are MySQL syntax; other backends keep plain JSON columns
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    for table_name, column_name, column_type, source, path in JSON_GENERATED_COLUMNS:
+        if isinstance(column_type, sa.Boolean):
+            expression = f"JSON_EXTRACT({source}, '{path}') = CAST('true' AS JSON)"
+        else:
+            expression = f"JSON_UNQUOTE(JSON_EXTRACT({source}, '{path}'))"
+        op.add_column(table_name, sa.Column(
+            column_name, column_type, sa.Computed(expression, persisted=True), nullable=True
+        ))
+        op.create_index(f'idx_{table_name}_{column_name}', table_name, [column_name])
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    for table_name, column_name, _, _, _ in reversed(JSON_GENERATED_COLUMNS):
+        op.drop_index(f'idx_{table_name}_{column_name}', table_name=table_name)
+        op.drop_column(table_name, column_name)
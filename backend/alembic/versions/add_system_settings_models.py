@@ -33,7 +33,6 @@ def upgrade():
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_system_settings_id'), 'system_settings', ['id'], unique=False)
     op.create_index(op.f('ix_system_settings_setting_key'), 'system_settings', ['setting_key'], unique=True)
     op.create_index(op.f('ix_system_settings_setting_type'), 'system_settings', ['setting_type'], unique=False)
 
@@ -53,7 +52,6 @@ def upgrade():
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_email_templates_id'), 'email_templates', ['id'], unique=False)
     op.create_index(op.f('ix_email_templates_template_key'), 'email_templates', ['template_key'], unique=True)
 
     # Create payment_gateway_configurations table
@@ -72,19 +70,15 @@ def upgrade():
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_payment_gateway_configurations_id'), 'payment_gateway_configurations', ['id'], unique=False)
     op.create_index(op.f('ix_payment_gateway_configurations_gateway_name'), 'payment_gateway_configurations', ['gateway_name'], unique=True)
 
 
 def downgrade():
     # Drop tables in reverse order
     op.drop_index(op.f('ix_payment_gateway_configurations_gateway_name'), table_name='payment_gateway_configurations')
-    op.drop_index(op.f('ix_payment_gateway_configurations_id'), table_name='payment_gateway_configurations')
     op.drop_table('payment_gateway_configurations')
     op.drop_index(op.f('ix_email_templates_template_key'), table_name='email_templates')
-    op.drop_index(op.f('ix_email_templates_id'), table_name='email_templates')
     op.drop_table('email_templates')
     op.drop_index(op.f('ix_system_settings_setting_type'), table_name='system_settings')
     op.drop_index(op.f('ix_system_settings_setting_key'), table_name='system_settings')
-    op.drop_index(op.f('ix_system_settings_id'), table_name='system_settings')
     op.drop_table('system_settings')
\ No newline at end of file
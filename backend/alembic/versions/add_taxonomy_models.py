@@ -28,7 +28,6 @@ def upgrade():
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_tags_id'), 'tags', ['id'], unique=False)
     op.create_index(op.f('ix_tags_name'), 'tags', ['name'], unique=True)
 
     # Create difficulty_configurations table
@@ -44,34 +43,40 @@ def upgrade():
         sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
         sa.PrimaryKeyConstraint('id')
     )
-    op.create_index(op.f('ix_difficulty_configurations_id'), 'difficulty_configurations', ['id'], unique=False)
     op.create_index(op.f('ix_difficulty_configurations_level_key'), 'difficulty_configurations', ['level_key'], unique=True)
 
     # Create course_tags association table
     op.create_table('course_tags',
         sa.Column('course_id', sa.Integer(), nullable=False),
         sa.Column('tag_id', sa.Integer(), nullable=False),
-        sa.ForeignKeyConstraint(['course_id'], ['courses.id'], ),
-        sa.ForeignKeyConstraint(['tag_id'], ['tags.id'], ),
         sa.PrimaryKeyConstraint('course_id', 'tag_id')
     )
 
     # Insert default difficulty configurations
-    op.execute("""
-        INSERT INTO difficulty_configurations (level_key, display_name, description, order_index, color, is_active)
-        VALUES 
-        ('beginner', 'Beginner', 'Perfect for those new to the subject', 1, '#22C55E', true),
-        ('intermediate', 'Intermediate', 'For those with some basic knowledge', 2, '#F59E0B', true),
-        ('advanced', 'Advanced', 'For experienced learners looking to deepen their knowledge', 3, '#EF4444', true)
-    """)
+    # (larger seeds should be chunked with app.utils.bulk_load.iter_batches)
+    difficulty_configurations = sa.table('difficulty_configurations',
+        sa.column('level_key', sa.String),
+        sa.column('display_name', sa.String),
+        sa.column('description', sa.Text),
+        sa.column('order_index', sa.Integer),
+        sa.column('color', sa.String),
+        sa.column('is_active', sa.Boolean),
+    )
+    op.bulk_insert(difficulty_configurations, [
+        {'level_key': 'beginner', 'display_name': 'Beginner', 'description': 'Perfect for those new to the subject', 'order_index': 1, 'color': '#22C55E', 'is_active': True},
+        {'level_key': 'intermediate', 'display_name': 'Intermediate', 'description': 'For those with some basic knowledge', 'order_index': 2, 'color': '#F59E0B', 'is_active': True},
+        {'level_key': 'advanced', 'display_name': 'Advanced', 'description': 'For experienced learners looking to deepen their knowledge', 'order_index': 3, 'color': '#EF4444', 'is_active': True},
+    ])
+
+    # Foreign keys are added after the seed data is loaded
+    op.create_foreign_key('fk_course_tags_course_id', 'course_tags', 'courses', ['course_id'], ['id'])
+    op.create_foreign_key('fk_course_tags_tag_id', 'course_tags', 'tags', ['tag_id'], ['id'])
 
 
 def downgrade():
     # Drop tables in reverse order
     op.drop_table('course_tags')
     op.drop_index(op.f('ix_difficulty_configurations_level_key'), table_name='difficulty_configurations')
-    op.drop_index(op.f('ix_difficulty_configurations_id'), table_name='difficulty_configurations')
     op.drop_table('difficulty_configurations')
     op.drop_index(op.f('ix_tags_name'), table_name='tags')
-    op.drop_index(op.f('ix_tags_id'), table_name='tags')
     op.drop_table('tags')
\ No newline at end of file
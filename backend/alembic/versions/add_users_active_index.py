@@ -0,0 +1,24 @@
+"""add_users_active_index
+
+Revision ID: add_users_active_index
+Revises: add_legal_document_models
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'f4g5h6i7j8k9'
+down_revision = 'e3f4g5h6i7j8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Covers the active-user check and active-user listings ordered by id
+    op.create_index('ix_users_active_id', 'users', ['is_active', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_users_active_id', table_name='users')
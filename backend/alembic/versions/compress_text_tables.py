@@ -0,0 +1,58 @@
+"""compress_text_tables
+
+Revision ID: compress_text_tables
+Revises: add_qa_keyset_indexes
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'v0w1x2y3z4a5'
+down_revision = 'u9v0w1x2y3z4'
+branch_labels = None
+depends_on = None
+
+# Tables dominated by long, often templated text, with that text column.
+# MySQL compresses whole InnoDB pages; PostgreSQL compresses the TOASTed column.
+TEXT_TABLES = [
+    ('notes', 'content'),
+    ('qa_questions', 'content'),
+    ('qa_answers', 'content'),
+]
+
+
+def upgrade():
+    dialect_name = op.get_bind().dialect.name
+
+    if dialect_name == 'mysql':
+        for table_name, _ in TEXT_TABLES:
+            op.execute(f"ALTER TABLE {table_name} COMPRESSION='lz4'")
+            # Rebuild so existing pages are written compressed
+            op.execute(f"OPTIMIZE TABLE {table_name}")
+    elif dialect_name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for table_name, column_name in TEXT_TABLES:
+            op.execute(f"ALTER TABLE {table_name} ALTER COLUMN {column_name} SET COMPRESSION lz4")
+
+    op.create_index('ix_qa_questions_search', 'qa_questions', ['title', 'content'], unique=False,
+        mysql_prefix='FULLTEXT',
+        mysql_with_parser='ngram',
+        postgresql_using='gin',
+        postgresql_ops={'title': 'gin_trgm_ops', 'content': 'gin_trgm_ops'}
+    )
+
+
+def downgrade():
+    dialect_name = op.get_bind().dialect.name
+
+    op.drop_index('ix_qa_questions_search', table_name='qa_questions')
+
+    if dialect_name == 'mysql':
+        for table_name, _ in reversed(TEXT_TABLES):
+            op.execute(f"ALTER TABLE {table_name} COMPRESSION='None'")
+            op.execute(f"OPTIMIZE TABLE {table_name}")
+    elif dialect_name == 'postgresql':
+        for table_name, column_name in reversed(TEXT_TABLES):
+            op.execute(f"ALTER TABLE {table_name} ALTER COLUMN {column_name} SET COMPRESSION DEFAULT")
@@ -0,0 +1,27 @@
+"""course_price_to_cents
+
+Revision ID: course_price_to_cents
+Revises: add_lecture_totals_triggers
+Create Date: 2026-10-16 14:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'p4q5r6s7t8u9'
+down_revision = 'o3p4q5r6s7t8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('courses', sa.Column('price_cents', sa.Integer(), server_default='0', nullable=False))
+    op.execute("UPDATE courses SET price_cents = ROUND(price * 100)")
+    op.drop_column('courses', 'price')
+
+
+def downgrade():
+    op.add_column('courses', sa.Column('price', sa.DECIMAL(precision=10, scale=2), server_default='0', nullable=False))
+    op.execute("UPDATE courses SET price = price_cents / 100.0")
+    op.drop_column('courses', 'price_cents')
@@ -0,0 +1,61 @@
+"""enum_columns_to_smallint
+
+Revision ID: enum_columns_to_smallint
+Revises: add_enrollment_progress_composite_indexes
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'l0m1n2o3p4q5'
+down_revision = 'k9l0m1n2o3p4'
+branch_labels = None
+depends_on = None
+
+# (table, column, enum type name, member names in declaration order). The Enum
+# columns stored member names; IntEnumType stores each member's position.
+ENUM_COLUMNS = [
+    ('courses', 'status', 'coursestatus', ('DRAFT', 'PUBLISHED', 'ARCHIVED')),
+    ('courses', 'difficulty_level', 'difficultylevel', ('BEGINNER', 'INTERMEDIATE', 'ADVANCED')),
+    ('lectures', 'lecture_type', 'lecturetype', ('VIDEO', 'TEXT', 'QUIZ', 'ASSIGNMENT', 'RESOURCE')),
+]
+
+
+def _case(column, mapping):
+    whens = " ".join(f"WHEN {column} = {source} THEN {target}" for source, target in mapping)
+    return f"CASE {whens} END"
+
+
+def _swap_column(table_name, column_name, new_type, mapping):
+    """Replace a column with one of ``new_type``, converting rows through ``mapping``."""
+    temp_name = f"{column_name}_new"
+    op.add_column(table_name, sa.Column(temp_name, new_type, nullable=True))
+    op.execute(f"UPDATE {table_name} SET {temp_name} = {_case(column_name, mapping)}")
+    op.drop_column(table_name, column_name)
+    op.alter_column(table_name, temp_name,
+        new_column_name=column_name,
+        existing_type=new_type,
+        nullable=False
+    )
+
+
+def upgrade():
+    for table_name, column_name, type_name, names in ENUM_COLUMNS:
+        _swap_column(
+            table_name, column_name, sa.SmallInteger(),
+            [(f"'{name}'", code) for code, name in enumerate(names)]
+        )
+        if op.get_bind().dialect.name == 'postgresql':
+            op.execute(f"DROP TYPE IF EXISTS {type_name}")
+
+
+def downgrade():
+    for table_name, column_name, type_name, names in reversed(ENUM_COLUMNS):
+        enum_type = sa.Enum(*names, name=type_name)
+        enum_type.create(op.get_bind(), checkfirst=True)
+        _swap_column(
+            table_name, column_name, enum_type,
+            [(code, f"'{name}'") for code, name in enumerate(names)]
+        )
@@ -0,0 +1,71 @@
+"""enum_strings_to_smallint
+
+Revision ID: enum_strings_to_smallint
+Revises: compress_text_tables
+Create Date: 2026-10-16 18:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'w1x2y3z4a5b6'
+down_revision = 'v0w1x2y3z4a5'
+branch_labels = None
+depends_on = None
+
+DOCUMENT_TYPES = (
+    'terms_of_service', 'privacy_policy', 'cookie_policy', 'refund_policy',
+    'community_guidelines', 'instructor_agreement', 'data_processing_agreement',
+)
+
+# (table, column, indexed, member values in declaration order). These String(50)
+# columns stored enum values; IntEnumType stores each member's position.
+ENUM_COLUMNS = [
+    ('legal_documents', 'document_type', True, DOCUMENT_TYPES),
+    ('user_policy_acceptances', 'document_type', False, DOCUMENT_TYPES),
+    ('policy_update_notifications', 'notification_type', False, ('email', 'in_app')),
+    ('system_settings', 'setting_type', True, (
+        'site_configuration', 'payment_gateway', 'email_template',
+        'branding', 'notification', 'security',
+    )),
+]
+
+
+def _case(column, mapping):
+    whens = " ".join(f"WHEN {column} = {source} THEN {target}" for source, target in mapping)
+    return f"CASE {whens} END"
+
+
+def _swap_column(table_name, column_name, indexed, new_type, mapping):
+    """Replace a column with one of ``new_type``, converting rows through ``mapping``."""
+    index_name = op.f(f'ix_{table_name}_{column_name}')
+    temp_name = f"{column_name}_new"
+    if indexed:
+        op.drop_index(index_name, table_name=table_name)
+    op.add_column(table_name, sa.Column(temp_name, new_type, nullable=True))
+    op.execute(f"UPDATE {table_name} SET {temp_name} = {_case(column_name, mapping)}")
+    op.drop_column(table_name, column_name)
+    op.alter_column(table_name, temp_name,
+        new_column_name=column_name,
+        existing_type=new_type,
+        nullable=False
+    )
+    if indexed:
+        op.create_index(index_name, table_name, [column_name], unique=False)
+
+
+def upgrade():
+    for table_name, column_name, indexed, values in ENUM_COLUMNS:
+        _swap_column(
+            table_name, column_name, indexed, sa.SmallInteger(),
+            [(f"'{value}'", code) for code, value in enumerate(values)]
+        )
+
+
+def downgrade():
+    for table_name, column_name, indexed, values in reversed(ENUM_COLUMNS):
+        _swap_column(
+            table_name, column_name, indexed, sa.String(length=50),
+            [(code, f"'{value}'") for code, value in enumerate(values)]
+        )
@@ -0,0 +1,48 @@
+"""gateway_payloads_to_json
+
+Revision ID: gateway_payloads_to_json
+Revises: add_policy_and_download_indexes
+Create Date: 2026-10-16 19:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'y3z4a5b6c7d8'
+down_revision = 'x2y3z4a5b6c7'
+branch_labels = None
+depends_on = None
+
+# (table, column) holding serialized gateway documents
+JSON_COLUMNS = [
+    ('transactions', 'gateway_response'),
+    ('instructor_payouts', 'payout_details'),
+]
+
+
+def upgrade():
+    for table_name, column_name in JSON_COLUMNS:
+        # Blank strings are not valid JSON documents
+        op.execute(f"UPDATE {table_name} SET {column_name} = NULL WHERE {column_name} = ''")
+        op.alter_column(table_name, column_name,
+            type_=sa.JSON(),
+            existing_type=sa.Text(),
+            existing_nullable=True,
+            postgresql_using=f'{column_name}::json'
+        )
+
+    # Webhooks reconcile payments by the gateway's payment intent ID
+    op.create_index(op.f('ix_transactions_gateway_transaction_id'), 'transactions', ['gateway_transaction_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_transactions_gateway_transaction_id'), table_name='transactions')
+
+    for table_name, column_name in reversed(JSON_COLUMNS):
+        op.alter_column(table_name, column_name,
+            type_=sa.Text(),
+            existing_type=sa.JSON(),
+            existing_nullable=True,
+            postgresql_using=f'{column_name}::text'
+        )
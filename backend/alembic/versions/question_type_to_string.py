@@ -0,0 +1,38 @@
+"""question_type_to_string
+
+Revision ID: question_type_to_string
+Revises: add_settings_json_generated_columns
+Create Date: 2026-10-16 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'i7j8k9l0m1n2'
+down_revision = 'h6i7j8k9l0m1'
+branch_labels = None
+depends_on = None
+
+# The Enum column stored member names; the String column stores the values
+QUESTION_TYPE_NAMES = ('MULTIPLE_CHOICE', 'TRUE_FALSE', 'SHORT_ANSWER', 'ESSAY')
+
+
+def upgrade():
+    op.alter_column('questions', 'question_type',
+        existing_type=sa.Enum(*QUESTION_TYPE_NAMES, name='questiontype'),
+        type_=sa.String(length=20),
+        existing_nullable=False
+    )
+    op.execute("UPDATE questions SET question_type = LOWER(question_type)")
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP TYPE IF EXISTS questiontype")
+
+
+def downgrade():
+    op.execute("UPDATE questions SET question_type = UPPER(question_type)")
+    op.alter_column('questions', 'question_type',
+        existing_type=sa.String(length=20),
+        type_=sa.Enum(*QUESTION_TYPE_NAMES, name='questiontype'),
+        existing_nullable=False
+    )
@@ -0,0 +1,49 @@
+"""shrink_short_text_columns
+
+Revision ID: shrink_short_text_columns
+Revises: add_users_active_index
+Create Date: 2026-10-16 09:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'g5h6i7j8k9l0'
+down_revision = 'f4g5h6i7j8k9'
+branch_labels = None
+depends_on = 'add_audit_security_tables'
+
+# (table, column, bounded type, nullable) for short free-form fields that were TEXT.
+# VARCHAR keeps them in the row instead of off-page storage.
+SHORT_TEXT_COLUMNS = [
+    ('audit_logs', 'user_agent', sa.String(length=1024), True),
+    ('security_events', 'user_agent', sa.String(length=1024), True),
+    ('security_events', 'description', sa.String(length=2000), False),
+    ('user_policy_acceptances', 'user_agent', sa.String(length=1024), True),
+]
+
+
+def upgrade():
+    for table_name, column_name, column_type, nullable in SHORT_TEXT_COLUMNS:
+        # Cut over-long values first: strict mode would abort the ALTER, and
+        # non-strict mode would truncate them silently
+        max_length = column_type.length
+        op.execute(
+            f"UPDATE {table_name} SET {column_name} = LEFT({column_name}, {max_length}) "
+            f"WHERE CHAR_LENGTH({column_name}) > {max_length}"
+        )
+        op.alter_column(table_name, column_name,
+            existing_type=sa.Text(),
+            type_=column_type,
+            existing_nullable=nullable
+        )
+
+
+def downgrade():
+    for table_name, column_name, column_type, nullable in reversed(SHORT_TEXT_COLUMNS):
+        op.alter_column(table_name, column_name,
+            existing_type=column_type,
+            type_=sa.Text(),
+            existing_nullable=nullable
+        )
@@ -0,0 +1,58 @@
+"""store_media_keys
+
+Revision ID: store_media_keys
+Revises: add_on_delete_cascade_foreign_keys
+Create Date: 2026-10-16 16:00:00.000000
+
+"""
+import os
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'r6s7t8u9v0w1'
+down_revision = 'q5r6s7t8u9v0'
+branch_labels = None
+depends_on = None
+
+# Must match app.models.course.MEDIA_BASE_URL for the deployment being migrated
+MEDIA_BASE_URL = os.getenv("MEDIA_BASE_URL", "/uploads/")
+
+# (table, url column, key column)
+MEDIA_COLUMNS = [
+    ('courses', 'thumbnail_url', 'thumbnail_key'),
+    ('courses', 'preview_video_url', 'preview_video_key'),
+    ('lectures', 'video_url', 'video_key'),
+    ('lectures', 'content_url', 'content_key'),
+]
+
+
+def upgrade():
+    for table_name, url_column, key_column in MEDIA_COLUMNS:
+        op.alter_column(table_name, url_column,
+            new_column_name=key_column,
+            existing_type=sa.String(length=500),
+            existing_nullable=True
+        )
+        op.execute(
+            sa.text(
+                f"UPDATE {table_name} SET {key_column} = SUBSTRING({key_column}, :start) "
+                f"WHERE {key_column} LIKE :prefix"
+            ).bindparams(start=len(MEDIA_BASE_URL) + 1, prefix=MEDIA_BASE_URL + '%')
+        )
+
+
+def downgrade():
+    for table_name, url_column, key_column in reversed(MEDIA_COLUMNS):
+        op.execute(
+            sa.text(
+                f"UPDATE {table_name} SET {key_column} = CONCAT(:base, {key_column}) "
+                f"WHERE {key_column} NOT LIKE '/%' AND {key_column} NOT LIKE '%://%'"
+            ).bindparams(base=MEDIA_BASE_URL)
+        )
+        op.alter_column(table_name, key_column,
+            new_column_name=url_column,
+            existing_type=sa.String(length=500),
+            existing_nullable=True
+        )
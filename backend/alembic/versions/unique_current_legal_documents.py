@@ -0,0 +1,38 @@
+"""unique_current_legal_documents
+
+Revision ID: unique_current_legal_documents
+Revises: gateway_payloads_to_json
+Create Date: 2026-10-16 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'z4a5b6c7d8e9'
+down_revision = 'y3z4a5b6c7d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep only the newest current document per type and slug. The derived
+    # table lets MySQL read the table it is updating.
+    op.execute(
+        "UPDATE legal_documents SET is_current = false "
+        "WHERE is_current = true AND id NOT IN ("
+        "SELECT id FROM (SELECT MAX(id) AS id FROM legal_documents "
+        "WHERE is_current = true GROUP BY document_type, slug) AS newest)"
+    )
+
+    op.add_column('legal_documents', sa.Column(
+        'current_slug', sa.String(length=100),
+        sa.Computed("CASE WHEN is_current THEN slug END", persisted=True),
+        nullable=True
+    ))
+    op.create_index('ux_legal_current_per_slug', 'legal_documents', ['document_type', 'current_slug'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ux_legal_current_per_slug', table_name='legal_documents')
+    op.drop_column('legal_documents', 'current_slug')
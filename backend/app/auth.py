@@ -3,7 +3,9 @@ Authentication utilities for JWT token management and password hashing.
 """
 
 import os
+import time
 import hashlib
+import threading
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
@@ -21,6 +23,13 @@ REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 # Simple password hashing (for development - use bcrypt in production)
 SALT = "learning_management_system_salt_2024"
 
+# Verified access tokens are cached so repeated requests with the same bearer
+# skip the signature check. Entries expire with the token, capped at this TTL.
+TOKEN_CACHE_TTL_SECONDS = 300
+TOKEN_CACHE_MAX_SIZE = 4096
+_token_cache: dict = {}  # token -> (user_id, expires_at)
+_token_cache_lock = threading.Lock()
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -155,6 +164,11 @@ def extract_user_id_from_token(token: str) -> int:
     Raises:
         HTTPException: If token is invalid or doesn't contain user_id
     """
+    now = time.time()
+    cached = _token_cache.get(token)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+    
     payload = verify_token(token)
     user_id = payload.get("sub")
     
@@ -166,10 +180,19 @@ def extract_user_id_from_token(token: str) -> int:
         )
     
     try:
-        return int(user_id)
+        user_id = int(user_id)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid user ID in token",
             headers={"WWW-Authenticate": "Bearer"},
-        )
\ No newline at end of file
+        )
+    
+    expires_at = min(payload["exp"], now + TOKEN_CACHE_TTL_SECONDS)
+    with _token_cache_lock:
+        if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            # Evict the oldest entry (dicts preserve insertion order)
+            _token_cache.pop(next(iter(_token_cache)), None)
+        _token_cache[token] = (user_id, expires_at)
+    
+    return user_id
\ No newline at end of file
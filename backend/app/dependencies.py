@@ -3,7 +3,7 @@ FastAPI dependencies for authentication and authorization.
 """
 
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
@@ -11,13 +11,48 @@ from .database import get_db
 from .auth import verify_token, extract_user_id_from_token
 from .models.user import User, UserRole
 from .services.auth_service import AuthService
-from .permissions import Permission
+from .permissions import Permission, PermissionChecker, permission_mask
 
 # Security scheme for JWT tokens
 security = HTTPBearer()
 
+# Roles allowed through get_current_instructor
+_INSTRUCTOR_ROLES = frozenset({UserRole.INSTRUCTOR, UserRole.SUPER_ADMIN})
+
+
+def _resolve_user(request: Request, token: str, db: Session) -> Optional[User]:
+    """
+    Resolve the user for a bearer token, memoized on ``request.state``.
+
+    Reuses ``request.state.user_id`` when middleware has already decoded the token.
+
+    Args:
+        request: Current request
+        token: JWT access token
+        db: Database session
+
+    Returns:
+        Optional[User]: User the token belongs to, None if not found
+
+    Raises:
+        HTTPException: If token is invalid
+    """
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return user
+
+    # ObservabilityMiddleware already decodes the bearer token
+    user_id = getattr(request.state, "user_id", None)
+    if user_id is None:
+        user_id = extract_user_id_from_token(token)
+    user = AuthService(db).get_user_by_id(user_id)
+    if user is not None:
+        request.state.user = user
+    return user
+
 
 def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db),
 ) -> User:
@@ -25,6 +60,7 @@ def get_current_user(
     Get the current authenticated user from JWT token.
 
     Args:
+        request: Current request (the resolved user is cached on its state)
         credentials: HTTP Bearer credentials
         db: Database session
 
@@ -34,11 +70,7 @@ def get_current_user(
     Raises:
         HTTPException: If token is invalid or user not found
     """
-    token = credentials.credentials
-    user_id = extract_user_id_from_token(token)
-
-    auth_service = AuthService(db)
-    user = auth_service.get_user_by_id(user_id)
+    user = _resolve_user(request, credentials.credentials, db)
 
     if user is None:
         raise HTTPException(
@@ -114,7 +146,7 @@ def get_current_instructor(
     Raises:
         HTTPException: If user is not Instructor or Super Admin
     """
-    if current_user.role not in [UserRole.INSTRUCTOR, UserRole.SUPER_ADMIN]:
+    if current_user.role not in _INSTRUCTOR_ROLES:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Instructor access required"
         )
@@ -135,6 +167,7 @@ def get_current_learner(current_user: User = Depends(get_current_active_user)) -
 
 
 def get_optional_current_user(
+    request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: Session = Depends(get_db),
 ) -> Optional[User]:
@@ -143,6 +176,7 @@ def get_optional_current_user(
     Useful for endpoints that work for both authenticated and anonymous users.
 
     Args:
+        request: Current request (the resolved user is cached on its state)
         credentials: Optional HTTP Bearer credentials
         db: Database session
 
@@ -153,11 +187,7 @@ def get_optional_current_user(
         return None
 
     try:
-        token = credentials.credentials
-        user_id = extract_user_id_from_token(token)
-
-        auth_service = AuthService(db)
-        user = auth_service.get_user_by_id(user_id)
+        user = _resolve_user(request, credentials.credentials, db)
 
         if user and user.is_active:
             return user
@@ -178,6 +208,8 @@ def require_permission(permission: Permission):
     Returns:
         Callable: Dependency function that checks for the permission
     """
+    detail = f"Permission required: {permission.value}"
+    allowed_roles = PermissionChecker.roles_with_any_of_mask(permission_mask([permission]))
 
     def permission_dependency(
         current_user: User = Depends(get_current_active_user),
@@ -194,10 +226,10 @@ def require_permission(permission: Permission):
         Raises:
             HTTPException: If user doesn't have the required permission
         """
-        if not current_user.has_permission(permission):
+        if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Permission required: {permission.value}",
+                detail=detail,
             )
         return current_user
 
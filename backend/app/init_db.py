@@ -5,7 +5,9 @@ This script creates the database tables and optionally seeds initial data.
 
 import os
 import sys
-from sqlalchemy import create_engine, text
+from sqlalchemy import String, cast, create_engine, insert, text, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
 from sqlalchemy.exc import OperationalError
 from dotenv import load_dotenv
 
@@ -14,6 +16,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import Base, engine, DATABASE_URL
 from app.models import *  # Import all models
+from app.utils.bulk_load import relaxed_durability
 
 # Load environment variables
 load_dotenv()
@@ -23,16 +26,17 @@ def create_database_if_not_exists():
     Create the database if it doesn't exist.
     """
     try:
-        # Extract database name from URL
-        db_name = os.getenv("DB_NAME", "learn_with_roko")
-        db_user = os.getenv("DB_USER", "root")
-        db_password = os.getenv("DB_PASSWORD", "")
-        db_host = os.getenv("DB_HOST", "localhost")
-        db_port = os.getenv("DB_PORT", "3306")
+        # Derive the server URL from the application's DATABASE_URL so both
+        # always point at the same host and credentials
+        url = make_url(DATABASE_URL)
+        db_name = url.database
         
-        # Create connection without database name
-        base_url = f"mysql://{db_user}:{db_password}@{db_host}:{db_port}"
-        base_engine = create_engine(base_url)
+        # One-shot admin connection without database name; no pool to keep warm
+        base_engine = create_engine(
+            url.set(database=None),
+            poolclass=NullPool,
+            connect_args={"connect_timeout": 2}
+        )
         
         # Create database if it doesn't exist
         with base_engine.connect() as conn:
@@ -72,67 +76,70 @@ def seed_initial_data():
     db = SessionLocal()
     
     try:
-        # Check if we already have data
-        existing_users = db.query(User).count()
-        if existing_users > 0:
+        # Check if we already have data (a single-row probe, not a full COUNT)
+        if db.query(User.id).limit(1).first() is not None:
             print("Database already contains data. Skipping seed.")
             return True
         
-        # Create default categories
-        categories = [
-            CourseCategory(name="Programming", description="Programming and software development courses"),
-            CourseCategory(name="Data Science", description="Data science and analytics courses"),
-            CourseCategory(name="Design", description="Design and creative courses"),
-            CourseCategory(name="Business", description="Business and entrepreneurship courses"),
-            CourseCategory(name="Marketing", description="Marketing and digital marketing courses"),
-        ]
-        
-        for category in categories:
-            db.add(category)
-        
-        # Create a super admin user (password will be hashed properly in authentication system)
-        super_admin = User(
-            email="admin@learnwithroko.com",
-            username="admin",
-            first_name="Super",
-            last_name="Admin",
-            hashed_password="$2b$12$placeholder_hash_will_be_replaced_by_auth_system",  # Placeholder
-            role=UserRole.SUPER_ADMIN,
-            is_active=True,
-            is_verified=True,
-            bio="System Administrator"
-        )
-        db.add(super_admin)
+        # The whole seed commits once; relax log flushing for that single commit
+        with relaxed_durability(db):
+            # Create default categories in a single executemany round-trip
+            db.execute(insert(CourseCategory), [
+                {"name": "Programming", "description": "Programming and software development courses"},
+                {"name": "Data Science", "description": "Data science and analytics courses"},
+                {"name": "Design", "description": "Design and creative courses"},
+                {"name": "Business", "description": "Business and entrepreneurship courses"},
+                {"name": "Marketing", "description": "Marketing and digital marketing courses"},
+            ])
+            # The seeded categories are roots, so each path is just its own id
+            db.execute(
+                update(CourseCategory)
+                .where(CourseCategory.path.is_(None))
+                .values(path=cast(CourseCategory.id, String).concat("/"))
+            )
         
-        # Create a sample instructor
-        instructor = User(
-            email="instructor@learnwithroko.com",
-            username="instructor",
-            first_name="John",
-            last_name="Instructor",
-            hashed_password="$2b$12$placeholder_hash_will_be_replaced_by_auth_system",  # Placeholder
-            role=UserRole.INSTRUCTOR,
-            is_active=True,
-            is_verified=True,
-            bio="Sample instructor for testing"
-        )
-        db.add(instructor)
-        
-        # Create a sample learner
-        learner = User(
-            email="learner@learnwithroko.com",
-            username="learner",
-            first_name="Jane",
-            last_name="Learner",
-            hashed_password="$2b$12$placeholder_hash_will_be_replaced_by_auth_system",  # Placeholder
-            role=UserRole.LEARNER,
-            is_active=True,
-            is_verified=True,
-            bio="Sample learner for testing"
-        )
-        db.add(learner)
+            # Create the default users (passwords will be hashed properly in authentication system)
+            placeholder_hash = "$2b$12$placeholder_hash_will_be_replaced_by_auth_system"  # Placeholder
+            db.execute(insert(User), [
+                {
+                    # Super admin user
+                    "email": "admin@learnwithroko.com",
+                    "username": "admin",
+                    "first_name": "Super",
+                    "last_name": "Admin",
+                    "hashed_password": placeholder_hash,
+                    "role": UserRole.SUPER_ADMIN,
+                    "is_active": True,
+                    "is_verified": True,
+                    "bio": "System Administrator",
+                },
+                {
+                    # Sample instructor
+                    "email": "instructor@learnwithroko.com",
+                    "username": "instructor",
+                    "first_name": "John",
+                    "last_name": "Instructor",
+                    "hashed_password": placeholder_hash,
+                    "role": UserRole.INSTRUCTOR,
+                    "is_active": True,
+                    "is_verified": True,
+                    "bio": "Sample instructor for testing",
+                },
+                {
+                    # Sample learner
+                    "email": "learner@learnwithroko.com",
+                    "username": "learner",
+                    "first_name": "Jane",
+                    "last_name": "Learner",
+                    "hashed_password": placeholder_hash,
+                    "role": UserRole.LEARNER,
+                    "is_active": True,
+                    "is_verified": True,
+                    "bio": "Sample learner for testing",
+                },
+            ])
         
-        db.commit()
+            db.commit()
         print("Initial data seeded successfully.")
         print("\nDefault users created:")
         print("Super Admin - Email: admin@learnwithroko.com")
@@ -2,29 +2,105 @@
 Main FastAPI application for the Learning Management System.
 """
 
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response
 from fastapi import Request, status
 from fastapi.exceptions import RequestValidationError
+import asyncio
 import logging
+import os
 
-from .database import create_tables
-from .routers import auth
+import orjson
+
+from .middleware.monitoring_middleware import ObservabilityMiddleware
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+async def _create_tables_in_background(app: FastAPI):
+    """
+    Create database tables off the event loop.
+
+    The app is marked ready only on success; on failure it stays unready and
+    the error is recorded for /health.
+    """
+    from .database import create_tables
+    try:
+        await asyncio.to_thread(create_tables)
+    except Exception:
+        logger.exception("Failed to create database tables")
+        app.state.startup_error = "Failed to create database tables"
+        return
+    logger.info("Database tables created successfully")
+    app.state.ready = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start accepting connections immediately and create tables in the background.
+
+    Until that finishes, ObservabilityMiddleware answers /health with
+    ``ready: False`` (with the error, and a 503, if table creation failed) and
+    every other path with 503. Request metrics, audit records, lecture
+    heartbeats and resource downloads are flushed for the lifetime of the app
+    and once more on shutdown, next to the periodic system metrics and alert
+    checks.
+    """
+    logger.info("Starting up Learning Management System API...")
+    from .middleware.monitoring_middleware import flush_performance_metrics
+    from .middleware.security_middleware import flush_audit_records
+    from .services.enrollment_service import heartbeat_writer
+    from .services.resource_service import download_writer
+    app.state.ready = False
+    app.state.startup_error = None
+    task = asyncio.create_task(_create_tables_in_background(app))
+    
+    # Every periodic job runs for the lifetime of the app; the flushers write
+    # out whatever is still buffered when they are cancelled
+    jobs = [
+        flush_performance_metrics(),
+        flush_audit_records(),
+        heartbeat_writer.run(),
+        download_writer.run(),
+    ]
+    observability = getattr(app.state, "observability", None)
+    if observability is not None:
+        jobs.extend(observability.background_jobs())
+    background_tasks = [asyncio.create_task(job) for job in jobs]
+    yield
+    await task
+    for background_task in background_tasks:
+        background_task.cancel()
+        try:
+            await background_task
+        except asyncio.CancelledError:
+            pass
+
+
 # Create FastAPI application
 app = FastAPI(
     title="Learning Management System API",
     description="A comprehensive LMS API supporting multiple user roles, course management, and learning analytics",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
+# Compress JSON responses of 1KB and up. Added first so it sits inside the
+# observability layer, which then sees the compressed response.
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Health checks, request timing, error tracking and alerting in one ASGI layer.
+# Added before CORS so CORS stays outermost and also covers /health.
+app.add_middleware(ObservabilityMiddleware)
+
 # CORS middleware configuration
 app.add_middleware(
     CORSMiddleware,
@@ -34,73 +110,63 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routers
-from .routers import auth, roles, users, instructor_applications, courses, files, enrollments, notes, resources, quizzes, qa, certificates, analytics, instructor_analytics, communication, moderation, transactions, taxonomy, system_settings, legal
-
-app.include_router(auth.router, prefix="/api")
-app.include_router(roles.router, prefix="/api")
-app.include_router(users.router, prefix="/api")
-app.include_router(instructor_applications.router, prefix="/api")
-app.include_router(courses.router, prefix="/api")
-app.include_router(files.router, prefix="/api")
-app.include_router(enrollments.router, prefix="/api")
-app.include_router(notes.router, prefix="/api")
-app.include_router(resources.router, prefix="/api")
-app.include_router(quizzes.router, prefix="/api")
-app.include_router(qa.router, prefix="/api")
-app.include_router(certificates.router, prefix="/api")
-app.include_router(analytics.router, prefix="/api")
-app.include_router(instructor_analytics.router, prefix="/api")
-app.include_router(communication.router, prefix="/api")
-app.include_router(moderation.router, prefix="/api")
-app.include_router(transactions.router, prefix="/api")
-app.include_router(taxonomy.router, prefix="/api")
-app.include_router(system_settings.router, prefix="/api")
-app.include_router(legal.router, prefix="/api")
+
+def _register_routers(app: FastAPI):
+    """Import the API routers and mount them under /api."""
+    from .routers import (
+        auth, roles, users, instructor_applications, courses, files, enrollments,
+        notes, resources, quizzes, qa, certificates, analytics, instructor_analytics,
+        communication, moderation, transactions, taxonomy, system_settings, legal,
+    )
+    
+    app.include_router(auth.router, prefix="/api")
+    app.include_router(roles.router, prefix="/api")
+    app.include_router(users.router, prefix="/api")
+    app.include_router(instructor_applications.router, prefix="/api")
+    app.include_router(courses.router, prefix="/api")
+    app.include_router(files.router, prefix="/api")
+    app.include_router(enrollments.router, prefix="/api")
+    app.include_router(notes.router, prefix="/api")
+    app.include_router(resources.router, prefix="/api")
+    app.include_router(quizzes.router, prefix="/api")
+    app.include_router(qa.router, prefix="/api")
+    app.include_router(certificates.router, prefix="/api")
+    app.include_router(analytics.router, prefix="/api")
+    app.include_router(instructor_analytics.router, prefix="/api")
+    app.include_router(communication.router, prefix="/api")
+    app.include_router(moderation.router, prefix="/api")
+    app.include_router(transactions.router, prefix="/api")
+    app.include_router(taxonomy.router, prefix="/api")
+    app.include_router(system_settings.router, prefix="/api")
+    app.include_router(legal.router, prefix="/api")
+
 
 # Custom exception handlers
+# Error envelopes are serialized once; only validation details vary per request
+_VALIDATION_ERROR_PREFIX = b'{"error":{"code":"VALIDATION_ERROR","message":"Request validation failed","details":'
+_INTERNAL_ERROR_BODY = orjson.dumps({
+    "error": {"code": "INTERNAL_SERVER_ERROR", "message": "An internal server error occurred"}
+})
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle validation errors with custom response format."""
-    return JSONResponse(
+    return Response(
+        content=_VALIDATION_ERROR_PREFIX + orjson.dumps(exc.errors(), default=str) + b"}}",
         status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-        content={
-            "error": {
-                "code": "VALIDATION_ERROR",
-                "message": "Request validation failed",
-                "details": exc.errors()
-            }
-        }
+        media_type="application/json"
     )
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions."""
     logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return Response(
+        content=_INTERNAL_ERROR_BODY,
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "error": {
-                "code": "INTERNAL_SERVER_ERROR",
-                "message": "An internal server error occurred"
-            }
-        }
+        media_type="application/json"
     )
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database tables on startup."""
-    logger.info("Starting up Learning Management System API...")
-    create_tables()
-    logger.info("Database tables created successfully")
-
-# Health check endpoint
-@app.get("/health")
-async def health_check():
-    """Health check endpoint."""
-    return {"status": "healthy", "message": "Learning Management System API is running"}
-
 # Root endpoint
 @app.get("/")
 async def root():
@@ -110,4 +176,21 @@ async def root():
         "version": "1.0.0",
         "docs": "/docs",
         "health": "/health"
-    }
\ No newline at end of file
+    }
+
+
+_register_routers(app)
+
+
+if __name__ == "__main__":
+    # Production: gunicorn app.main:app -k uvicorn.workers.UvicornWorker -w $WEB_CONCURRENCY
+    import uvicorn
+
+    uvicorn.run(
+        "app.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        loop="auto",
+        http="httptools",
+        workers=int(os.getenv("WEB_CONCURRENCY", 2 * (os.cpu_count() or 1) + 1)),
+    )
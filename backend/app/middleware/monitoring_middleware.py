@@ -2,84 +2,261 @@
 Middleware for performance monitoring and error tracking.
 """
 
+import asyncio
 import time
 import logging
-from typing import Optional
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from sqlalchemy.orm import Session
+from collections import defaultdict, deque
+from typing import Any, Coroutine, Deque, Dict, List, Optional, Tuple
+import orjson
+from fastapi import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from ..database import get_db
+from ..database import SessionLocal
 from ..services.monitoring_service import get_monitoring_service
+from ..services.cache_service import cache_service
 from ..auth import extract_user_id_from_token
 
 logger = logging.getLogger(__name__)
 
+# Request metrics are buffered in memory and handed to the monitoring service in
+# batches by flush_performance_metrics(), so the request path never opens a session.
+METRICS_QUEUE_SIZE = 10_000
+METRICS_FLUSH_BATCH_SIZE = 500
+METRICS_FLUSH_INTERVAL_SECONDS = 1.0
 
-class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
+# /health is served stale-while-revalidate: a cached status younger than
+# HEALTH_FRESH_SECONDS is returned as is; an older one is still returned while a
+# background refresh runs, until it expires from the cache after HEALTH_CACHE_TTL_SECONDS.
+HEALTH_FRESH_SECONDS = 2
+HEALTH_CACHE_TTL_SECONDS = 10
+
+# Matched against the undecoded request path, so the check is a bytes compare
+_HEALTH_RAW_PATH = b"/health"
+
+# Alert key for requests that did not match any route (scanners, typos), so
+# arbitrary URLs cannot grow the alerting state without bound
+_UNMATCHED_ROUTE = "<unmatched>"
+
+# Static part of the /health response headers
+_JSON_HEADERS = [(b"content-type", b"application/json")]
+
+# Served for everything except /health until the app sets app.state.ready
+_STARTING_HEALTH = {'status': 'starting', 'ready': False}
+_STARTING_BODY = orjson.dumps({
+    "error": {"code": "SERVICE_STARTING", "message": "Service is starting up, please retry shortly"}
+})
+
+# Most recent middleware alerts kept for the dashboard
+RECENT_ALERTS_SIZE = 128
+
+# Background job periods
+SYSTEM_METRICS_INTERVAL_SECONDS = 60
+ALERT_CHECK_INTERVAL_SECONDS = 300
+
+# (method, path, response_time, status_code, user_id)
+PerformanceRow = Tuple[str, str, float, int, Optional[int]]
+
+_metrics_queue: "asyncio.Queue[PerformanceRow]" = asyncio.Queue(maxsize=METRICS_QUEUE_SIZE)
+_metrics_flush_requested = asyncio.Event()
+
+
+def _flush_performance_rows(rows: List[PerformanceRow]):
+    """Hand a batch of buffered request metrics to the monitoring service."""
+    db = SessionLocal()
+    try:
+        get_monitoring_service(db).track_request_performance_bulk(rows)
+    except Exception as e:
+        logger.error("Failed to flush performance metrics: %s", e)
+    finally:
+        db.close()
+
+
+def _take_performance_batches() -> List[List[PerformanceRow]]:
+    """Drain the buffered request metrics in batches of METRICS_FLUSH_BATCH_SIZE."""
+    batches = []
+    while not _metrics_queue.empty():
+        rows = []
+        while len(rows) < METRICS_FLUSH_BATCH_SIZE and not _metrics_queue.empty():
+            rows.append(_metrics_queue.get_nowait())
+        batches.append(rows)
+    return batches
+
+
+async def flush_performance_metrics():
+    """
+    Drain buffered request metrics forever.
+
+    Flushes every METRICS_FLUSH_INTERVAL_SECONDS, or as soon as
+    METRICS_FLUSH_BATCH_SIZE rows are waiting, and once more when cancelled so
+    pending metrics survive a clean shutdown. Started and stopped by the
+    application lifespan.
     """
-    Middleware to monitor request performance and track metrics.
+    global _metrics_flush_requested
+    # asyncio events bind to the loop that first waits on them; each app run
+    # gets its own
+    _metrics_flush_requested = asyncio.Event()
+    try:
+        while True:
+            try:
+                await asyncio.wait_for(_metrics_flush_requested.wait(), METRICS_FLUSH_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            _metrics_flush_requested.clear()
+            
+            for rows in _take_performance_batches():
+                await asyncio.to_thread(_flush_performance_rows, rows)
+    finally:
+        for rows in _take_performance_batches():
+            _flush_performance_rows(rows)
+
+
+class ObservabilityMiddleware:
     """
+    Single ASGI middleware for health checks, request timing, error tracking,
+    periodic system metrics and alerting.
     
-    def __init__(self, app):
-        super().__init__(app)
+    Doing all of it in one layer means one extra coroutine frame and one
+    send wrapper per request instead of one per concern.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        
+        # Health check state
+        self._health_refresh_task: Optional[asyncio.Task] = None
+        
+        # Metrics collection state
+        self.request_count = 0
+        
+        # Alerting state: per-path sliding one-hour windows of (timestamp, status_code),
+        # oldest first, plus a running count of the 5xx entries in each window
+        self.error_counts: Dict[str, Deque[Tuple[float, int]]] = defaultdict(deque)
+        self.server_error_counts: Dict[str, int] = defaultdict(int)
+        self.recent_alerts: Deque[Dict[str, Any]] = deque(maxlen=RECENT_ALERTS_SIZE)
     
-    async def dispatch(self, request: Request, call_next):
-        # Record start time
-        start_time = time.time()
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            if scope["type"] == "lifespan":
+                # The app lifespan runs background_jobs() alongside its other tasks
+                scope["app"].state.observability = self
+            await self.app(scope, receive, send)
+            return
         
-        # Extract user ID if available
-        user_id = self._extract_user_id(request)
+        path = scope["path"]
+        
+        # The app may still be warming up (schema creation runs after the server
+        # starts accepting connections); a missing flag means no warm-up phase
+        ready = getattr(scope["app"].state, "ready", True)
+        
+        # Handle health check requests before doing any other work
+        # (raw_path is optional in the ASGI spec, so fall back to the decoded path)
+        raw_path = scope.get("raw_path")
+        if (raw_path == _HEALTH_RAW_PATH) if raw_path is not None else (path == "/health"):
+            if ready:
+                await self._handle_health_check(send)
+            else:
+                startup_error = getattr(scope["app"].state, "startup_error", None)
+                if startup_error is None:
+                    await self._send_json(send, _STARTING_HEALTH, 200)
+                else:
+                    await self._send_json(send, {'status': 'unhealthy', 'ready': False, 'error': startup_error}, 503)
+            return
+        
+        if not ready:
+            await send({
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    *_JSON_HEADERS,
+                    (b"content-length", b"%d" % len(_STARTING_BODY)),
+                    (b"retry-after", b"1"),
+                ],
+            })
+            await send({"type": "http.response.body", "body": _STARTING_BODY})
+            return
+        
+        # Record start time (monotonic, integer nanoseconds)
+        start_ns = time.perf_counter_ns()
+        method = scope["method"]
+        status_code = 500
+        
+        # Increment request counter
+        self.request_count += 1
+        
+        # Extract user ID if available, and share it with the auth dependencies
+        # through request.state so the token is only decoded once per request
+        user_id = self._extract_user_id(scope)
+        if user_id is not None:
+            scope.setdefault("state", {})["user_id"] = user_id
+        
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                
+                # Add performance headers, formatted straight to bytes as milliseconds
+                elapsed_us = (time.perf_counter_ns() - start_ns) // 1000
+                header = (b"x-response-time", b"%d.%03dms" % divmod(elapsed_us, 1000))
+                headers = message.get("headers")
+                if isinstance(headers, list):
+                    headers.append(header)
+                else:
+                    message["headers"] = [*(headers or ()), header]
+            await send(message)
         
         # Process request
         try:
-            response = await call_next(request)
-            
-            # Calculate response time
-            response_time = time.time() - start_time
-            
-            # Track performance metrics
-            self._track_performance(
-                request.method,
-                str(request.url.path),
-                response_time,
-                response.status_code,
-                user_id
-            )
-            
-            # Add performance headers
-            response.headers["X-Response-Time"] = f"{response_time:.3f}s"
-            
-            return response
-            
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            # Calculate response time for errors
-            response_time = time.time() - start_time
-            
             # Track error
-            self._track_error(e, user_id, str(request.url.path))
-            
-            # Track performance (with error status)
+            self._track_error(e, user_id, path)
+            status_code = 500  # Internal server error
+            raise
+        finally:
+            # Track performance metrics
             self._track_performance(
-                request.method,
-                str(request.url.path),
-                response_time,
-                500,  # Internal server error
+                method,
+                path,
+                (time.perf_counter_ns() - start_ns) / 1e9,
+                status_code,
                 user_id
             )
             
-            # Re-raise the exception
-            raise e
+            # Track errors for alerting, keyed by route template
+            if status_code >= 400:
+                self._track_error_for_alerting(self._route_key(scope), status_code)
     
-    def _extract_user_id(self, request: Request) -> Optional[int]:
-        """Extract user ID from request if available."""
-        try:
-            auth_header = request.headers.get("Authorization")
-            if auth_header and auth_header.startswith("Bearer "):
-                token = auth_header.split(" ")[1]
-                return extract_user_id_from_token(token)
-        except Exception:
-            pass
+    # Background jobs
+    
+    def background_jobs(self) -> List[Coroutine[Any, Any, None]]:
+        """Periodic system metrics and alert checks, for the app lifespan to run."""
+        return [self._system_metrics_loop(), self._alert_check_loop()]
+    
+    async def _system_metrics_loop(self):
+        """Collect system metrics every SYSTEM_METRICS_INTERVAL_SECONDS."""
+        while True:
+            await asyncio.sleep(SYSTEM_METRICS_INTERVAL_SECONDS)
+            await self._collect_system_metrics()
+    
+    async def _alert_check_loop(self):
+        """Check alert conditions every ALERT_CHECK_INTERVAL_SECONDS."""
+        while True:
+            await asyncio.sleep(ALERT_CHECK_INTERVAL_SECONDS)
+            self._check_alerts()
+    
+    # Request tracking
+    
+    def _extract_user_id(self, scope: Scope) -> Optional[int]:
+        """Extract user ID from the request's Authorization header if available."""
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                if value.startswith(b"Bearer "):
+                    try:
+                        return extract_user_id_from_token(value[7:].decode("latin-1"))
+                    except HTTPException:
+                        # Invalid or expired; the auth dependency reports it
+                        return None
+                break
         return None
     
     def _track_performance(
@@ -90,25 +267,20 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
         status_code: int,
         user_id: Optional[int]
     ):
-        """Track performance metrics."""
+        """Buffer performance metrics for the background flusher."""
         try:
-            # Get database session
-            db = next(get_db())
-            monitoring_service = get_monitoring_service(db)
-            
-            # Track the request
-            monitoring_service.track_request_performance(
-                method, path, response_time, status_code, user_id
-            )
-            
-        except Exception as e:
-            logger.error(f"Failed to track performance metrics: {e}")
+            _metrics_queue.put_nowait((method, path, response_time, status_code, user_id))
+        except asyncio.QueueFull:
+            logger.warning("Performance metrics buffer full, dropping sample")
+            return
+        
+        if _metrics_queue.qsize() >= METRICS_FLUSH_BATCH_SIZE:
+            _metrics_flush_requested.set()
     
     def _track_error(self, error: Exception, user_id: Optional[int], request_path: str):
         """Track error occurrence."""
+        db = SessionLocal()
         try:
-            # Get database session
-            db = next(get_db())
             monitoring_service = get_monitoring_service(db)
             
             # Track the error
@@ -119,97 +291,88 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
             )
             
         except Exception as e:
-            logger.error(f"Failed to track error: {e}")
-
-
-class HealthCheckMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to handle health check requests.
-    """
+            logger.error("Failed to track error: %s", e)
+        finally:
+            db.close()
     
-    def __init__(self, app):
-        super().__init__(app)
+    # Health check
     
-    async def dispatch(self, request: Request, call_next):
-        # Handle health check requests
-        if request.url.path == "/health":
+    async def _handle_health_check(self, send: Send):
+        """Answer /health from the cached status."""
+        # Load balancers probe /health constantly; serve the cached status and
+        # recompute it off the request path once it is no longer fresh
+        cached = cache_service.get("health_status")
+        if cached is None:
             try:
-                # Get database session
-                db = next(get_db())
-                monitoring_service = get_monitoring_service(db)
-                
-                # Get health status
-                health_status = monitoring_service.get_health_status()
-                
-                # Determine HTTP status code based on health
-                if health_status['status'] == 'healthy':
-                    status_code = 200
-                elif health_status['status'] == 'warning':
-                    status_code = 200  # Still operational
-                else:
-                    status_code = 503  # Service unavailable
-                
-                from fastapi.responses import JSONResponse
-                return JSONResponse(
-                    content=health_status,
-                    status_code=status_code
-                )
-                
+                health_status = await self._refresh_health()
             except Exception as e:
-                logger.error(f"Health check failed: {e}")
-                from fastapi.responses import JSONResponse
-                return JSONResponse(
-                    content={
-                        'status': 'error',
-                        'message': 'Health check failed',
-                        'error': str(e)
-                    },
-                    status_code=503
-                )
+                logger.error("Health check failed: %s", e)
+                health_status = {
+                    'status': 'error',
+                    'message': 'Health check failed',
+                    'error': str(e)
+                }
+        else:
+            computed_at, health_status = cached
+            if time.time() - computed_at > HEALTH_FRESH_SECONDS and (
+                self._health_refresh_task is None or self._health_refresh_task.done()
+            ):
+                self._health_refresh_task = asyncio.create_task(self._refresh_health_in_background())
         
-        # Continue with normal request processing
-        return await call_next(request)
-
-
-class MetricsCollectionMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to collect various application metrics.
-    """
+        # Determine HTTP status code based on health
+        if health_status['status'] in ('healthy', 'warning'):
+            status_code = 200  # Still operational
+        else:
+            status_code = 503  # Service unavailable
+        
+        await self._send_json(send, {**health_status, 'ready': True}, status_code)
     
-    def __init__(self, app):
-        super().__init__(app)
-        self.request_count = 0
-        self.last_metrics_collection = time.time()
+    @staticmethod
+    def _compute_health_status() -> dict:
+        """Compute the current health status."""
+        db = SessionLocal()
+        try:
+            return get_monitoring_service(db).get_health_status()
+        finally:
+            db.close()
     
-    async def dispatch(self, request: Request, call_next):
-        # Increment request counter
-        self.request_count += 1
-        
-        # Collect system metrics periodically (every 60 seconds)
-        current_time = time.time()
-        if current_time - self.last_metrics_collection > 60:
-            self._collect_system_metrics()
-            self.last_metrics_collection = current_time
-        
-        # Process request normally
-        response = await call_next(request)
-        
-        return response
+    async def _refresh_health(self) -> dict:
+        """Recompute the health status in a worker thread and cache it."""
+        health_status = await asyncio.to_thread(self._compute_health_status)
+        cache_service.set("health_status", (time.time(), health_status), HEALTH_CACHE_TTL_SECONDS)
+        return health_status
+    
+    async def _refresh_health_in_background(self):
+        """Refresh the cached health status, keeping the stale value on failure."""
+        try:
+            await self._refresh_health()
+        except Exception as e:
+            logger.error("Health check refresh failed: %s", e)
+    
+    @staticmethod
+    async def _send_json(send: Send, content: dict, status_code: int):
+        """Send a JSON response directly as ASGI messages."""
+        body = orjson.dumps(content, default=str)
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [*_JSON_HEADERS, (b"content-length", b"%d" % len(body))],
+        })
+        await send({"type": "http.response.body", "body": body})
+    
+    # System metrics
     
-    def _collect_system_metrics(self):
+    async def _collect_system_metrics(self):
         """Collect and store system metrics."""
+        db = SessionLocal()
         try:
-            # Get database session
-            db = next(get_db())
             monitoring_service = get_monitoring_service(db)
             
-            # Get system metrics
-            system_metrics = monitoring_service.system_monitor.get_system_metrics()
-            process_metrics = monitoring_service.system_monitor.get_process_metrics()
+            # Get system metrics (psutil blocks, so keep it off the event loop)
+            system_metrics = await asyncio.to_thread(monitoring_service.system_monitor.get_system_metrics)
+            process_metrics = await asyncio.to_thread(monitoring_service.system_monitor.get_process_metrics)
             
             # Store metrics in cache for dashboard access
-            from ..services.cache_service import cache_service
-            
             cache_service.set("system_metrics", system_metrics, 300)  # 5 minutes TTL
             cache_service.set("process_metrics", process_metrics, 300)
             
@@ -219,95 +382,82 @@ class MetricsCollectionMiddleware(BaseHTTPMiddleware):
             logger.debug("System metrics collected and cached")
             
         except Exception as e:
-            logger.error(f"Failed to collect system metrics: {e}")
-
-
-class AlertingMiddleware(BaseHTTPMiddleware):
-    """
-    Middleware to handle alerting based on request patterns.
-    """
+            logger.error("Failed to collect system metrics: %s", e)
+        finally:
+            db.close()
     
-    def __init__(self, app):
-        super().__init__(app)
-        self.error_counts = {}
-        self.last_alert_check = time.time()
+    # Alerting
     
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
-        # Track errors for alerting
-        if response.status_code >= 400:
-            self._track_error_for_alerting(request.url.path, response.status_code)
+    @staticmethod
+    def _route_key(scope: Scope) -> str:
+        """
+        Key for the alerting windows: the matched route's path template.
         
-        # Check for alerts periodically
-        current_time = time.time()
-        if current_time - self.last_alert_check > 300:  # Every 5 minutes
-            self._check_alerts()
-            self.last_alert_check = current_time
-        
-        return response
+        The router records the matched route in the shared scope. Its path is the
+        same str object on every request, so window lookups hit on identity and
+        the number of keys is bounded by the number of routes.
+        """
+        route = scope.get("route")
+        return getattr(route, "path", None) or _UNMATCHED_ROUTE
     
     def _track_error_for_alerting(self, path: str, status_code: int):
         """Track errors for alerting purposes."""
         current_time = time.time()
         
-        # Initialize error tracking for this path
-        if path not in self.error_counts:
-            self.error_counts[path] = []
-        
         # Add error with timestamp
         self.error_counts[path].append((current_time, status_code))
+        if status_code >= 500:
+            self.server_error_counts[path] += 1
         
         # Clean old errors (older than 1 hour)
-        cutoff_time = current_time - 3600
-        self.error_counts[path] = [
-            (ts, code) for ts, code in self.error_counts[path]
-            if ts > cutoff_time
-        ]
+        self._expire_errors(path, current_time - 3600)
+    
+    def _expire_errors(self, path: str, cutoff_time: float):
+        """Drop errors at or before cutoff_time from the front of a path's window."""
+        errors = self.error_counts[path]
+        while errors and errors[0][0] <= cutoff_time:
+            _, code = errors.popleft()
+            if code >= 500:
+                self.server_error_counts[path] -= 1
     
     def _check_alerts(self):
         """Check for alert conditions."""
         try:
-            current_time = time.time()
-            one_hour_ago = current_time - 3600
+            one_hour_ago = time.time() - 3600
             
             for path, errors in self.error_counts.items():
-                # Count recent errors
-                recent_errors = [
-                    (ts, code) for ts, code in errors
-                    if ts > one_hour_ago
-                ]
+                # Windows only expire on new errors, so trim quiet paths first
+                self._expire_errors(path, one_hour_ago)
                 
                 # Alert if too many errors on a single endpoint
-                if len(recent_errors) > 20:  # More than 20 errors per hour
+                if len(errors) > 20:  # More than 20 errors per hour
                     self._send_alert(
                         f"High error rate on {path}",
-                        f"Endpoint {path} has {len(recent_errors)} errors in the last hour"
+                        f"Endpoint {path} has {len(errors)} errors in the last hour"
                     )
                 
                 # Alert for specific error types
-                server_errors = [code for _, code in recent_errors if code >= 500]
-                if len(server_errors) > 5:  # More than 5 server errors per hour
+                server_errors = self.server_error_counts[path]
+                if server_errors > 5:  # More than 5 server errors per hour
                     self._send_alert(
                         f"Server errors on {path}",
-                        f"Endpoint {path} has {len(server_errors)} server errors in the last hour"
+                        f"Endpoint {path} has {server_errors} server errors in the last hour"
                     )
             
         except Exception as e:
-            logger.error(f"Failed to check alerts: {e}")
+            logger.error("Failed to check alerts: %s", e)
     
     def _send_alert(self, title: str, message: str):
         """Send an alert."""
-        logger.critical(f"ALERT: {title} - {message}")
-        
-        # Store alert in cache for dashboard display
-        from ..services.cache_service import cache_service
+        logger.critical("ALERT: %s - %s", title, message)
         
-        alert_data = {
+        # Keep the alert in a bounded ring and publish the whole ring under one
+        # cache key for dashboard display
+        self.recent_alerts.append({
             'title': title,
             'message': message,
             'timestamp': time.time(),
             'severity': 'HIGH'
-        }
+        })
         
-        cache_service.set(f"alert:{int(time.time())}", alert_data, 3600)  # 1 hour TTL
\ No newline at end of file
+        cache_service.set("recent_alerts", list(self.recent_alerts), 3600)  # 1 hour TTL
\ No newline at end of file
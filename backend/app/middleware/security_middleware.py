@@ -2,22 +2,32 @@
 Security middleware for input validation, rate limiting, and audit logging.
 """
 
+import asyncio
 import time
-import json
+import orjson
 import logging
-from typing import Dict, Any, Optional
-from collections import defaultdict, deque
-from datetime import datetime, timedelta
+import logging.handlers
+import queue
+import atexit
+from typing import Dict, Any, List, Optional, Tuple, Union
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
 from fastapi import Request, Response, HTTPException, status
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from sqlalchemy.orm import Session
 import re
 import html
-from urllib.parse import unquote
+from urllib.parse import unquote_to_bytes
 
-from ..database import get_db
+try:
+    import hyperscan
+except ImportError:  # Optional accelerated matcher; fall back to re
+    hyperscan = None
+
+from ..database import get_db, SessionLocal
 from ..models.user import User
+from ..services.audit_service import AuditService
 
 # Configure security logger
 security_logger = logging.getLogger("security")
@@ -32,270 +42,517 @@ formatter = logging.Formatter(
     '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 security_handler.setFormatter(formatter)
-security_logger.addHandler(security_handler)
 
+# Log calls only enqueue the record; a listener thread does the file I/O, so
+# the event loop never blocks on the handler lock or the write
+security_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+security_logger.addHandler(logging.handlers.QueueHandler(security_log_queue))
+security_log_listener = logging.handlers.QueueListener(
+    security_log_queue, security_handler, respect_handler_level=True
+)
+security_log_listener.start()
+atexit.register(security_log_listener.stop)
+
+# Audit records are queued on the request path and written by flush_audit_records()
+# in batches, so audited requests never wait on the log file or the database.
+AUDIT_QUEUE_SIZE = 10_000
+AUDIT_FLUSH_BATCH_SIZE = 128
+AUDIT_FLUSH_INTERVAL_SECONDS = 0.5
+
+_audit_queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=AUDIT_QUEUE_SIZE)
+
+
+def _flush_audit_records(records: List[Dict[str, Any]]):
+    """Write a batch of audit records to the security log and the audit_logs table."""
+    for record in records:
+        # The request path only records the epoch time; format it here
+        timestamp = datetime.fromtimestamp(record.pop("ts"), timezone.utc).replace(tzinfo=None)
+        record["timestamp"] = timestamp
+        security_logger.info(
+            "AUDIT: %s", orjson.dumps(record, option=orjson.OPT_NAIVE_UTC).decode()
+        )
+    
+    db = SessionLocal()
+    try:
+        AuditService(db).log_audit_events_bulk(records)
+    except Exception as e:
+        db.rollback()
+        security_logger.error("Failed to store audit records: %s", e)
+    finally:
+        db.close()
+
+
+def _take_audit_batches() -> List[List[Dict[str, Any]]]:
+    """Drain the queued audit records in batches of AUDIT_FLUSH_BATCH_SIZE."""
+    batches = []
+    while not _audit_queue.empty():
+        batch = []
+        while len(batch) < AUDIT_FLUSH_BATCH_SIZE and not _audit_queue.empty():
+            batch.append(_audit_queue.get_nowait())
+        batches.append(batch)
+    return batches
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+
+async def flush_audit_records():
+    """
+    Drain queued audit records forever.
+    
+    Every AUDIT_FLUSH_INTERVAL_SECONDS, writes whatever is queued off the event
+    loop, and once more when cancelled so queued records survive a clean
+    shutdown. Started and stopped by the application lifespan.
+    """
+    try:
+        while True:
+            await asyncio.sleep(AUDIT_FLUSH_INTERVAL_SECONDS)
+            for records in _take_audit_batches():
+                await asyncio.to_thread(_flush_audit_records, records)
+    finally:
+        for records in _take_audit_batches():
+            _flush_audit_records(records)
+
+
+def get_client_ip(request: Request) -> str:
     """
-    Rate limiting middleware to prevent DDoS attacks and abuse.
+    Extract the client IP from request headers, computed once per request.
+    
+    The result is cached on ``request.state`` so every security middleware
+    reuses it.
     """
+    client_ip = getattr(request.state, "client_ip", None)
+    if client_ip:
+        return client_ip
+    
+    # Check for forwarded headers (behind proxy/load balancer)
+    forwarded_for = request.headers.get("X-Forwarded-For")
+    if forwarded_for:
+        client_ip = forwarded_for.partition(",")[0].strip()
+    else:
+        # Fallback to direct connection
+        client_ip = request.headers.get("X-Real-IP") or (
+            request.client.host if request.client else "unknown"
+        )
+    
+    request.state.client_ip = client_ip
+    return client_ip
+
+
+# Rate-limit counters are split across this many tables by IP hash (power of two)
+RATE_LIMIT_SHARDS = 64
+
+
+class SecurityMiddleware:
+    """
+    Single ASGI middleware for rate limiting, input validation, audit logging
+    and security response headers.
+    
+    Doing all of it in one pure ASGI layer avoids stacking four
+    BaseHTTPMiddleware task groups and response streams per request. Request
+    bodies are scanned chunk by chunk as they arrive and replayed to the
+    application without a second buffered copy.
+    """
+    
+    # Dangerous patterns to detect. Every pattern is linear-time: presence of an
+    # opening tag is enough to reject, so no pattern spans to a closing tag, and
+    # repeats are bounded so failed matches cannot backtrack over the whole input.
+    # Patterns are lowercase and matched against lowercased content.
+    XSS_PATTERNS = [
+        r'<\s{0,16}script\b',
+        r'javascript:',
+        r'\bon\w{1,32}\s{0,16}=',
+        r'<\s{0,16}(?:iframe|object|embed)\b',
+    ]
+    
+    SQL_INJECTION_PATTERNS = [
+        r'\b(?:select|insert|update|delete|drop|create|alter|exec|union)\b',
+        r'\b(?:or|and)\s{1,16}\d{1,20}\s{0,16}=\s{0,16}\d',
+        r'\b(?:or|and)\s{1,16}[\'"]?\w{1,64}[\'"]?\s{0,16}=\s{0,16}[\'"]?\w',
+        r'--|#|/\*|\*/',
+        r'\bunion\s{1,16}select\b',
+    ]
+    
+    # Lowercase substrings of which every pattern above needs at least one
+    # ('<' for tags, '=' for handlers and tautologies, the SQL keywords and
+    # comment markers). Content containing none of them cannot match, so the
+    # full scan is skipped. Keep in sync with the patterns.
+    MALICIOUS_TRIGGERS = (
+        b'<', b'=', b'javascript:', b'--', b'#', b'/*', b'*/',
+        b'select', b'insert', b'update', b'delete', b'drop', b'create', b'alter', b'exec', b'union',
+    )
+    
+    # Operations that require audit logging
+    SENSITIVE_OPERATIONS = {
+        "POST": ["/api/auth/login", "/api/auth/register", "/api/users", "/api/courses"],
+        "PUT": ["/api/users/", "/api/courses/", "/api/system-settings/"],
+        "DELETE": ["/api/users/", "/api/courses/"],
+        "PATCH": ["/api/users/", "/api/courses/"]
+    }
+    
+    # Security headers added to every response, constant for the life of the process
+    HEADERS = {
+        "X-Content-Type-Options": "nosniff",
+        "X-Frame-Options": "DENY",
+        "X-XSS-Protection": "1; mode=block",
+        "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+        "Referrer-Policy": "strict-origin-when-cross-origin",
+        "Content-Security-Policy": (
+            "default-src 'self'; "
+            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
+            "style-src 'self' 'unsafe-inline'; "
+            "img-src 'self' data: https:; "
+            "font-src 'self' https:; "
+            "connect-src 'self' https:; "
+            "media-src 'self' https:; "
+            "object-src 'none'; "
+            "base-uri 'self'; "
+            "form-action 'self'"
+        ),
+    }
     
-    def __init__(self, app, calls: int = 100, period: int = 60):
-        super().__init__(app)
+    # Pre-encoded (name, value) pairs appended to the raw header list as-is
+    RAW_HEADERS = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in HEADERS.items()
+    ]
+    
+    def __init__(self, app: ASGIApp, calls: int = 100, period: int = 60, max_ips: int = 65536):
+        self.app = app
+        
+        # Rate limiting
         self.calls = calls  # Number of calls allowed
         self.period = period  # Time period in seconds
-        self.clients = defaultdict(lambda: deque())
+        self.max_ips = max_ips  # Client IPs tracked at once; least recent are evicted
+        # GCRA: each call pushes the client's theoretical arrival time (TAT) one
+        # emission interval forward; a call is rejected when that would put the
+        # TAT more than one period ahead of now. Integer nanoseconds keep
+        # calls * interval from rounding past the period.
+        self.emission_interval_ns = period * 1_000_000_000 // calls
+        self.delay_tolerance_ns = period * 1_000_000_000
+        # Per-IP TATs sharded by IP hash, each shard ordered from least to most
+        # recently seen
+        self.shard_mask = RATE_LIMIT_SHARDS - 1
+        self.max_ips_per_shard = max(1, max_ips // RATE_LIMIT_SHARDS)
+        self.shards: List[OrderedDict] = [OrderedDict() for _ in range(RATE_LIMIT_SHARDS)]
+        
+        # Input validation
+        patterns = self.XSS_PATTERNS + self.SQL_INJECTION_PATTERNS
+        # One alternation over every pattern, so a single scan decides the verdict.
+        # Compiled as bytes so request bodies are scanned without decoding them.
+        self.malicious_regex = re.compile(
+            b'|'.join(b'(?:%s)' % pattern.encode() for pattern in patterns)
+        )
+        self.malicious_db = self._compile_hyperscan_database(patterns)
+        self.malicious_stream_db = self._compile_hyperscan_database(
+            patterns, hyperscan.HS_MODE_STREAM if hyperscan else None
+        )
+        
+        # Audit logging: one anchored prefix alternation per method. Queued
+        # records are written by flush_audit_records(), run by the app lifespan.
+        self.audit_regexes = {
+            method: re.compile('|'.join(re.escape(prefix) for prefix in prefixes))
+            for method, prefixes in self.SENSITIVE_OPERATIONS.items()
+        }
     
-    async def dispatch(self, request: Request, call_next):
-        # Get client IP
-        client_ip = self._get_client_ip(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # Clean old entries
-        now = time.time()
-        client_calls = self.clients[client_ip]
+        # Read straight from the scope rather than building a URL per access
+        path = scope["path"]
+        method = scope["method"]
+        request = Request(scope)
+        client_ip = get_client_ip(request)
+        audited = self._should_audit(method, path)
+        status_code = 500
         
-        # Remove calls older than the period
-        while client_calls and client_calls[0] <= now - self.period:
-            client_calls.popleft()
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", ()), *self.RAW_HEADERS]
+            await send(message)
         
-        # Check if rate limit exceeded
-        if len(client_calls) >= self.calls:
+        # Rate limiting
+        retry_after = self._check_rate_limit(client_ip)
+        if retry_after is not None:
             security_logger.warning(
-                f"Rate limit exceeded for IP: {client_ip}, "
-                f"calls: {len(client_calls)}, period: {self.period}s"
+                "Rate limit exceeded for IP: %s, limit: %d per %ds",
+                client_ip, self.calls, self.period
             )
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={
                     "error": {
                         "code": "RATE_LIMIT_EXCEEDED",
                         "message": f"Rate limit exceeded. Maximum {self.calls} requests per {self.period} seconds.",
-                        "retry_after": self.period
+                        "retry_after": retry_after
                     }
                 }
             )
+            await response(scope, receive, send_wrapper)
+            return
         
-        # Add current call
-        client_calls.append(now)
+        # Input validation
+        if not self._should_skip_validation(path):
+            rejection, receive = await self._validate_input(request, method, path, client_ip, receive)
+            if rejection is not None:
+                await rejection(scope, receive, send_wrapper)
+                return
         
-        response = await call_next(request)
-        return response
-    
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP from request headers."""
-        # Check for forwarded headers (behind proxy/load balancer)
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
+        if not audited:
+            await self.app(scope, receive, send_wrapper)
+            return
         
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
+        # Audit logging
+        start_time = time.time()
+        user_info = await self._get_user_info(request)
         
-        # Fallback to direct connection
-        return request.client.host if request.client else "unknown"
-
-
-class InputValidationMiddleware(BaseHTTPMiddleware):
-    """
-    Input validation and sanitization middleware.
-    """
+        await self.app(scope, receive, send_wrapper)
+        
+        audit_data = {
+            "ts": start_time,
+            "method": method,
+            "path": path,
+            "client_ip": client_ip,
+            "user_agent": request.headers.get("User-Agent", "Unknown"),
+            "user_id": user_info.get("user_id") if user_info else None,
+            "user_role": user_info.get("role") if user_info else None,
+            "query_params": dict(request.query_params),
+            "status_code": status_code,
+            "response_time_ms": round((time.time() - start_time) * 1000, 2),
+            "success": 200 <= status_code < 400
+        }
+        
+        # Hand off to the background writer
+        try:
+            _audit_queue.put_nowait(audit_data)
+        except asyncio.QueueFull:
+            security_logger.warning("Audit queue full, dropping record")
     
-    # Dangerous patterns to detect
-    XSS_PATTERNS = [
-        r'<script[^>]*>.*?</script>',
-        r'javascript:',
-        r'on\w+\s*=',
-        r'<iframe[^>]*>.*?</iframe>',
-        r'<object[^>]*>.*?</object>',
-        r'<embed[^>]*>.*?</embed>',
-    ]
+    # Rate limiting
     
-    SQL_INJECTION_PATTERNS = [
-        r'(\b(SELECT|INSERT|UPDATE|DELETE|DROP|CREATE|ALTER|EXEC|UNION)\b)',
-        r'(\b(OR|AND)\s+\d+\s*=\s*\d+)',
-        r'(\b(OR|AND)\s+[\'"]?\w+[\'"]?\s*=\s*[\'"]?\w+[\'"]?)',
-        r'(--|#|/\*|\*/)',
-        r'(\bUNION\s+SELECT\b)',
-    ]
+    def _check_rate_limit(self, client_ip: str) -> Optional[int]:
+        """
+        Count a call from ``client_ip`` against its allowance.
+        
+        Returns:
+            None if the call is allowed, otherwise the seconds until it would be
+        """
+        now = time.monotonic_ns()
+        
+        # Re-inserting moves the IP to the most recent end of its shard
+        clients = self.shards[hash(client_ip) & self.shard_mask]
+        tat = max(clients.pop(client_ip, now), now)
+        new_tat = tat + self.emission_interval_ns
+        allowed = new_tat - now <= self.delay_tolerance_ns
+        clients[client_ip] = new_tat if allowed else tat
+        if len(clients) > self.max_ips_per_shard:
+            clients.popitem(last=False)
+        
+        if allowed:
+            return None
+        return -(-(new_tat - now - self.delay_tolerance_ns) // 1_000_000_000)
     
-    def __init__(self, app):
-        super().__init__(app)
-        self.xss_regex = re.compile('|'.join(self.XSS_PATTERNS), re.IGNORECASE)
-        self.sql_regex = re.compile('|'.join(self.SQL_INJECTION_PATTERNS), re.IGNORECASE)
+    # Input validation
     
-    async def dispatch(self, request: Request, call_next):
-        # Skip validation for certain endpoints
-        if self._should_skip_validation(request):
-            return await call_next(request)
+    async def _validate_input(
+        self, request: Request, method: str, path: str, client_ip: str, receive: Receive
+    ) -> Tuple[Optional[Response], Receive]:
+        """
+        Validate the request body and query parameters.
         
+        Returns:
+            Tuple of the rejection response (None if the input is clean) and the
+            receive callable the application should read the body from
+        """
         # Validate request body if present
-        if request.method in ["POST", "PUT", "PATCH"]:
+        if (
+            method in ("POST", "PUT", "PATCH")
+            and not request.headers.get("content-type", "").startswith("multipart/form-data")
+        ):
             try:
-                body = await request.body()
-                if body:
-                    # Decode and validate body
-                    body_str = body.decode('utf-8')
-                    
-                    # Check for malicious patterns
-                    if self._contains_malicious_content(body_str):
-                        client_ip = self._get_client_ip(request)
-                        security_logger.warning(
-                            f"Malicious content detected from IP: {client_ip}, "
-                            f"path: {request.url.path}, body: {body_str[:200]}..."
-                        )
-                        return JSONResponse(
-                            status_code=status.HTTP_400_BAD_REQUEST,
-                            content={
-                                "error": {
-                                    "code": "INVALID_INPUT",
-                                    "message": "Request contains potentially malicious content"
-                                }
-                            }
-                        )
-                
-                # Recreate request with validated body
-                request._body = body
+                body, malicious = await self._receive_and_scan_body(receive)
             except Exception as e:
-                security_logger.error(f"Error validating request body: {e}")
-                return JSONResponse(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    content={
-                        "error": {
-                            "code": "INVALID_REQUEST",
-                            "message": "Invalid request format"
-                        }
-                    }
+                security_logger.error("Error validating request body: %s", e)
+                return self._error_response(
+                    status.HTTP_400_BAD_REQUEST, "INVALID_REQUEST", "Invalid request format"
+                ), receive
+            
+            if body is None:
+                # Client disconnected before sending the whole body
+                return Response(status_code=status.HTTP_400_BAD_REQUEST), receive
+            
+            if malicious:
+                security_logger.warning(
+                    "Malicious content detected from IP: %s, path: %s, body: %s...",
+                    client_ip, path, body[:200].decode('utf-8', 'replace')
                 )
+                return self._error_response(
+                    status.HTTP_400_BAD_REQUEST,
+                    "INVALID_INPUT",
+                    "Request contains potentially malicious content"
+                ), receive
+            
+            receive = self._replay_body(body, receive)
         
         # Validate query parameters
         for key, value in request.query_params.items():
             if self._contains_malicious_content(value):
-                client_ip = self._get_client_ip(request)
                 security_logger.warning(
-                    f"Malicious query parameter from IP: {client_ip}, "
-                    f"path: {request.url.path}, param: {key}={value}"
-                )
-                return JSONResponse(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    content={
-                        "error": {
-                            "code": "INVALID_PARAMETER",
-                            "message": f"Query parameter '{key}' contains invalid content"
-                        }
-                    }
+                    "Malicious query parameter from IP: %s, path: %s, param: %s=%s",
+                    client_ip, path, key, value
                 )
+                return self._error_response(
+                    status.HTTP_400_BAD_REQUEST,
+                    "INVALID_PARAMETER",
+                    f"Query parameter '{key}' contains invalid content"
+                ), receive
         
-        response = await call_next(request)
-        return response
+        return None, receive
     
-    def _should_skip_validation(self, request: Request) -> bool:
-        """Check if validation should be skipped for this request."""
-        # Skip for file uploads or specific endpoints
-        skip_paths = ["/api/files/upload", "/docs", "/redoc", "/openapi.json"]
-        return any(request.url.path.startswith(path) for path in skip_paths)
-    
-    def _contains_malicious_content(self, content: str) -> bool:
-        """Check if content contains malicious patterns."""
-        # URL decode content
-        decoded_content = unquote(content)
+    async def _receive_and_scan_body(self, receive: Receive) -> Tuple[Optional[bytes], bool]:
+        """
+        Read the request body from ``receive``, scanning each chunk as it arrives.
         
-        # Check for XSS patterns
-        if self.xss_regex.search(decoded_content):
-            return True
+        With Hyperscan the body is matched in streaming mode and reading stops
+        at the first hit; otherwise the complete body is scanned once at the end.
         
-        # Check for SQL injection patterns
-        if self.sql_regex.search(decoded_content):
-            return True
+        Returns:
+            Tuple of the body read so far (None if the client disconnected) and
+            whether malicious content was found
+        """
+        chunks: List[bytes] = []
         
-        return False
-    
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP from request headers."""
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
+        if self.malicious_stream_db is None:
+            while True:
+                message = await receive()
+                if message["type"] != "http.request":
+                    return None, False
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    break
+            body = b"".join(chunks)
+            return body, bool(body) and self._contains_malicious_content(body)
         
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
+        matched = False
         
-        return request.client.host if request.client else "unknown"
-
-
-class AuditLoggingMiddleware(BaseHTTPMiddleware):
-    """
-    Audit logging middleware for sensitive operations.
-    """
-    
-    # Operations that require audit logging
-    SENSITIVE_OPERATIONS = {
-        "POST": ["/api/auth/login", "/api/auth/register", "/api/users", "/api/courses"],
-        "PUT": ["/api/users/", "/api/courses/", "/api/system-settings/"],
-        "DELETE": ["/api/users/", "/api/courses/"],
-        "PATCH": ["/api/users/", "/api/courses/"]
-    }
+        def on_match(pattern_id, start, end, flags, context):
+            nonlocal matched
+            matched = True
+            return True  # Stop at the first hit
+        
+        # Percent-escapes are decoded before matching; a trailing "%" or "%X"
+        # is held back until the next chunk completes it
+        pending = b""
+        try:
+            with self.malicious_stream_db.stream(match_event_handler=on_match) as stream:
+                while True:
+                    message = await receive()
+                    if message["type"] != "http.request":
+                        return None, False
+                    chunk = message.get("body", b"")
+                    chunks.append(chunk)
+                    more_body = message.get("more_body", False)
+                    
+                    data = pending + chunk
+                    escape_at = data.rfind(b"%", -2) if more_body else -1
+                    if escape_at == -1:
+                        pending = b""
+                    else:
+                        data, pending = data[:escape_at], data[escape_at:]
+                    stream.scan(unquote_to_bytes(data).lower())
+                    
+                    if not more_body:
+                        break
+        except hyperscan.ScanTerminated:
+            pass
+        
+        return b"".join(chunks), matched
     
-    def __init__(self, app):
-        super().__init__(app)
+    @staticmethod
+    def _replay_body(body: bytes, receive: Receive) -> Receive:
+        """Build a receive callable that hands the already-read body to the app."""
+        body_sent = False
+        
+        async def replay() -> Message:
+            nonlocal body_sent
+            if body_sent:
+                return await receive()
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        
+        return replay
     
-    async def dispatch(self, request: Request, call_next):
-        # Check if this is a sensitive operation
-        should_audit = self._should_audit(request)
-        
-        if should_audit:
-            # Capture request details
-            client_ip = self._get_client_ip(request)
-            user_agent = request.headers.get("User-Agent", "Unknown")
-            
-            # Get user info if available
-            user_info = await self._get_user_info(request)
-            
-            # Log the request
-            audit_data = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "method": request.method,
-                "path": str(request.url.path),
-                "client_ip": client_ip,
-                "user_agent": user_agent,
-                "user_id": user_info.get("user_id") if user_info else None,
-                "user_role": user_info.get("role") if user_info else None,
-                "query_params": dict(request.query_params)
+    @staticmethod
+    def _error_response(status_code: int, code: str, message: str) -> JSONResponse:
+        """Build the JSON error envelope for a rejected request."""
+        return JSONResponse(
+            status_code=status_code,
+            content={
+                "error": {
+                    "code": code,
+                    "message": message
+                }
             }
-            
-            # Process request
-            start_time = time.time()
-            response = await call_next(request)
-            end_time = time.time()
-            
-            # Log the response
-            audit_data.update({
-                "status_code": response.status_code,
-                "response_time_ms": round((end_time - start_time) * 1000, 2),
-                "success": 200 <= response.status_code < 400
-            })
-            
-            # Log to security logger
-            security_logger.info(f"AUDIT: {json.dumps(audit_data)}")
-            
-            return response
-        else:
-            return await call_next(request)
+        )
+    
+    def _should_skip_validation(self, path: str) -> bool:
+        """Check if validation should be skipped for this request path."""
+        # Skip for file uploads or specific endpoints
+        skip_paths = ["/api/files/upload", "/docs", "/redoc", "/openapi.json"]
+        return any(path.startswith(skip_path) for skip_path in skip_paths)
     
-    def _should_audit(self, request: Request) -> bool:
-        """Check if this request should be audited."""
-        method = request.method
-        path = request.url.path
+    def _contains_malicious_content(self, content: Union[str, bytes]) -> bool:
+        """Check if content (a raw body or a query value) contains malicious patterns."""
+        if isinstance(content, str):
+            content = content.encode('utf-8', 'replace')
+        decoded_content = unquote_to_bytes(content)
+        
+        # Lowercase once so neither the prescreen nor the full scan case-folds
+        lowered_content = decoded_content.lower()
         
-        if method not in self.SENSITIVE_OPERATIONS:
+        # Cheap substring prescreen before the full scan
+        if not any(trigger in lowered_content for trigger in self.MALICIOUS_TRIGGERS):
             return False
         
-        # Check if path matches any sensitive operation pattern
-        for pattern in self.SENSITIVE_OPERATIONS[method]:
-            if path.startswith(pattern):
-                return True
+        if self.malicious_db is None:
+            return self.malicious_regex.search(lowered_content) is not None
+        
+        matched = False
         
-        return False
+        def on_match(pattern_id, start, end, flags, context):
+            nonlocal matched
+            matched = True
+            return True  # Stop at the first hit
+        
+        try:
+            self.malicious_db.scan(lowered_content, match_event_handler=on_match)
+        except hyperscan.ScanTerminated:
+            pass
+        
+        return matched
+    
+    @staticmethod
+    def _compile_hyperscan_database(patterns, mode=None):
+        """Compile all patterns into one Hyperscan database (block mode by default), if available."""
+        if hyperscan is None:
+            return None
+        
+        database = hyperscan.Database() if mode is None else hyperscan.Database(mode=mode)
+        database.compile(
+            expressions=[pattern.encode() for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns)
+        )
+        return database
+    
+    # Audit logging
+    
+    def _should_audit(self, method: str, path: str) -> bool:
+        """Check if a request with this method and path should be audited."""
+        audit_regex = self.audit_regexes.get(method)
+        return audit_regex is not None and audit_regex.match(path) is not None
     
     async def _get_user_info(self, request: Request) -> Optional[Dict[str, Any]]:
         """Extract user information from request if available."""
@@ -310,48 +567,3 @@ class AuditLoggingMiddleware(BaseHTTPMiddleware):
             return None
         except Exception:
             return None
-    
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP from request headers."""
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-        
-        return request.client.host if request.client else "unknown"
-
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """
-    Add security headers to all responses.
-    """
-    
-    def __init__(self, app):
-        super().__init__(app)
-    
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-        
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval'; "
-            "style-src 'self' 'unsafe-inline'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self' https:; "
-            "connect-src 'self' https:; "
-            "media-src 'self' https:; "
-            "object-src 'none'; "
-            "base-uri 'self'; "
-            "form-action 'self'"
-        )
-        
-        return response
\ No newline at end of file
@@ -13,7 +13,7 @@ from .instructor_application import InstructorApplication, ApplicationStatus
 from .resource import LectureResource, ResourceDownload, ResourceType
 from .taxonomy import Tag, DifficultyConfiguration, course_tags
 from .system_settings import SystemSetting, EmailTemplate, PaymentGatewayConfiguration, SettingType
-from .legal import LegalDocument, UserPolicyAcceptance, PolicyUpdateNotification, DocumentType
+from .legal import LegalDocument, UserPolicyAcceptance, PolicyUpdateNotification, DocumentType, NotificationChannel
 
 __all__ = [
     "User",
@@ -55,5 +55,6 @@ __all__ = [
     "LegalDocument",
     "UserPolicyAcceptance",
     "PolicyUpdateNotification",
-    "DocumentType"
+    "DocumentType",
+    "NotificationChannel"
 ]
\ No newline at end of file
@@ -2,15 +2,22 @@
 Assessment and quiz models for the Learning Management System.
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Float, Enum, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Float, Index, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
 from ..database import Base
+from .types import ts_col
 
 
-class QuestionType(enum.Enum):
-    """Types of quiz questions."""
+class QuestionType(str, enum.Enum):
+    """
+    Types of quiz questions.
+    
+    Members are plain strings, and ``Question.question_type`` is a string
+    column holding the value, so rows hydrate without an Enum lookup. The
+    enum is kept for request validation in the quiz schemas.
+    """
     MULTIPLE_CHOICE = "multiple_choice"
     TRUE_FALSE = "true_false"
     SHORT_ANSWER = "short_answer"
@@ -41,8 +48,8 @@ class Quiz(Base):
     is_published = Column(Boolean, default=False, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     # Relationships
     course = relationship("Course", back_populates="quizzes")
@@ -66,7 +73,7 @@ class Question(Base):
     
     # Question details
     question_text = Column(Text, nullable=False)
-    question_type = Column(Enum(QuestionType), nullable=False)
+    question_type = Column(String(20), nullable=False)  # QuestionType value
     order_index = Column(Integer, nullable=False, default=0)
     points = Column(Float, default=1.0, nullable=False)
     
@@ -76,14 +83,14 @@ class Question(Base):
     explanation = Column(Text, nullable=True)  # Explanation for the correct answer
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     # Relationships
     quiz = relationship("Quiz", back_populates="questions")
 
     def __repr__(self):
-        return f"<Question(id={self.id}, quiz_id={self.quiz_id}, type='{self.question_type.value}')>"
+        return f"<Question(id={self.id}, quiz_id={self.quiz_id}, type='{self.question_type}')>"
 
 
 class QuizAttempt(Base):
@@ -91,6 +98,9 @@ class QuizAttempt(Base):
     User attempts at quizzes.
     """
     __tablename__ = "quiz_attempts"
+    __table_args__ = (
+        Index("ix_quiz_attempts_user_quiz", "user_id", "quiz_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
@@ -112,7 +122,7 @@ class QuizAttempt(Base):
     answers = Column(JSON, nullable=True)
     
     # Timestamps
-    started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = ts_col()
     completed_at = Column(DateTime(timezone=True), nullable=True)
     time_taken = Column(Integer, nullable=True)  # in minutes
 
@@ -2,7 +2,7 @@
 Audit log model for tracking sensitive operations.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, ForeignKey
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, Text, Boolean, ForeignKey, Index, false
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -14,14 +14,22 @@ class AuditLog(Base):
     Model for storing audit logs of sensitive operations.
     """
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("idx_audit_logs_user_ts", "user_id", "timestamp"),
+        Index("idx_audit_logs_client_ip_ts", "client_ip", "timestamp"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    # The table's primary key is (timestamp, id) so InnoDB clusters rows by time
+    # (see add_audit_security_tables). Only id is mapped as the identity: rows are
+    # looked up by id alone, and SQLite only autoincrements a single-column
+    # INTEGER PRIMARY KEY, hence the variant.
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True)
     
     # Request information
     method = Column(String(10), nullable=False)
     path = Column(String(500), nullable=False)
     client_ip = Column(String(45), nullable=False)  # IPv6 compatible
-    user_agent = Column(Text)
+    user_agent = Column(String(1024))
     
     # User information
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -34,12 +42,12 @@ class AuditLog(Base):
     response_time_ms = Column(Integer, nullable=True)
     
     # Metadata
-    success = Column(Boolean, nullable=False, default=False)
+    success = Column(Boolean, nullable=False, default=False, server_default=false())
     error_message = Column(Text, nullable=True)
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
-    user = relationship("User", back_populates="audit_logs")
+    user = relationship("User")
 
     def __repr__(self):
         return f"<AuditLog(id={self.id}, method={self.method}, path={self.path}, user_id={self.user_id}, timestamp={self.timestamp})>"
@@ -50,22 +58,26 @@ class SecurityEvent(Base):
     Model for storing security-related events and alerts.
     """
     __tablename__ = "security_events"
+    __table_args__ = (
+        Index("idx_security_events_type_ts", "event_type", "timestamp"),
+    )
 
-    id = Column(Integer, primary_key=True, index=True)
+    # Clustered on (timestamp, id) like audit_logs; id alone is the mapped identity
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, index=True)
     
     # Event information
     event_type = Column(String(50), nullable=False)  # RATE_LIMIT, MALICIOUS_INPUT, FAILED_AUTH, etc.
     severity = Column(String(20), nullable=False)  # LOW, MEDIUM, HIGH, CRITICAL
-    description = Column(Text, nullable=False)
+    description = Column(String(2000), nullable=False)
     
     # Source information
     client_ip = Column(String(45), nullable=False)
-    user_agent = Column(Text, nullable=True)
+    user_agent = Column(String(1024), nullable=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     
     # Event details
     details = Column(Text, nullable=True)  # JSON string with additional details
-    resolved = Column(Boolean, nullable=False, default=False)
+    resolved = Column(Boolean, nullable=False, default=False, server_default=false())
     resolved_at = Column(DateTime, nullable=True)
     resolved_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     
@@ -73,7 +85,7 @@ class SecurityEvent(Base):
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
-    user = relationship("User", foreign_keys=[user_id], back_populates="security_events")
+    user = relationship("User", foreign_keys=[user_id])
     resolver = relationship("User", foreign_keys=[resolved_by])
 
     def __repr__(self):
@@ -3,9 +3,9 @@ Certificate models for the Learning Management System.
 """
 
 from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
-from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
+from .types import ts_col
 
 
 class Certificate(Base):
@@ -33,7 +33,7 @@ class Certificate(Base):
     is_verified = Column(Boolean, default=True, nullable=False)
     
     # Timestamps
-    issued_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    issued_at = ts_col()
     expires_at = Column(DateTime(timezone=True), nullable=True)  # Optional expiration
 
     # Relationships
@@ -2,11 +2,12 @@
 Communication models for announcements and messaging in the Learning Management System.
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
 from ..database import Base
+from .types import COMPRESSED_TABLE_OPTIONS, IntEnumType, ts_col
 
 
 class AnnouncementType(enum.Enum):
@@ -32,6 +33,7 @@ class Announcement(Base):
     Course announcements created by instructors.
     """
     __tablename__ = "announcements"
+    __table_args__ = COMPRESSED_TABLE_OPTIONS
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
@@ -42,8 +44,8 @@ class Announcement(Base):
     instructor_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Announcement details
-    announcement_type = Column(Enum(AnnouncementType), default=AnnouncementType.GENERAL, nullable=False)
-    priority = Column(Enum(AnnouncementPriority), default=AnnouncementPriority.NORMAL, nullable=False)
+    announcement_type = Column(IntEnumType(AnnouncementType), default=AnnouncementType.GENERAL, nullable=False)
+    priority = Column(IntEnumType(AnnouncementPriority), default=AnnouncementPriority.NORMAL, nullable=False)
     
     # Announcement settings
     is_published = Column(Boolean, default=True, nullable=False)
@@ -51,15 +53,18 @@ class Announcement(Base):
     send_email = Column(Boolean, default=False, nullable=False)
     send_notification = Column(Boolean, default=True, nullable=False)
     
+    # Number of AnnouncementRead rows, maintained when a read is recorded
+    read_count = Column(Integer, default=0, server_default="0", nullable=False)
+    
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
     published_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
     course = relationship("Course", back_populates="announcements")
     instructor = relationship("User", foreign_keys=[instructor_id], back_populates="created_announcements")
-    announcement_reads = relationship("AnnouncementRead", back_populates="announcement", cascade="all, delete-orphan")
+    announcement_reads = relationship("AnnouncementRead", back_populates="announcement", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<Announcement(id={self.id}, title='{self.title}', course_id={self.course_id})>"
@@ -70,15 +75,18 @@ class AnnouncementRead(Base):
     Tracking which students have read announcements.
     """
     __tablename__ = "announcement_reads"
+    __table_args__ = (
+        Index("ix_annread_ann_user", "announcement_id", "user_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
     # Foreign keys
-    announcement_id = Column(Integer, ForeignKey("announcements.id"), nullable=False)
+    announcement_id = Column(Integer, ForeignKey("announcements.id", ondelete="CASCADE"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Read details
-    read_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    read_at = ts_col()
 
     # Relationships
     announcement = relationship("Announcement", back_populates="announcement_reads")
@@ -108,6 +116,17 @@ class Message(Base):
     Direct messages between instructors and students.
     """
     __tablename__ = "messages"
+    __table_args__ = (
+        # Unread inbox messages per recipient; partial on PostgreSQL
+        Index("ix_msg_unread", "recipient_id", "read_at", postgresql_where=text("read_at IS NULL")),
+        # Inbox page, newest first; covering on PostgreSQL
+        Index(
+            "ix_messages_inbox", "recipient_id", "is_archived_by_recipient", "sent_at",
+            postgresql_include=["subject", "sender_id", "status"],
+            postgresql_where=text("is_archived_by_recipient = false")
+        ),
+        COMPRESSED_TABLE_OPTIONS,
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     subject = Column(String(200), nullable=False)
@@ -117,11 +136,14 @@ class Message(Base):
     sender_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     recipient_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     course_id = Column(Integer, ForeignKey("courses.id"), nullable=True)  # Optional course context
-    parent_message_id = Column(Integer, ForeignKey("messages.id"), nullable=True)  # For threading
+    parent_message_id = Column(Integer, ForeignKey("messages.id", ondelete="CASCADE"), nullable=True)  # For threading
+    # Ids from the thread root down to this message, e.g. "12/40/57/"; a thread is
+    # one index range scan on the root's path prefix
+    thread_path = Column(String(255), nullable=True, index=True)
     
     # Message details
-    message_type = Column(Enum(MessageType), default=MessageType.DIRECT, nullable=False)
-    status = Column(Enum(MessageStatus), default=MessageStatus.SENT, nullable=False)
+    message_type = Column(IntEnumType(MessageType), default=MessageType.DIRECT, nullable=False)
+    status = Column(IntEnumType(MessageStatus), default=MessageStatus.SENT, nullable=False)
     
     # Message flags
     is_important = Column(Boolean, default=False, nullable=False)
@@ -129,7 +151,7 @@ class Message(Base):
     is_archived_by_recipient = Column(Boolean, default=False, nullable=False)
     
     # Timestamps
-    sent_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = ts_col()
     delivered_at = Column(DateTime(timezone=True), nullable=True)
     read_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -138,7 +160,7 @@ class Message(Base):
     recipient = relationship("User", foreign_keys=[recipient_id], back_populates="received_messages")
     course = relationship("Course", back_populates="messages")
     parent_message = relationship("Message", remote_side=[id], back_populates="replies")
-    replies = relationship("Message", back_populates="parent_message", cascade="all, delete-orphan")
+    replies = relationship("Message", back_populates="parent_message", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<Message(id={self.id}, subject='{self.subject}', sender_id={self.sender_id}, recipient_id={self.recipient_id})>"
@@ -149,6 +171,7 @@ class BulkMessage(Base):
     Bulk messages sent to multiple students in a course.
     """
     __tablename__ = "bulk_messages"
+    __table_args__ = COMPRESSED_TABLE_OPTIONS
 
     id = Column(Integer, primary_key=True, index=True)
     subject = Column(String(200), nullable=False)
@@ -169,13 +192,13 @@ class BulkMessage(Base):
     send_notification = Column(Boolean, default=True, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = ts_col()
     sent_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
     sender = relationship("User", foreign_keys=[sender_id], back_populates="sent_bulk_messages")
     course = relationship("Course", back_populates="bulk_messages")
-    bulk_message_recipients = relationship("BulkMessageRecipient", back_populates="bulk_message", cascade="all, delete-orphan")
+    bulk_message_recipients = relationship("BulkMessageRecipient", back_populates="bulk_message", cascade="all, delete-orphan", passive_deletes=True)
 
     def __repr__(self):
         return f"<BulkMessage(id={self.id}, subject='{self.subject}', course_id={self.course_id})>"
@@ -190,11 +213,11 @@ class BulkMessageRecipient(Base):
     id = Column(Integer, primary_key=True, index=True)
     
     # Foreign keys
-    bulk_message_id = Column(Integer, ForeignKey("bulk_messages.id"), nullable=False)
+    bulk_message_id = Column(Integer, ForeignKey("bulk_messages.id", ondelete="CASCADE"), nullable=False)
     recipient_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Delivery tracking
-    status = Column(Enum(MessageStatus), default=MessageStatus.SENT, nullable=False)
+    status = Column(IntEnumType(MessageStatus), default=MessageStatus.SENT, nullable=False)
     delivered_at = Column(DateTime(timezone=True), nullable=True)
     read_at = Column(DateTime(timezone=True), nullable=True)
 
@@ -2,12 +2,57 @@
 Course-related models for the Learning Management System.
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Enum
-from sqlalchemy.types import DECIMAL
+import os
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index, DDL, case, event, literal, or_, text
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
 from ..database import Base
+from .types import IntEnumType, ts_col
+
+
+def price_to_cents(price) -> int:
+    """Convert a price in currency units (Decimal, float, int or str) to whole cents."""
+    return int((Decimal(str(price)) * 100).to_integral_value(ROUND_HALF_UP))
+
+
+# Media URLs under this prefix are stored as the key relative to it; other
+# URLs (external hosts, other local paths) are stored as given.
+MEDIA_BASE_URL = os.getenv("MEDIA_BASE_URL", "/uploads/")
+
+
+def media_key(url):
+    """Strip MEDIA_BASE_URL from a media URL for storage."""
+    if url and url.startswith(MEDIA_BASE_URL):
+        return url[len(MEDIA_BASE_URL):]
+    return url
+
+
+def media_url(key):
+    """Rebuild the media URL for a stored key."""
+    if not key or key.startswith("/") or "://" in key:
+        return key
+    return MEDIA_BASE_URL + key
+
+
+def media_url_property(key_name):
+    """Hybrid URL attribute backed by the media key column ``key_name``."""
+    def fget(self):
+        return media_url(getattr(self, key_name))
+
+    def fset(self, value):
+        setattr(self, key_name, media_key(value))
+
+    def expr(cls):
+        key = getattr(cls, key_name)
+        return case(
+            (or_(key.like("/%"), key.contains("://")), key),
+            else_=literal(MEDIA_BASE_URL) + key
+        )
+
+    return hybrid_property(fget, fset, expr=expr)
 
 
 class DifficultyLevel(enum.Enum):
@@ -34,11 +79,14 @@ class CourseCategory(Base):
     name = Column(String(100), unique=True, nullable=False)
     description = Column(Text, nullable=True)
     parent_id = Column(Integer, ForeignKey("course_categories.id"), nullable=True)
+    # Ids from the root category down to this one, e.g. "3/17/"; a subtree is
+    # one index range scan on the category's path prefix
+    path = Column(String(255), nullable=True, index=True)
     is_active = Column(Boolean, default=True, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     # Self-referential relationship for subcategories
     parent = relationship("CourseCategory", remote_side=[id], back_populates="subcategories")
@@ -56,6 +104,16 @@ class Course(Base):
     Course model representing courses created by instructors.
     """
     __tablename__ = "courses"
+    __table_args__ = (
+        # Catalog listing: filter by status (and price), newest first. The price
+        # and primary key ride along in the key, so counts never touch the rows;
+        # PostgreSQL also covers the listed columns and keeps only published rows.
+        Index(
+            "ix_courses_published_list", "status", "created_at", "price_cents",
+            postgresql_include=["title", "thumbnail_key"],
+            postgresql_where=text("status = 1")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False, index=True)
@@ -67,15 +125,17 @@ class Course(Base):
     category_id = Column(Integer, ForeignKey("course_categories.id"), nullable=True)
     
     # Course details
-    price = Column(DECIMAL(10, 2), default=0.00, nullable=False)
-    status = Column(Enum(CourseStatus), default=CourseStatus.DRAFT, nullable=False)
-    difficulty_level = Column(Enum(DifficultyLevel), default=DifficultyLevel.BEGINNER, nullable=False)
+    price_cents = Column(Integer, default=0, server_default="0", nullable=False)
+    status = Column(IntEnumType(CourseStatus), default=CourseStatus.DRAFT, nullable=False)
+    difficulty_level = Column(IntEnumType(DifficultyLevel), default=DifficultyLevel.BEGINNER, nullable=False)
     
-    # Media and content
-    thumbnail_url = Column(String(500), nullable=True)
-    preview_video_url = Column(String(500), nullable=True)
+    # Media and content, stored relative to MEDIA_BASE_URL (see media_url_property)
+    thumbnail_key = Column(String(500), nullable=True)
+    preview_video_key = Column(String(500), nullable=True)
+    thumbnail_url = media_url_property("thumbnail_key")
+    preview_video_url = media_url_property("preview_video_key")
     
-    # Course metadata
+    # Course metadata (totals are maintained by database triggers on lectures/sections)
     total_duration = Column(Integer, default=0, nullable=False)  # in minutes
     total_lectures = Column(Integer, default=0, nullable=False)
     language = Column(String(10), default="en", nullable=False)
@@ -86,19 +146,19 @@ class Course(Base):
     allow_notes = Column(Boolean, default=True, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
     published_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
     instructor = relationship("User", back_populates="created_courses")
     category = relationship("CourseCategory", back_populates="courses")
     sections = relationship("Section", back_populates="course", cascade="all, delete-orphan", order_by="Section.order_index")
-    enrollments = relationship("Enrollment", back_populates="course", cascade="all, delete-orphan")
-    course_progress = relationship("CourseProgress", back_populates="course", cascade="all, delete-orphan")
+    enrollments = relationship("Enrollment", back_populates="course", cascade="all, delete-orphan", passive_deletes=True)
+    course_progress = relationship("CourseProgress", back_populates="course", cascade="all, delete-orphan", passive_deletes=True)
     quizzes = relationship("Quiz", back_populates="course", cascade="all, delete-orphan")
     certificates = relationship("Certificate", back_populates="course", cascade="all, delete-orphan")
-    transactions = relationship("Transaction", back_populates="course", cascade="all, delete-orphan")
+    transactions = relationship("Transaction", back_populates="course", cascade="all, delete-orphan", passive_deletes=True)
     
     # Communication relationships
     announcements = relationship("Announcement", back_populates="course", cascade="all, delete-orphan")
@@ -111,10 +171,26 @@ class Course(Base):
     def __repr__(self):
         return f"<Course(id={self.id}, title='{self.title}', status='{self.status.value}')>"
 
+    @hybrid_property
+    def price(self):
+        """Course price in currency units."""
+        if self.price_cents is None:
+            return None
+        return Decimal(self.price_cents) / 100
+
+    @price.setter
+    def price(self, value):
+        self.price_cents = price_to_cents(value)
+
+    @price.expression
+    def price(cls):
+        """SQL form of the price; filter on price_cents to use its index."""
+        return cls.price_cents / 100.0
+
     @property
     def is_free(self):
         """Check if the course is free."""
-        return self.price == 0
+        return self.price_cents == 0
 
     @property
     def is_published(self):
@@ -138,17 +214,17 @@ class Section(Base):
     # Section ordering
     order_index = Column(Integer, nullable=False, default=0)
     
-    # Section metadata
+    # Section metadata (totals are maintained by database triggers on lectures)
     total_duration = Column(Integer, default=0, nullable=False)  # in minutes
     total_lectures = Column(Integer, default=0, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     # Relationships
     course = relationship("Course", back_populates="sections")
-    lectures = relationship("Lecture", back_populates="section", cascade="all, delete-orphan", order_by="Lecture.order_index")
+    lectures = relationship("Lecture", back_populates="section", cascade="all, delete-orphan", order_by="Lecture.order_index", lazy="selectin")
 
     def __repr__(self):
         return f"<Section(id={self.id}, title='{self.title}', course_id={self.course_id})>"
@@ -177,28 +253,102 @@ class Lecture(Base):
     section_id = Column(Integer, ForeignKey("sections.id"), nullable=False)
     
     # Lecture details
-    lecture_type = Column(Enum(LectureType), default=LectureType.VIDEO, nullable=False)
+    lecture_type = Column(IntEnumType(LectureType), default=LectureType.VIDEO, nullable=False)
     order_index = Column(Integer, nullable=False, default=0)
     duration = Column(Integer, default=0, nullable=False)  # in minutes
     
-    # Content URLs
-    video_url = Column(String(500), nullable=True)
-    content_url = Column(String(500), nullable=True)  # For PDFs, documents, etc.
+    # Content, stored relative to MEDIA_BASE_URL (see media_url_property)
+    video_key = Column(String(500), nullable=True)
+    content_key = Column(String(500), nullable=True)  # For PDFs, documents, etc.
+    video_url = media_url_property("video_key")
+    content_url = media_url_property("content_key")
     
     # Lecture settings
     is_preview = Column(Boolean, default=False, nullable=False)  # Free preview
     is_downloadable = Column(Boolean, default=False, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     # Relationships
     section = relationship("Section", back_populates="lectures")
-    lecture_progress = relationship("LectureProgress", back_populates="lecture", cascade="all, delete-orphan")
+    lecture_progress = relationship("LectureProgress", back_populates="lecture", cascade="all, delete-orphan", passive_deletes=True)
     notes = relationship("Note", back_populates="lecture", cascade="all, delete-orphan")
     qa_questions = relationship("QAQuestion", back_populates="lecture", cascade="all, delete-orphan")
     resources = relationship("LectureResource", back_populates="lecture", cascade="all, delete-orphan")
 
     def __repr__(self):
-        return f"<Lecture(id={self.id}, title='{self.title}', type='{self.lecture_type.value}')>"
\ No newline at end of file
+        return f"<Lecture(id={self.id}, title='{self.title}', type='{self.lecture_type.value}')>"
+
+
+# Section and course totals are kept by the database: every lecture change applies
+# its delta to the owning section and course, and deleting a section subtracts
+# whatever it still counts from its course. The triggers are installed with the
+# tables here so create_all() databases get them; migrated databases get them from
+# the add_lecture_totals_triggers revision.
+
+
+def _apply_lecture_totals(sign, row):
+    """Statements adding (sign '+') or removing (sign '-') a lecture row's totals."""
+    return (
+        f"UPDATE sections SET total_duration = total_duration {sign} {row}.duration, "
+        f"total_lectures = total_lectures {sign} 1 WHERE id = {row}.section_id; "
+        f"UPDATE courses SET total_duration = total_duration {sign} {row}.duration, "
+        f"total_lectures = total_lectures {sign} 1 "
+        f"WHERE id = (SELECT course_id FROM sections WHERE id = {row}.section_id);"
+    )
+
+
+_DROP_SECTION_TOTALS = (
+    "UPDATE courses SET total_duration = total_duration - OLD.total_duration, "
+    "total_lectures = total_lectures - OLD.total_lectures WHERE id = OLD.course_id;"
+)
+
+# (table, dialect, statement), in creation order
+_TOTALS_TRIGGERS = [
+    (Lecture.__table__, "mysql",
+     f"CREATE TRIGGER lectures_totals_insert AFTER INSERT ON lectures FOR EACH ROW "
+     f"BEGIN {_apply_lecture_totals('+', 'NEW')} END"),
+    (Lecture.__table__, "mysql",
+     "CREATE TRIGGER lectures_totals_update AFTER UPDATE ON lectures FOR EACH ROW BEGIN "
+     "IF NEW.duration <> OLD.duration OR NEW.section_id <> OLD.section_id THEN "
+     f"{_apply_lecture_totals('-', 'OLD')} {_apply_lecture_totals('+', 'NEW')} END IF; END"),
+    (Lecture.__table__, "mysql",
+     f"CREATE TRIGGER lectures_totals_delete AFTER DELETE ON lectures FOR EACH ROW "
+     f"BEGIN {_apply_lecture_totals('-', 'OLD')} END"),
+    (Section.__table__, "mysql",
+     f"CREATE TRIGGER sections_totals_delete AFTER DELETE ON sections FOR EACH ROW "
+     f"BEGIN {_DROP_SECTION_TOTALS} END"),
+    (Lecture.__table__, "sqlite",
+     f"CREATE TRIGGER lectures_totals_insert AFTER INSERT ON lectures FOR EACH ROW "
+     f"BEGIN {_apply_lecture_totals('+', 'NEW')} END"),
+    (Lecture.__table__, "sqlite",
+     "CREATE TRIGGER lectures_totals_update AFTER UPDATE OF duration, section_id ON lectures FOR EACH ROW "
+     "WHEN NEW.duration <> OLD.duration OR NEW.section_id <> OLD.section_id "
+     f"BEGIN {_apply_lecture_totals('-', 'OLD')} {_apply_lecture_totals('+', 'NEW')} END"),
+    (Lecture.__table__, "sqlite",
+     f"CREATE TRIGGER lectures_totals_delete AFTER DELETE ON lectures FOR EACH ROW "
+     f"BEGIN {_apply_lecture_totals('-', 'OLD')} END"),
+    (Section.__table__, "sqlite",
+     f"CREATE TRIGGER sections_totals_delete AFTER DELETE ON sections FOR EACH ROW "
+     f"BEGIN {_DROP_SECTION_TOTALS} END"),
+    (Lecture.__table__, "postgresql",
+     "CREATE OR REPLACE FUNCTION bump_section_and_course_totals() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN "
+     f"IF TG_OP IN ('UPDATE', 'DELETE') THEN {_apply_lecture_totals('-', 'OLD')} END IF; "
+     f"IF TG_OP IN ('INSERT', 'UPDATE') THEN {_apply_lecture_totals('+', 'NEW')} END IF; "
+     "RETURN NULL; END $$"),
+    (Lecture.__table__, "postgresql",
+     "CREATE TRIGGER lectures_maintain_totals "
+     "AFTER INSERT OR DELETE OR UPDATE OF duration, section_id ON lectures "
+     "FOR EACH ROW EXECUTE FUNCTION bump_section_and_course_totals()"),
+    (Section.__table__, "postgresql",
+     "CREATE OR REPLACE FUNCTION drop_section_totals_from_course() RETURNS trigger LANGUAGE plpgsql AS $$ "
+     f"BEGIN {_DROP_SECTION_TOTALS} RETURN NULL; END $$"),
+    (Section.__table__, "postgresql",
+     "CREATE TRIGGER sections_totals_delete AFTER DELETE ON sections "
+     "FOR EACH ROW EXECUTE FUNCTION drop_section_totals_from_course()"),
+]
+
+for _table, _dialect, _statement in _TOTALS_TRIGGERS:
+    event.listen(_table, "after_create", DDL(_statement).execute_if(dialect=_dialect))
@@ -2,10 +2,15 @@
 Enrollment and progress tracking models for the Learning Management System.
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Float, Text, Index, bindparam, case, select, text
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
+from .types import ts_col
 
 
 class Enrollment(Base):
@@ -13,19 +18,25 @@ class Enrollment(Base):
     User enrollment in courses.
     """
     __tablename__ = "enrollments"
+    __table_args__ = (
+        Index("ix_enrollment_user_course", "user_id", "course_id", unique=True),
+        Index("ix_enrollment_course_progress", "course_id", "is_completed"),
+        # In-progress courses per user; partial on PostgreSQL
+        Index("ix_enroll_incomplete", "user_id", "is_completed", postgresql_where=text("is_completed = false")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
     # Foreign keys
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
     
     # Enrollment details
     progress_percentage = Column(Float, default=0.0, nullable=False)
     is_completed = Column(Boolean, default=False, nullable=False)
     
     # Timestamps
-    enrolled_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    enrolled_at = ts_col()
     completed_at = Column(DateTime(timezone=True), nullable=True)
     last_accessed = Column(DateTime(timezone=True), nullable=True)
 
@@ -47,7 +58,7 @@ class CourseProgress(Base):
     
     # Foreign keys
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=False)
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=False)
     
     # Progress details
     completed_lectures = Column(Integer, default=0, nullable=False)
@@ -63,8 +74,8 @@ class CourseProgress(Base):
     current_lecture_id = Column(Integer, ForeignKey("lectures.id"), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="course_progress")
@@ -75,7 +86,7 @@ class CourseProgress(Base):
     def __repr__(self):
         return f"<CourseProgress(id={self.id}, user_id={self.user_id}, course_id={self.course_id})>"
 
-    @property
+    @hybrid_property
     def completion_percentage(self):
         """Calculate completion percentage based on lectures and quizzes."""
         if self.total_lectures == 0 and self.total_quizzes == 0:
@@ -86,18 +97,30 @@ class CourseProgress(Base):
         
         return (completed_items / total_items) * 100 if total_items > 0 else 0.0
 
+    @completion_percentage.expression
+    def completion_percentage(cls):
+        """SQL form of the completion percentage, usable in filters and ORDER BY."""
+        total_items = cls.total_lectures + cls.total_quizzes
+        return case(
+            (total_items == 0, 0.0),
+            else_=(cls.completed_lectures + cls.completed_quizzes) * 100.0 / total_items
+        )
+
 
 class LectureProgress(Base):
     """
     Individual lecture progress tracking.
     """
     __tablename__ = "lecture_progress"
+    __table_args__ = (
+        Index("ix_lecprog_user_lecture", "user_id", "lecture_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
     # Foreign keys
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    lecture_id = Column(Integer, ForeignKey("lectures.id"), nullable=False)
+    lecture_id = Column(Integer, ForeignKey("lectures.id", ondelete="CASCADE"), nullable=False)
     
     # Progress details
     is_completed = Column(Boolean, default=False, nullable=False)
@@ -105,13 +128,76 @@ class LectureProgress(Base):
     last_position = Column(Integer, default=0, nullable=False)  # in seconds for video position
     
     # Timestamps
-    started_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = ts_col()
     completed_at = Column(DateTime(timezone=True), nullable=True)
-    last_accessed = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    last_accessed = ts_col(onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="lecture_progress")
     lecture = relationship("Lecture", back_populates="lecture_progress")
 
+    @classmethod
+    def bulk_upsert(cls, conn, rows):
+        """
+        Write a batch of player heartbeats in one multi-row statement.
+
+        Each row carries user_id, lecture_id, watch_time and last_position.
+        Rows that hit an existing (user_id, lecture_id) pair through
+        ix_lecprog_user_lecture overwrite its position and watch time instead:
+        ON DUPLICATE KEY UPDATE on MySQL, ON CONFLICT on PostgreSQL and SQLite,
+        and an UPDATE of the existing pairs plus an INSERT of the rest elsewhere.
+        """
+        if not rows:
+            return
+        dialect_name = conn.dialect.name
+        if dialect_name == "mysql":
+            stmt = mysql_insert(cls.__table__).values(rows)
+            stmt = stmt.on_duplicate_key_update(
+                watch_time=stmt.inserted.watch_time,
+                last_position=stmt.inserted.last_position,
+                last_accessed=func.now(),
+            )
+        elif dialect_name in ("postgresql", "sqlite"):
+            insert = postgresql_insert if dialect_name == "postgresql" else sqlite_insert
+            stmt = insert(cls.__table__).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["user_id", "lecture_id"],
+                set_={
+                    "watch_time": stmt.excluded.watch_time,
+                    "last_position": stmt.excluded.last_position,
+                    "last_accessed": func.now(),
+                },
+            )
+        else:
+            cls._update_then_insert(conn, rows)
+            return
+        conn.execute(stmt)
+
+    @classmethod
+    def _update_then_insert(cls, conn, rows):
+        """Upsert heartbeats on dialects without a native upsert."""
+        table = cls.__table__
+        existing = set(conn.execute(
+            select(table.c.user_id, table.c.lecture_id).where(
+                table.c.user_id.in_({row["user_id"] for row in rows}),
+                table.c.lecture_id.in_({row["lecture_id"] for row in rows}),
+            )
+        ).tuples())
+        updates = [row for row in rows if (row["user_id"], row["lecture_id"]) in existing]
+        inserts = [row for row in rows if (row["user_id"], row["lecture_id"]) not in existing]
+        if updates:
+            conn.execute(
+                table.update()
+                .where(table.c.user_id == bindparam("b_user_id"), table.c.lecture_id == bindparam("b_lecture_id"))
+                .values(
+                    watch_time=bindparam("b_watch_time"),
+                    last_position=bindparam("b_last_position"),
+                    last_accessed=func.now(),
+                ),
+                [{f"b_{key}": value for key, value in row.items()} for row in updates]
+            )
+        if inserts:
+            conn.execute(table.insert(), inserts)
+
     def __repr__(self):
         return f"<LectureProgress(id={self.id}, user_id={self.user_id}, lecture_id={self.lecture_id}, completed={self.is_completed})>"
\ No newline at end of file
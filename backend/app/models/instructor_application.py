@@ -2,11 +2,12 @@
 Instructor application model for handling instructor role requests.
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
 from ..database import Base
+from .types import COMPRESSED_TABLE_OPTIONS, IntEnumType, ts_col
 
 
 class ApplicationStatus(enum.Enum):
@@ -22,6 +23,11 @@ class InstructorApplication(Base):
     Allows learners to apply to become instructors.
     """
     __tablename__ = "instructor_applications"
+    __table_args__ = (
+        # Pending review queue; partial on PostgreSQL (0 is ApplicationStatus.PENDING)
+        Index("ix_app_pending", "status", "created_at", postgresql_where=text("status = 0")),
+        COMPRESSED_TABLE_OPTIONS,
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
@@ -33,7 +39,7 @@ class InstructorApplication(Base):
     sample_course_outline = Column(Text, nullable=True)  # Optional course outline
     
     # Application status
-    status = Column(Enum(ApplicationStatus), default=ApplicationStatus.PENDING, nullable=False)
+    status = Column(IntEnumType(ApplicationStatus), default=ApplicationStatus.PENDING, nullable=False)
     
     # Admin review
     reviewed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -41,8 +47,8 @@ class InstructorApplication(Base):
     reviewed_at = Column(DateTime(timezone=True), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     # Relationships
     applicant = relationship("User", foreign_keys=[user_id], back_populates="instructor_applications")
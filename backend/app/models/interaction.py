@@ -2,10 +2,11 @@
 User interaction models for notes, Q&A, and discussions.
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
+from .types import COMPRESSED_TABLE_OPTIONS, ts_col
 
 
 class Note(Base):
@@ -13,6 +14,7 @@ class Note(Base):
     User notes on lectures with timestamps.
     """
     __tablename__ = "notes"
+    __table_args__ = COMPRESSED_TABLE_OPTIONS
 
     id = Column(Integer, primary_key=True, index=True)
     
@@ -25,8 +27,8 @@ class Note(Base):
     timestamp = Column(Integer, nullable=True)  # Video timestamp in seconds
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="notes")
@@ -41,6 +43,20 @@ class QAQuestion(Base):
     Questions asked by students on lectures.
     """
     __tablename__ = "qa_questions"
+    __table_args__ = (
+        # Unanswered questions per lecture; partial on PostgreSQL
+        Index("ix_qa_unanswered", "lecture_id", "is_answered", postgresql_where=text("is_answered = false")),
+        # Keyset pagination of a lecture's questions, newest first
+        Index("ix_qa_q_lecture_created", "lecture_id", "created_at", "id"),
+        # Question search: ngram FULLTEXT on MySQL, trigram GIN on PostgreSQL
+        Index(
+            "ix_qa_questions_search", "title", "content",
+            mysql_prefix="FULLTEXT", mysql_with_parser="ngram",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops", "content": "gin_trgm_ops"}
+        ),
+        COMPRESSED_TABLE_OPTIONS,
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
@@ -58,13 +74,16 @@ class QAQuestion(Base):
     is_featured = Column(Boolean, default=False, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="qa_questions")
     lecture = relationship("Lecture", back_populates="qa_questions")
-    answers = relationship("QAAnswer", back_populates="question", cascade="all, delete-orphan")
+    answers = relationship(
+        "QAAnswer", back_populates="question", cascade="all, delete-orphan", lazy="selectin",
+        order_by="(QAAnswer.created_at, QAAnswer.id)"
+    )
 
     def __repr__(self):
         return f"<QAQuestion(id={self.id}, title='{self.title}', answered={self.is_answered})>"
@@ -75,6 +94,11 @@ class QAAnswer(Base):
     Answers to Q&A questions, typically from instructors.
     """
     __tablename__ = "qa_answers"
+    __table_args__ = (
+        # A question's answers in posting order
+        Index("ix_qa_a_question_created", "question_id", "created_at", "id"),
+        COMPRESSED_TABLE_OPTIONS,
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
@@ -90,8 +114,8 @@ class QAAnswer(Base):
     is_accepted = Column(Boolean, default=False, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     # Relationships
     user = relationship("User", back_populates="qa_answers")
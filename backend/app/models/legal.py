@@ -2,11 +2,13 @@
 Legal documents and policy management models.
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Computed, Index, event, select, text, update
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from sqlalchemy.orm.attributes import set_committed_value
 import enum
 from ..database import Base
+from .types import IntEnumType, ts_col
 
 
 class DocumentType(enum.Enum):
@@ -20,14 +22,26 @@ class DocumentType(enum.Enum):
     DATA_PROCESSING_AGREEMENT = "data_processing_agreement"
 
 
+class NotificationChannel(enum.Enum):
+    """Channels used to notify users about policy updates."""
+    EMAIL = "email"
+    IN_APP = "in_app"
+
+
 class LegalDocument(Base):
     """
     Legal documents with version control.
     """
     __tablename__ = "legal_documents"
-
-    id = Column(Integer, primary_key=True, index=True)
-    document_type = Column(String(50), nullable=False, index=True)
+    __table_args__ = (
+        # Current document of a type; partial on PostgreSQL
+        Index("ix_legal_documents_current", "document_type", "is_current", postgresql_where=text("is_current")),
+        # At most one current document per type and slug
+        Index("ux_legal_current_per_slug", "document_type", "current_slug", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    document_type = Column(IntEnumType(DocumentType), nullable=False, index=True)
     title = Column(String(200), nullable=False)
     slug = Column(String(100), nullable=False, index=True)  # URL-friendly identifier
     content = Column(Text, nullable=False)
@@ -36,6 +50,12 @@ class LegalDocument(Base):
     version = Column(String(20), nullable=False, default="1.0")
     is_current = Column(Boolean, default=True, nullable=False)
     previous_version_id = Column(Integer, ForeignKey("legal_documents.id"), nullable=True)
+    # First version of the chain; the first version points at itself. Only NULL
+    # between a first version's INSERT and the UPDATE that follows it.
+    root_id = Column(Integer, ForeignKey("legal_documents.id"), nullable=True, index=True)
+    # Slug of current documents, NULL otherwise. MySQL has no partial unique
+    # indexes, and unique indexes ignore NULLs, so this keys the uniqueness above.
+    current_slug = Column(String(100), Computed("CASE WHEN is_current THEN slug END", persisted=True))
     
     # Document metadata
     effective_date = Column(DateTime(timezone=True), nullable=False)
@@ -46,41 +66,77 @@ class LegalDocument(Base):
     requires_acceptance = Column(Boolean, default=True, nullable=False)  # Users must accept this document
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     # Relationships
     created_by_user = relationship("User", foreign_keys=[created_by])
-    previous_version = relationship("LegalDocument", remote_side=[id], back_populates="next_versions")
-    next_versions = relationship("LegalDocument", back_populates="previous_version", cascade="all, delete-orphan")
+    previous_version = relationship(
+        "LegalDocument", remote_side=[id], foreign_keys=[previous_version_id], back_populates="next_versions"
+    )
+    next_versions = relationship(
+        "LegalDocument", foreign_keys=[previous_version_id], back_populates="previous_version"
+    )
+    # Every version of this document, including itself, in one indexed query
+    versions = relationship(
+        "LegalDocument",
+        primaryjoin="LegalDocument.root_id == foreign(remote(LegalDocument.root_id))",
+        order_by="LegalDocument.created_at",
+        viewonly=True
+    )
     user_acceptances = relationship("UserPolicyAcceptance", back_populates="document", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<LegalDocument(id={self.id}, type='{self.document_type}', version='{self.version}')>"
 
 
+@event.listens_for(LegalDocument, "before_insert")
+def _copy_root_from_previous_version(mapper, connection, target):
+    """Give a new revision the root of the version it replaces."""
+    if target.root_id is None and target.previous_version_id is not None:
+        table = LegalDocument.__table__
+        target.root_id = connection.scalar(
+            select(func.coalesce(table.c.root_id, table.c.id)).where(table.c.id == target.previous_version_id)
+        )
+
+
+@event.listens_for(LegalDocument, "after_insert")
+def _root_first_version_at_itself(mapper, connection, target):
+    """Point a first version at its own ID, known only once inserted."""
+    if target.root_id is None:
+        table = LegalDocument.__table__
+        connection.execute(update(table).where(table.c.id == target.id).values(root_id=target.id))
+        set_committed_value(target, "root_id", target.id)
+
+
 class UserPolicyAcceptance(Base):
     """
     Track user acceptance of legal documents.
     """
     __tablename__ = "user_policy_acceptances"
-
-    id = Column(Integer, primary_key=True, index=True)
+    __table_args__ = (
+        # Has this user accepted this document
+        Index("ix_upa_user_doc", "user_id", "document_id"),
+        # Acceptances of one version of a document
+        Index("ix_upa_document_version", "document_id", "document_version"),
+    )
+
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     document_id = Column(Integer, ForeignKey("legal_documents.id"), nullable=False)
     
     # Acceptance details
-    accepted_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    accepted_at = ts_col()
     ip_address = Column(String(45), nullable=True)  # IPv4 or IPv6
-    user_agent = Column(Text, nullable=True)
+    user_agent = Column(String(1024), nullable=True)
     
     # Document version at time of acceptance
     document_version = Column(String(20), nullable=False)
-    document_type = Column(String(50), nullable=False)
+    document_type = Column(IntEnumType(DocumentType), nullable=False)
 
     # Relationships
     user = relationship("User", back_populates="policy_acceptances")
-    document = relationship("LegalDocument", back_populates="user_acceptances")
+    document = relationship("LegalDocument", back_populates="user_acceptances", lazy="selectin")
 
     def __repr__(self):
         return f"<UserPolicyAcceptance(id={self.id}, user_id={self.user_id}, document_type='{self.document_type}')>"
@@ -92,13 +148,13 @@ class PolicyUpdateNotification(Base):
     """
     __tablename__ = "policy_update_notifications"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     document_id = Column(Integer, ForeignKey("legal_documents.id"), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
     # Notification details
-    notification_type = Column(String(50), nullable=False)  # email, in_app, etc.
-    sent_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    notification_type = Column(IntEnumType(NotificationChannel), nullable=False)
+    sent_at = ts_col()
     
     # Response tracking
     viewed_at = Column(DateTime(timezone=True), nullable=True)
@@ -2,11 +2,12 @@
 Resource models for downloadable course materials.
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
 from ..database import Base
+from .types import ts_col
 
 
 class ResourceType(enum.Enum):
@@ -49,11 +50,11 @@ class LectureResource(Base):
     download_count = Column(Integer, default=0, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     # Relationships
-    lecture = relationship("Lecture", back_populates="resources")
+    lecture = relationship("Lecture", back_populates="resources", lazy="selectin")
     downloads = relationship("ResourceDownload", back_populates="resource", cascade="all, delete-orphan")
 
     def __repr__(self):
@@ -65,6 +66,12 @@ class ResourceDownload(Base):
     Track resource downloads by users.
     """
     __tablename__ = "resource_downloads"
+    __table_args__ = (
+        # Downloads of a resource by one user
+        Index("ix_rd_user_resource", "user_id", "resource_id"),
+        # Download history of a resource over time
+        Index("ix_rd_resource_downloaded_at", "resource_id", "downloaded_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
@@ -77,7 +84,7 @@ class ResourceDownload(Base):
     user_agent = Column(String(500), nullable=True)
     
     # Timestamps
-    downloaded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    downloaded_at = ts_col()
 
     # Relationships
     user = relationship("User", back_populates="resource_downloads")
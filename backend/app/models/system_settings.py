@@ -2,10 +2,12 @@
 System settings and configuration models.
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, Boolean, JSON, cast
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.sql import func
 import enum
 from ..database import Base
+from .types import IntEnumType, ts_col
 
 
 class SettingType(enum.Enum):
@@ -24,9 +26,9 @@ class SystemSetting(Base):
     """
     __tablename__ = "system_settings"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     setting_key = Column(String(100), unique=True, nullable=False, index=True)
-    setting_type = Column(String(50), nullable=False, index=True)
+    setting_type = Column(IntEnumType(SettingType), nullable=False, index=True)
     display_name = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
     
@@ -40,13 +42,13 @@ class SystemSetting(Base):
     validation_rules = Column(JSON, nullable=True)  # JSON schema for validation
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     def __repr__(self):
         return f"<SystemSetting(id={self.id}, key='{self.setting_key}', type='{self.setting_type}')>"
 
-    @property
+    @hybrid_property
     def value(self):
         """Get the setting value (prioritizes json_value over string_value)."""
         return self.json_value if self.json_value is not None else self.string_value
@@ -61,6 +63,16 @@ class SystemSetting(Base):
             self.string_value = str(val) if val is not None else None
             self.json_value = None
 
+    @value.expression
+    def value(cls):
+        """
+        SQL form of the value; JSON values come back serialized as text.
+
+        A Python None in json_value is stored as a JSON null, not SQL NULL, so it
+        is mapped back to NULL before falling through to string_value.
+        """
+        return func.coalesce(func.nullif(cast(cls.json_value, Text), "null"), cls.string_value)
+
 
 class EmailTemplate(Base):
     """
@@ -68,7 +80,7 @@ class EmailTemplate(Base):
     """
     __tablename__ = "email_templates"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     template_key = Column(String(100), unique=True, nullable=False, index=True)
     name = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
@@ -86,8 +98,8 @@ class EmailTemplate(Base):
     is_system = Column(Boolean, default=False, nullable=False)  # System templates cannot be deleted
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     def __repr__(self):
         return f"<EmailTemplate(id={self.id}, key='{self.template_key}', name='{self.name}')>"
@@ -99,7 +111,7 @@ class PaymentGatewayConfiguration(Base):
     """
     __tablename__ = "payment_gateway_configurations"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     gateway_name = Column(String(50), unique=True, nullable=False, index=True)  # e.g., 'stripe', 'paypal'
     display_name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
@@ -117,8 +129,8 @@ class PaymentGatewayConfiguration(Base):
     processing_fee = Column(String(10), default="0.00", nullable=False)  # Fixed processing fee
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     def __repr__(self):
         return f"<PaymentGatewayConfiguration(id={self.id}, gateway='{self.gateway_name}', active={self.is_active})>"
\ No newline at end of file
@@ -2,10 +2,11 @@
 Taxonomy models for course organization (tags, difficulty levels, etc.).
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey, Table
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..database import Base
+from .types import ts_col
 
 
 # Association table for many-to-many relationship between courses and tags
@@ -23,15 +24,15 @@ class Tag(Base):
     """
     __tablename__ = "tags"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(50), unique=True, nullable=False, index=True)
     description = Column(Text, nullable=True)
     color = Column(String(7), nullable=True)  # Hex color code like #FF5733
     is_active = Column(Boolean, default=True, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     # Many-to-many relationship with courses
     courses = relationship("Course", secondary=course_tags, back_populates="tags")
@@ -47,7 +48,7 @@ class DifficultyConfiguration(Base):
     """
     __tablename__ = "difficulty_configurations"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     level_key = Column(String(50), unique=True, nullable=False, index=True)  # e.g., 'beginner', 'intermediate'
     display_name = Column(String(100), nullable=False)  # e.g., 'Beginner Friendly'
     description = Column(Text, nullable=True)
@@ -56,8 +57,8 @@ class DifficultyConfiguration(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
 
     def __repr__(self):
         return f"<DifficultyConfiguration(id={self.id}, level_key='{self.level_key}', display_name='{self.display_name}')>"
\ No newline at end of file
@@ -8,6 +8,7 @@ from sqlalchemy import (
     String,
     Text,
     Boolean,
+    Computed,
     DateTime,
     JSON,
     ForeignKey,
@@ -18,6 +19,7 @@ from datetime import datetime
 import enum
 
 from ..database import Base
+from .types import IntEnumType, ts_col
 
 
 class ThemeStatus(enum.Enum):
@@ -47,9 +49,13 @@ class ThemeConfiguration(Base):
 
     # Theme metadata
     status = Column(
-        String(20), default=ThemeStatus.DRAFT.value, nullable=False, index=True
+        IntEnumType(ThemeStatus), default=ThemeStatus.DRAFT, nullable=False, index=True
     )
     is_default = Column(Boolean, default=False, nullable=False)
+    # TRUE for the default theme, NULL otherwise; unique, so there is at most one
+    default_flag = Column(
+        Boolean, Computed("CASE WHEN is_default THEN is_default END", persisted=True), unique=True
+    )
     is_system = Column(
         Boolean, default=False, nullable=False
     )  # System themes cannot be deleted
@@ -66,15 +72,8 @@ class ThemeConfiguration(Base):
     updated_by = Column(Integer, ForeignKey("users.id"), nullable=True)
 
     # Timestamps
-    created_at = Column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
-    )
-    updated_at = Column(
-        DateTime(timezone=True),
-        server_default=func.now(),
-        onupdate=func.now(),
-        nullable=False,
-    )
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
     activated_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
@@ -143,13 +142,11 @@ class ThemeAuditLog(Base):
     user_agent = Column(Text, nullable=True)
 
     # Metadata
-    timestamp = Column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
-    )
+    timestamp = ts_col()
 
     # Relationships
-    theme = relationship("ThemeConfiguration", back_populates="audit_logs")
-    user = relationship("User", back_populates="theme_audit_logs")
+    theme = relationship("ThemeConfiguration", back_populates="audit_logs", lazy="selectin")
+    user = relationship("User", back_populates="theme_audit_logs", lazy="selectin")
 
     def __repr__(self):
         return f"<ThemeAuditLog(id={self.id}, theme_id={self.theme_id}, action='{self.action}', timestamp={self.timestamp})>"
@@ -181,9 +178,7 @@ class ThemeValidationResult(Base):
     validation_rules = Column(JSON, nullable=True)  # Rules used for validation
 
     # Timestamps
-    created_at = Column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
-    )
+    created_at = ts_col()
 
     # Relationships
     theme = relationship("ThemeConfiguration")
@@ -2,12 +2,13 @@
 Transaction and payment models for the Learning Management System.
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Enum, Index, JSON
 from sqlalchemy.types import DECIMAL
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
 from ..database import Base
+from .types import ts_col
 
 
 class TransactionStatus(enum.Enum):
@@ -32,12 +33,16 @@ class Transaction(Base):
     Financial transactions for course purchases and instructor payouts.
     """
     __tablename__ = "transactions"
+    __table_args__ = (
+        # A user's transactions in one status, newest first
+        Index("ix_transactions_user_status_created", "user_id", "status", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     
     # Foreign keys
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    course_id = Column(Integer, ForeignKey("courses.id"), nullable=True)  # Nullable for non-course transactions
+    course_id = Column(Integer, ForeignKey("courses.id", ondelete="CASCADE"), nullable=True)  # Nullable for non-course transactions
     
     # Transaction details
     transaction_id = Column(String(100), unique=True, nullable=False, index=True)  # External transaction ID
@@ -49,8 +54,8 @@ class Transaction(Base):
     payment_method = Column(Enum(PaymentMethod), nullable=False)
     
     # Payment gateway details
-    gateway_transaction_id = Column(String(200), nullable=True)  # Stripe payment intent ID, etc.
-    gateway_response = Column(Text, nullable=True)  # JSON response from payment gateway
+    gateway_transaction_id = Column(String(200), nullable=True, index=True)  # Stripe payment intent ID, etc.
+    gateway_response = Column(JSON, nullable=True)  # Response from payment gateway
     
     # Transaction metadata
     description = Column(String(500), nullable=True)
@@ -62,13 +67,14 @@ class Transaction(Base):
     refunded_at = Column(DateTime(timezone=True), nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
-    user = relationship("User", back_populates="transactions")
-    course = relationship("Course", back_populates="transactions")
+    # Almost always rendered with the transaction, so loaded in one IN query per batch
+    user = relationship("User", back_populates="transactions", lazy="selectin")
+    course = relationship("Course", back_populates="transactions", lazy="selectin")
 
     def __repr__(self):
         return f"<Transaction(id={self.id}, transaction_id='{self.transaction_id}', amount={self.amount}, status='{self.status.value}')>"
@@ -111,11 +117,11 @@ class InstructorPayout(Base):
     
     # External payout details
     external_payout_id = Column(String(200), nullable=True)
-    payout_details = Column(Text, nullable=True)  # JSON with payout information
+    payout_details = Column(JSON, nullable=True)  # Payout information
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
     processed_at = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
@@ -0,0 +1,64 @@
+"""
+Custom column types shared by the Learning Management System models.
+"""
+
+from sqlalchemy import Column, DateTime, SmallInteger, text
+from sqlalchemy.types import TypeDecorator
+
+# One shared server default for every created/updated timestamp.
+# CURRENT_TIMESTAMP is understood by MySQL, PostgreSQL and the SQLite test database.
+CURRENT_TIMESTAMP = text("CURRENT_TIMESTAMP")
+
+# Table options for tables dominated by long, often templated text: InnoDB
+# transparent page compression with lz4. MySQL wants the value as a string literal.
+COMPRESSED_TABLE_OPTIONS = {"mysql_compression": "'lz4'"}
+
+
+def ts_col(**kwargs):
+    """
+    Timestamp column filled in by the database on insert.
+
+    Columns are NOT NULL unless ``nullable`` is passed; ``updated_at`` columns
+    also pass ``onupdate=func.now()``.
+    """
+    kwargs.setdefault("nullable", False)
+    return Column(DateTime(timezone=True), server_default=CURRENT_TIMESTAMP, **kwargs)
+
+
+class IntEnumType(TypeDecorator):
+    """
+    Store a Python enum as a SMALLINT code.
+
+    A member's code is its position in declaration order, so new members must be
+    appended to the enum, never inserted or reordered. Members, their values and
+    their names are all accepted as bind parameters; rows load as members.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class, **kwargs):
+        super().__init__(**kwargs)
+        self.enum_class = enum_class
+
+        # Lookup tables built once per column type
+        self._members = tuple(enum_class)
+        self._codes = {}
+        for code, member in enumerate(self._members):
+            self._codes[member] = code
+            self._codes[member.value] = code
+            self._codes[member.name] = code
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        try:
+            return self._codes[value]
+        except KeyError:
+            raise LookupError(
+                f"'{value}' is not among the defined values of {self.enum_class.__name__}"
+            ) from None
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._members[value]
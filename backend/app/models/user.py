@@ -2,11 +2,13 @@
 User model and related entities for the Learning Management System.
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Text
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Enum, Text, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 import enum
 from ..database import Base
+from .types import ts_col
 
 
 class UserRole(enum.Enum):
@@ -22,6 +24,9 @@ class User(Base):
     Supports role-based access control with Super Admin, Instructor, and Learner roles.
     """
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_active_id", "is_active", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String(255), unique=True, index=True, nullable=False)
@@ -36,8 +41,8 @@ class User(Base):
     bio = Column(Text, nullable=True)
     
     # Timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    created_at = ts_col()
+    updated_at = ts_col(onupdate=func.now())
     last_login = Column(DateTime(timezone=True), nullable=True)
 
     # Relationships
@@ -66,11 +71,16 @@ class User(Base):
     def __repr__(self):
         return f"<User(id={self.id}, email='{self.email}', role='{self.role.value}')>"
 
-    @property
+    @hybrid_property
     def full_name(self):
         """Return the user's full name."""
         return f"{self.first_name} {self.last_name}"
 
+    @full_name.expression
+    def full_name(cls):
+        """SQL form of the full name, for filtering and sorting in the database."""
+        return cls.first_name + " " + cls.last_name
+
     def has_permission(self, permission) -> bool:
         """
         Check if user has a specific permission based on their role.
@@ -81,16 +91,14 @@ class User(Base):
         Returns:
             bool: True if user has the permission, False otherwise
         """
-        from ..permissions import Permission, PermissionChecker
+        from ..permissions import ROLE_PERMISSION_VALUES, PermissionChecker
         
         # Handle string permissions for backward compatibility
         if isinstance(permission, str):
-            try:
-                permission = Permission(permission)
-            except ValueError:
-                return False
+            return permission in ROLE_PERMISSION_VALUES.get(self.role, frozenset())
         
-        return PermissionChecker.has_permission(self.role, permission)
+        # Super admins hold every permission
+        return self.role is UserRole.SUPER_ADMIN or PermissionChecker.has_permission(self.role, permission)
     
     def get_permissions(self) -> set:
         """
@@ -3,7 +3,7 @@ Permission system for role-based access control.
 """
 
 from enum import Enum
-from typing import Dict, List, Set
+from typing import Dict, FrozenSet, Iterable, List, Set
 from .models.user import UserRole
 
 
@@ -212,6 +212,41 @@ ROLE_PERMISSIONS: Dict[UserRole, Set[Permission]] = {
 }
 
 
+# Each permission gets one bit; each role's permission set is compiled into an int
+# mask once at import, so permission checks are a single AND instead of set scans.
+PERMISSION_BITS: Dict[Permission, int] = {
+    permission: 1 << index for index, permission in enumerate(Permission)
+}
+
+
+def permission_mask(permissions: Iterable[Permission]) -> int:
+    """
+    Combine permissions into a single bitmask.
+    
+    Args:
+        permissions: Permissions to combine
+        
+    Returns:
+        int: Bitwise OR of the permissions' bits
+    """
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS[permission]
+    return mask
+
+
+ROLE_PERMISSION_MASKS: Dict[UserRole, int] = {
+    role: permission_mask(permissions) for role, permissions in ROLE_PERMISSIONS.items()
+}
+
+# Permission values per role, so string permissions are checked with one hash
+# lookup instead of constructing the Permission member first.
+ROLE_PERMISSION_VALUES: Dict[UserRole, FrozenSet[str]] = {
+    role: frozenset(permission.value for permission in permissions)
+    for role, permissions in ROLE_PERMISSIONS.items()
+}
+
+
 class PermissionChecker:
     """
     Utility class for checking user permissions.
@@ -229,8 +264,7 @@ class PermissionChecker:
         Returns:
             bool: True if the role has the permission, False otherwise
         """
-        role_permissions = ROLE_PERMISSIONS.get(user_role, set())
-        return permission in role_permissions
+        return bool(ROLE_PERMISSION_MASKS.get(user_role, 0) & PERMISSION_BITS[permission])
     
     @staticmethod
     def get_role_permissions(user_role: UserRole) -> Set[Permission]:
@@ -257,8 +291,7 @@ class PermissionChecker:
         Returns:
             bool: True if the role has at least one of the required permissions
         """
-        role_permissions = ROLE_PERMISSIONS.get(user_role, set())
-        return any(permission in role_permissions for permission in required_permissions)
+        return PermissionChecker.has_any_of_mask(user_role, permission_mask(required_permissions))
     
     @staticmethod
     def requires_all_permissions(user_role: UserRole, required_permissions: List[Permission]) -> bool:
@@ -272,5 +305,65 @@ class PermissionChecker:
         Returns:
             bool: True if the role has all required permissions
         """
-        role_permissions = ROLE_PERMISSIONS.get(user_role, set())
-        return all(permission in role_permissions for permission in required_permissions)
\ No newline at end of file
+        return PermissionChecker.has_all_of_mask(user_role, permission_mask(required_permissions))
+    
+    @staticmethod
+    def has_any_of_mask(user_role: UserRole, required_mask: int) -> bool:
+        """
+        Check if a user role has at least one permission in a precomputed mask.
+        
+        Args:
+            user_role: The user's role
+            required_mask: Mask built with permission_mask()
+            
+        Returns:
+            bool: True if the role has at least one of the permissions
+        """
+        return bool(ROLE_PERMISSION_MASKS.get(user_role, 0) & required_mask)
+    
+    @staticmethod
+    def has_all_of_mask(user_role: UserRole, required_mask: int) -> bool:
+        """
+        Check if a user role has every permission in a precomputed mask.
+        
+        Args:
+            user_role: The user's role
+            required_mask: Mask built with permission_mask()
+            
+        Returns:
+            bool: True if the role has all of the permissions
+        """
+        return ROLE_PERMISSION_MASKS.get(user_role, 0) & required_mask == required_mask
+    
+    @staticmethod
+    def roles_with_any_of_mask(required_mask: int) -> FrozenSet[UserRole]:
+        """
+        Resolve a precomputed mask to the roles holding at least one of its permissions.
+        
+        Role permissions are static, so dependencies can evaluate this once when
+        they are built and reduce the per-request check to a set membership test.
+        
+        Args:
+            required_mask: Mask built with permission_mask()
+            
+        Returns:
+            FrozenSet[UserRole]: Roles that pass has_any_of_mask()
+        """
+        return frozenset(
+            role for role in UserRole if PermissionChecker.has_any_of_mask(role, required_mask)
+        )
+    
+    @staticmethod
+    def roles_with_all_of_mask(required_mask: int) -> FrozenSet[UserRole]:
+        """
+        Resolve a precomputed mask to the roles holding every one of its permissions.
+        
+        Args:
+            required_mask: Mask built with permission_mask()
+            
+        Returns:
+            FrozenSet[UserRole]: Roles that pass has_all_of_mask()
+        """
+        return frozenset(
+            role for role in UserRole if PermissionChecker.has_all_of_mask(role, required_mask)
+        )
@@ -0,0 +1,63 @@
+"""
+Precompiled key lookups for the hottest short selects.
+
+Each statement is a ``lambda_stmt`` built once at import time. SQLAlchemy caches
+it by the lambda's code location, so repeated calls skip statement construction
+and cache-key generation and go straight to the compiled form with new
+parameter values.
+"""
+
+from typing import Optional
+from sqlalchemy import and_, bindparam, lambda_stmt, select
+from sqlalchemy.orm import Session
+
+from .models.communication import Message
+from .models.course import Course
+from .models.enrollment import Enrollment, LectureProgress
+
+
+_course_by_id = lambda_stmt(
+    lambda: select(Course).where(Course.id == bindparam("course_id"))
+)
+
+_enrollment_by_user_course = lambda_stmt(
+    lambda: select(Enrollment).where(
+        and_(
+            Enrollment.user_id == bindparam("user_id"),
+            Enrollment.course_id == bindparam("course_id")
+        )
+    )
+)
+
+_lecture_progress_by_user_lecture = lambda_stmt(
+    lambda: select(LectureProgress).where(
+        and_(
+            LectureProgress.user_id == bindparam("user_id"),
+            LectureProgress.lecture_id == bindparam("lecture_id")
+        )
+    )
+)
+
+_message_by_id = lambda_stmt(
+    lambda: select(Message).where(Message.id == bindparam("message_id"))
+)
+
+
+def get_course(db: Session, course_id: int) -> Optional[Course]:
+    """Get a course by ID."""
+    return db.scalar(_course_by_id, {"course_id": course_id})
+
+
+def get_enrollment(db: Session, user_id: int, course_id: int) -> Optional[Enrollment]:
+    """Get a user's enrollment in a course."""
+    return db.scalar(_enrollment_by_user_course, {"user_id": user_id, "course_id": course_id})
+
+
+def get_lecture_progress(db: Session, user_id: int, lecture_id: int) -> Optional[LectureProgress]:
+    """Get a user's progress on a lecture."""
+    return db.scalar(_lecture_progress_by_user_lecture, {"user_id": user_id, "lecture_id": lecture_id})
+
+
+def get_message(db: Session, message_id: int) -> Optional[Message]:
+    """Get a message by ID."""
+    return db.scalar(_message_by_id, {"message_id": message_id})
@@ -2,6 +2,7 @@
 Communication router for announcements and messaging functionality.
 """
 
+from collections import Counter
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
@@ -103,15 +104,13 @@ async def get_course_announcements(
         # Build response data
         announcement_responses = []
         for announcement in announcements:
-            # Get read count
-            read_count = len(announcement.announcement_reads)
             total_recipients = len(announcement.course.enrollments)
             
             response_data = {
                 **announcement.__dict__,
                 "instructor_name": announcement.instructor.full_name,
                 "course_title": announcement.course.title,
-                "read_count": read_count,
+                "read_count": announcement.read_count,
                 "total_recipients": total_recipients
             }
             announcement_responses.append(AnnouncementResponse(**response_data))
@@ -163,7 +162,7 @@ async def update_announcement(
             **announcement.__dict__,
             "instructor_name": current_user.full_name,
             "course_title": announcement.course.title,
-            "read_count": len(announcement.announcement_reads),
+            "read_count": announcement.read_count,
             "total_recipients": len(announcement.course.enrollments)
         }
         
@@ -363,6 +362,54 @@ async def mark_message_as_read(
         )
 
 
+@router.get("/messages/{message_id}/thread", response_model=MessageThreadResponse)
+async def get_message_thread(
+    message_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get a message together with all replies in its thread.
+    
+    Args:
+        message_id: Message ID
+        
+    Returns:
+        The message and its replies in sending order
+    """
+    try:
+        thread = CommunicationService.get_message_thread(
+            db, message_id, current_user.id
+        )
+        
+        if not thread:
+            raise HTTPException(status_code=404, detail="Message not found")
+        
+        message, replies = thread
+        reply_counts = Counter(reply.parent_message_id for reply in replies)
+        
+        def build_response(thread_message):
+            return MessageResponse(**{
+                **thread_message.__dict__,
+                "sender_name": thread_message.sender.full_name,
+                "recipient_name": thread_message.recipient.full_name,
+                "course_title": thread_message.course.title if thread_message.course else None,
+                "reply_count": reply_counts[thread_message.id]
+            })
+        
+        return MessageThreadResponse(
+            parent_message=build_response(message),
+            replies=[build_response(reply) for reply in replies]
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch message thread: {str(e)}"
+        )
+
+
 # Bulk messaging endpoints
 @router.post("/bulk-messages", response_model=BulkMessageResponse)
 async def send_bulk_message(
@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from ..database import get_db
 from ..dependencies import get_current_user
 from ..models.user import User, UserRole
+from ..models.legal import DocumentType
 from ..services.legal_service import LegalService
 from ..schemas.legal import (
     LegalDocumentCreate,
@@ -34,23 +35,19 @@ router = APIRouter(prefix="/legal", tags=["legal-documents"])
 # Public Legal Document Endpoints (no authentication required)
 @router.get("/documents/public", response_model=List[LegalDocumentPublicResponse])
 async def get_public_documents(
-    document_type: Optional[str] = Query(None, description="Filter by document type"),
+    document_type: Optional[DocumentType] = Query(None, description="Filter by document type"),
     db: Session = Depends(get_db)
 ):
     """Get published legal documents (public access)."""
     service = LegalService(db)
-    documents = service.get_documents(
-        document_type=document_type,
-        published_only=True,
-        current_only=True
-    )
+    documents = service.get_current_documents(document_type)
     return [LegalDocumentPublicResponse.model_validate(doc) for doc in documents]
 
 
 @router.get("/documents/public/{slug}", response_model=LegalDocumentPublicResponse)
 async def get_public_document_by_slug(
     slug: str,
-    document_type: Optional[str] = Query(None, description="Document type for additional filtering"),
+    document_type: Optional[DocumentType] = Query(None, description="Document type for additional filtering"),
     db: Session = Depends(get_db)
 ):
     """Get published legal document by slug (public access)."""
@@ -153,7 +150,7 @@ async def create_document(
 
 @router.get("/documents", response_model=List[LegalDocumentListResponse])
 async def get_documents(
-    document_type: Optional[str] = Query(None, description="Filter by document type"),
+    document_type: Optional[DocumentType] = Query(None, description="Filter by document type"),
     published_only: bool = Query(False, description="Only return published documents"),
     current_only: bool = Query(True, description="Only return current versions"),
     db: Session = Depends(get_db),
@@ -289,7 +286,7 @@ async def delete_document(
 
 @router.get("/documents/{document_type}/{slug}/versions", response_model=LegalDocumentVersionHistory)
 async def get_document_versions(
-    document_type: str,
+    document_type: DocumentType,
     slug: str,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
@@ -180,6 +180,9 @@ async def get_active_alerts(
                 alert_data = cache_service.get(key.decode('utf-8') if isinstance(key, bytes) else key)
                 if alert_data:
                     alerts.append(alert_data)
+            
+            # Request-level alerts raised by ObservabilityMiddleware
+            alerts.extend(cache_service.get("recent_alerts") or [])
         
         # Sort alerts by timestamp (newest first)
         alerts.sort(key=lambda x: x.get('timestamp', 0), reverse=True)
@@ -56,10 +56,16 @@ async def get_questions(
     search: Optional[str] = Query(None, max_length=200, description="Search in question title and content"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, max_length=100, description="next_cursor of the previous page; takes precedence over page"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get paginated list of Q&A questions with optional filtering."""
+    """
+    Get paginated list of Q&A questions with optional filtering.
+    
+    Deep pages should be fetched by passing back ``next_cursor``, which
+    seeks straight to the next page instead of skipping earlier rows.
+    """
     filters = QASearchFilters(
         lecture_id=lecture_id,
         course_id=course_id,
@@ -67,7 +73,8 @@ async def get_questions(
         is_featured=is_featured,
         search=search,
         page=page,
-        per_page=per_page
+        per_page=per_page,
+        cursor=cursor
     )
     
     questions, total = QAService.get_questions(db, current_user.id, filters)
@@ -106,6 +113,19 @@ async def get_questions(
         )
         formatted_questions.append(formatted_question)
     
+    next_cursor = QAService.encode_cursor(questions[-1]) if len(questions) == per_page else None
+    
+    if cursor:
+        # A cursor page has no page number; it always follows earlier rows
+        return QAQuestionListResponse(
+            questions=formatted_questions,
+            total=total,
+            per_page=per_page,
+            has_next=next_cursor is not None,
+            has_prev=True,
+            next_cursor=next_cursor
+        )
+    
     total_pages = math.ceil(total / per_page)
     
     return QAQuestionListResponse(
@@ -115,7 +135,8 @@ async def get_questions(
         per_page=per_page,
         total_pages=total_pages,
         has_next=page < total_pages,
-        has_prev=page > 1
+        has_prev=page > 1,
+        next_cursor=next_cursor
     )
 
 
@@ -177,7 +177,7 @@ async def submit_quiz_attempt(
         question_feedback = {
             "id": question.id,
             "question_text": question.question_text,
-            "question_type": question.question_type.value,
+            "question_type": question.question_type,
             "points": question.points,
             "user_answer": user_answer,
             "is_correct": is_correct,
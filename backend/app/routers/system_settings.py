@@ -9,6 +9,7 @@ from sqlalchemy.orm import Session
 from ..database import get_db
 from ..dependencies import get_current_user
 from ..models.user import User, UserRole
+from ..models.system_settings import SettingType
 from ..services.system_settings_service import SystemSettingsService
 from ..schemas.system_settings import (
     SystemSettingCreate,
@@ -35,7 +36,7 @@ async def get_public_settings(
 ):
     """Get public system settings (no authentication required)."""
     service = SystemSettingsService(db)
-    settings = service.get_settings(public_only=True)
+    settings = service.get_public_settings()
     return [
         SystemSettingPublicResponse(
             setting_key=setting.setting_key,
@@ -74,7 +75,7 @@ async def create_setting(
 
 @router.get("/settings", response_model=List[SystemSettingResponse])
 async def get_settings(
-    setting_type: Optional[str] = Query(None, description="Filter by setting type"),
+    setting_type: Optional[SettingType] = Query(None, description="Filter by setting type"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
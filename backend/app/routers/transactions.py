@@ -6,6 +6,7 @@ import json
 import logging
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
+from fastapi.encoders import jsonable_encoder
 from sqlalchemy.orm import Session
 
 from ..database import get_db
@@ -309,6 +310,9 @@ async def stripe_webhook(
         processed_event = StripeService.handle_webhook_event(event_data)
         
         if processed_event:
+            # Stored as a JSON document; amounts arrive as Decimal
+            gateway_response = jsonable_encoder(processed_event)
+            
             # Update transaction based on event
             db = next(get_db())
             try:
@@ -316,14 +320,14 @@ async def stripe_webhook(
                     transaction_id = processed_event.get("transaction_id")
                     if transaction_id:
                         TransactionService.complete_transaction(
-                            db, transaction_id, json.dumps(processed_event)
+                            db, transaction_id, gateway_response
                         )
                 elif processed_event["event_type"] == "payment_failed":
                     transaction_id = processed_event.get("transaction_id")
                     if transaction_id:
                         update_data = TransactionUpdate(
                             status="failed",
-                            gateway_response=json.dumps(processed_event)
+                            gateway_response=gateway_response
                         )
                         TransactionService.update_transaction(db, transaction_id, update_data)
             finally:
@@ -5,12 +5,13 @@ Pydantic schemas for legal document management.
 from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
+from ..models.legal import DocumentType, NotificationChannel
 
 
 # Legal Document Schemas
 class LegalDocumentCreate(BaseModel):
     """Schema for creating a new legal document."""
-    document_type: str = Field(..., description="Type of legal document")
+    document_type: DocumentType = Field(..., description="Type of legal document")
     title: str = Field(..., min_length=1, max_length=200, description="Document title")
     slug: str = Field(..., min_length=1, max_length=100, description="URL-friendly identifier")
     content: str = Field(..., min_length=1, description="Document content (HTML or Markdown)")
@@ -32,7 +33,7 @@ class LegalDocumentUpdate(BaseModel):
 class LegalDocumentResponse(BaseModel):
     """Schema for legal document response."""
     id: int
-    document_type: str
+    document_type: DocumentType
     title: str
     slug: str
     content: str
@@ -53,7 +54,7 @@ class LegalDocumentResponse(BaseModel):
 class LegalDocumentPublicResponse(BaseModel):
     """Schema for public legal document response (limited fields)."""
     id: int
-    document_type: str
+    document_type: DocumentType
     title: str
     slug: str
     content: str
@@ -70,7 +71,7 @@ class LegalDocumentPublicResponse(BaseModel):
 class LegalDocumentListResponse(BaseModel):
     """Schema for legal document list response."""
     id: int
-    document_type: str
+    document_type: DocumentType
     title: str
     slug: str
     version: str
@@ -90,7 +91,7 @@ class UserPolicyAcceptanceCreate(BaseModel):
     """Schema for creating a policy acceptance record."""
     document_id: int = Field(..., description="Legal document ID")
     ip_address: Optional[str] = Field(None, description="User's IP address")
-    user_agent: Optional[str] = Field(None, description="User's browser user agent")
+    user_agent: Optional[str] = Field(None, max_length=1024, description="User's browser user agent")
 
 
 class UserPolicyAcceptanceResponse(BaseModel):
@@ -102,7 +103,7 @@ class UserPolicyAcceptanceResponse(BaseModel):
     ip_address: Optional[str]
     user_agent: Optional[str]
     document_version: str
-    document_type: str
+    document_type: DocumentType
     
     class Config:
         from_attributes = True
@@ -110,7 +111,7 @@ class UserPolicyAcceptanceResponse(BaseModel):
 
 class UserPolicyStatusResponse(BaseModel):
     """Schema for user's policy acceptance status."""
-    document_type: str
+    document_type: DocumentType
     document_title: str
     document_version: str
     requires_acceptance: bool
@@ -125,7 +126,7 @@ class PolicyUpdateNotificationCreate(BaseModel):
     """Schema for creating a policy update notification."""
     document_id: int = Field(..., description="Legal document ID")
     user_id: int = Field(..., description="User ID")
-    notification_type: str = Field(..., description="Type of notification")
+    notification_type: NotificationChannel = Field(..., description="Type of notification")
 
 
 class PolicyUpdateNotificationResponse(BaseModel):
@@ -133,7 +134,7 @@ class PolicyUpdateNotificationResponse(BaseModel):
     id: int
     document_id: int
     user_id: int
-    notification_type: str
+    notification_type: NotificationChannel
     sent_at: datetime
     viewed_at: Optional[datetime]
     acknowledged_at: Optional[datetime]
@@ -147,12 +148,12 @@ class BulkPolicyAcceptanceRequest(BaseModel):
     """Schema for bulk policy acceptance."""
     document_ids: List[int] = Field(..., description="List of document IDs to accept")
     ip_address: Optional[str] = Field(None, description="User's IP address")
-    user_agent: Optional[str] = Field(None, description="User's browser user agent")
+    user_agent: Optional[str] = Field(None, max_length=1024, description="User's browser user agent")
 
 
 class PolicyComplianceReport(BaseModel):
     """Schema for policy compliance reporting."""
-    document_type: str
+    document_type: DocumentType
     document_title: str
     document_version: str
     total_users: int
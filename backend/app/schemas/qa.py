@@ -76,11 +76,12 @@ class QAQuestionListResponse(BaseModel):
     """Schema for paginated Q&A question list response."""
     questions: List[QAQuestionResponse]
     total: int
-    page: int
+    page: Optional[int] = Field(None, description="Page number; not set on cursor pages")
     per_page: int
-    total_pages: int
+    total_pages: Optional[int] = Field(None, description="Number of pages; not set on cursor pages")
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = Field(None, description="Cursor for the page after this one")
 
 
 class QASearchFilters(BaseModel):
@@ -92,6 +93,7 @@ class QASearchFilters(BaseModel):
     search: Optional[str] = Field(None, max_length=200, description="Search in question title and content")
     page: int = Field(1, ge=1, description="Page number")
     per_page: int = Field(20, ge=1, le=100, description="Items per page")
+    cursor: Optional[str] = Field(None, max_length=100, description="Resume after this cursor instead of using page")
 
 
 class QAModerationAction(BaseModel):
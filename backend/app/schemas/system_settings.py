@@ -5,13 +5,14 @@ Pydantic schemas for system settings and configuration.
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
+from ..models.system_settings import SettingType
 
 
 # System Setting Schemas
 class SystemSettingCreate(BaseModel):
     """Schema for creating a new system setting."""
     setting_key: str = Field(..., min_length=1, max_length=100, description="Unique setting key")
-    setting_type: str = Field(..., min_length=1, max_length=50, description="Setting type/category")
+    setting_type: SettingType = Field(..., description="Setting type/category")
     display_name: str = Field(..., min_length=1, max_length=200, description="Display name")
     description: Optional[str] = Field(None, description="Setting description")
     value: Union[str, int, float, bool, Dict[str, Any], List[Any]] = Field(..., description="Setting value")
@@ -34,7 +35,7 @@ class SystemSettingResponse(BaseModel):
     """Schema for system setting response."""
     id: int
     setting_key: str
-    setting_type: str
+    setting_type: SettingType
     display_name: str
     description: Optional[str]
     value: Union[str, int, float, bool, Dict[str, Any], List[Any], None]
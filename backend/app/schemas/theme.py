@@ -6,13 +6,7 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 from enum import Enum
-
-
-class ThemeStatus(str, Enum):
-    """Theme status enumeration."""
-    DRAFT = "draft"
-    ACTIVE = "active"
-    ARCHIVED = "archived"
+from ..models.theme import ThemeStatus
 
 
 class ValidationStatus(str, Enum):
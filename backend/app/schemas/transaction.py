@@ -3,7 +3,7 @@ Transaction and payment schemas for the Learning Management System.
 """
 
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
@@ -30,7 +30,7 @@ class TransactionUpdate(BaseModel):
     """Schema for updating a transaction."""
     status: Optional[TransactionStatus] = None
     gateway_transaction_id: Optional[str] = Field(None, max_length=200)
-    gateway_response: Optional[str] = None
+    gateway_response: Optional[Dict[str, Any]] = None
     description: Optional[str] = Field(None, max_length=500)
     notes: Optional[str] = None
     completed_at: Optional[datetime] = None
@@ -125,7 +125,7 @@ class InstructorPayoutUpdate(BaseModel):
     """Schema for updating instructor payout."""
     status: Optional[TransactionStatus] = None
     external_payout_id: Optional[str] = Field(None, max_length=200)
-    payout_details: Optional[str] = None
+    payout_details: Optional[Dict[str, Any]] = None
     processed_at: Optional[datetime] = None
 
 
@@ -3,6 +3,7 @@ Service for handling audit logging and security events.
 """
 
 import json
+import orjson
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
@@ -11,6 +12,10 @@ from sqlalchemy import desc, and_, or_
 from ..models.audit_log import AuditLog, SecurityEvent
 from ..models.user import User
 
+# Column widths for free-form request metadata (kept inline as VARCHAR)
+USER_AGENT_MAX_LENGTH = 1024
+DESCRIPTION_MAX_LENGTH = 2000
+
 
 class AuditService:
     """
@@ -60,7 +65,7 @@ class AuditService:
             method=method,
             path=path,
             client_ip=client_ip,
-            user_agent=user_agent,
+            user_agent=user_agent[:USER_AGENT_MAX_LENGTH] if user_agent else None,
             user_id=user_id,
             user_role=user_role,
             query_params=json.dumps(query_params) if query_params else None,
@@ -78,6 +83,46 @@ class AuditService:
         
         return audit_log
     
+    def log_audit_events_bulk(self, events: List[Dict[str, Any]]) -> int:
+        """
+        Insert a batch of audit events in a single round trip.
+        
+        Args:
+            events: Dicts with log_audit_event's keyword arguments plus ``timestamp``
+            
+        Returns:
+            int: Number of audit log entries inserted
+        """
+        mappings = []
+        for event in events:
+            status_code = event["status_code"]
+            user_agent = event.get("user_agent")
+            query_params = event.get("query_params")
+            request_body = event.get("request_body")
+            sanitized_body = self._sanitize_request_body(request_body) if request_body else None
+            response_time_ms = event.get("response_time_ms")
+            
+            mappings.append({
+                "method": event["method"],
+                "path": event["path"],
+                "client_ip": event["client_ip"],
+                "user_agent": user_agent[:USER_AGENT_MAX_LENGTH] if user_agent else None,
+                "user_id": event.get("user_id"),
+                "user_role": event.get("user_role"),
+                "query_params": orjson.dumps(query_params).decode() if query_params else None,
+                "request_body": orjson.dumps(sanitized_body).decode() if sanitized_body else None,
+                "status_code": status_code,
+                "response_time_ms": round(response_time_ms) if response_time_ms is not None else None,
+                "success": 200 <= status_code < 400,
+                "error_message": event.get("error_message"),
+                "timestamp": event["timestamp"]
+            })
+        
+        self.db.bulk_insert_mappings(AuditLog, mappings)
+        self.db.commit()
+        
+        return len(mappings)
+    
     def log_security_event(
         self,
         event_type: str,
@@ -106,9 +151,9 @@ class AuditService:
         security_event = SecurityEvent(
             event_type=event_type,
             severity=severity,
-            description=description,
+            description=description[:DESCRIPTION_MAX_LENGTH],
             client_ip=client_ip,
-            user_agent=user_agent,
+            user_agent=user_agent[:USER_AGENT_MAX_LENGTH] if user_agent else None,
             user_id=user_id,
             details=json.dumps(details) if details else None,
             timestamp=datetime.utcnow()
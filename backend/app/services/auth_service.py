@@ -189,7 +189,10 @@ class AuthService:
         Returns:
             User: User object or None if not found
         """
-        return self.db.query(User).filter(User.id == user_id).first()
+        # Session.get is served from the identity map when the user is already
+        # loaded in this session. Permission checks only read the role column,
+        # so there are no relationships worth eager-loading here.
+        return self.db.get(User, user_id)
     
     def get_user_by_email(self, email: str) -> Optional[User]:
         """
@@ -14,6 +14,7 @@ from ..models.course import Course
 from ..models.enrollment import Enrollment, CourseProgress, LectureProgress
 from ..models.assessment import Quiz, QuizAttempt
 from ..models.user import User
+from .. import queries
 from ..utils.pdf_generator import CertificatePDFGenerator
 
 
@@ -34,13 +35,11 @@ class CertificateService:
             Dict containing completion status and details
         """
         # Get course and enrollment
-        course = db.query(Course).filter(Course.id == course_id).first()
+        course = queries.get_course(db, course_id)
         if not course:
             return {"completed": False, "error": "Course not found"}
             
-        enrollment = db.query(Enrollment).filter(
-            and_(Enrollment.user_id == user_id, Enrollment.course_id == course_id)
-        ).first()
+        enrollment = queries.get_enrollment(db, user_id, course_id)
         if not enrollment:
             return {"completed": False, "error": "User not enrolled in course"}
 
@@ -137,7 +136,7 @@ class CertificateService:
 
         # Get user and course details
         user = db.query(User).filter(User.id == user_id).first()
-        course = db.query(Course).filter(Course.id == course_id).first()
+        course = queries.get_course(db, course_id)
         
         if not user or not course:
             return None
@@ -185,9 +184,7 @@ class CertificateService:
             print(f"Error generating PDF for certificate {certificate_id}: {str(e)}")
 
         # Update enrollment completion status
-        enrollment = db.query(Enrollment).filter(
-            and_(Enrollment.user_id == user_id, Enrollment.course_id == course_id)
-        ).first()
+        enrollment = queries.get_enrollment(db, user_id, course_id)
         
         if enrollment:
             enrollment.is_completed = True
@@ -276,9 +273,7 @@ class CertificateService:
         course_progress.completed_quizzes = completed_quizzes
         
         # Update enrollment progress percentage
-        enrollment = db.query(Enrollment).filter(
-            and_(Enrollment.user_id == user_id, Enrollment.course_id == course_id)
-        ).first()
+        enrollment = queries.get_enrollment(db, user_id, course_id)
         
         if enrollment:
             enrollment.progress_percentage = course_progress.completion_percentage
@@ -4,8 +4,8 @@ Communication service for announcements and messaging functionality.
 
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import func, and_, or_, desc, insert, literal, DateTime
 from ..models.user import User, UserRole
 from ..models.course import Course
 from ..models.enrollment import Enrollment
@@ -13,6 +13,7 @@ from ..models.communication import (
     Announcement, AnnouncementRead, Message, BulkMessage, BulkMessageRecipient,
     AnnouncementType, AnnouncementPriority, MessageType, MessageStatus
 )
+from .. import queries
 from ..schemas.communication import (
     AnnouncementCreate, AnnouncementUpdate, MessageCreate, MessageUpdate,
     BulkMessageCreate
@@ -139,6 +140,12 @@ class CommunicationService:
         )
         
         db.add(announcement_read)
+        
+        # Bump the denormalized counter in the same transaction as the read row
+        db.query(Announcement).filter(Announcement.id == announcement_id).update(
+            {Announcement.read_count: Announcement.read_count + 1},
+            synchronize_session=False
+        )
         db.commit()
         
         return True
@@ -207,7 +214,10 @@ class CommunicationService:
         Returns:
             True if deleted, False if not found
         """
-        announcement = db.query(Announcement).filter(
+        # Only the key is needed to delete; skip loading the content
+        announcement = db.query(Announcement).options(
+            load_only(Announcement.id)
+        ).filter(
             and_(
                 Announcement.id == announcement_id,
                 Announcement.instructor_id == instructor_id
@@ -246,10 +256,17 @@ class CommunicationService:
         
         # If course_id is provided, verify access
         if message_data.course_id:
-            course = db.query(Course).filter(Course.id == message_data.course_id).first()
+            course = queries.get_course(db, message_data.course_id)
             if not course:
                 raise ValueError("Course not found")
         
+        # A reply joins the parent's thread, so the sender must be part of that conversation
+        parent = None
+        if message_data.parent_message_id:
+            parent = queries.get_message(db, message_data.parent_message_id)
+            if not parent or sender_id not in (parent.sender_id, parent.recipient_id):
+                raise ValueError("Parent message not found or access denied")
+        
         message = Message(
             subject=message_data.subject,
             content=message_data.content,
@@ -263,11 +280,51 @@ class CommunicationService:
         )
         
         db.add(message)
+        db.flush()  # Get the ID
+        
+        # Extend the parent's thread path, or start a new thread
+        parent_path = ""
+        if parent:
+            parent_path = parent.thread_path or f"{parent.id}/"
+        message.thread_path = f"{parent_path}{message.id}/"
+        
         db.commit()
         db.refresh(message)
         
         return message
 
+    @staticmethod
+    def get_message_thread(
+        db: Session,
+        message_id: int,
+        user_id: int
+    ) -> Optional[Tuple[Message, List[Message]]]:
+        """
+        Get a message and every reply beneath it.
+        
+        Args:
+            db: Database session
+            message_id: ID of the message heading the thread
+            user_id: User ID (must be sender or recipient)
+            
+        Returns:
+            Tuple of (message, replies in sending order), or None if not found
+        """
+        message = queries.get_message(db, message_id)
+        if not message or user_id not in (message.sender_id, message.recipient_id):
+            return None
+        
+        thread_path = message.thread_path or f"{message.id}/"
+        replies = db.query(Message).filter(
+            and_(
+                Message.thread_path.like(f"{thread_path}%"),
+                Message.id != message.id,
+                or_(Message.sender_id == user_id, Message.recipient_id == user_id)
+            )
+        ).order_by(Message.sent_at, Message.id).all()
+        
+        return message, replies
+
     @staticmethod
     def get_user_messages(
         db: Session,
@@ -340,20 +397,21 @@ class CommunicationService:
         Returns:
             True if marked as read, False if not found or already read
         """
-        message = db.query(Message).filter(
+        # Update in place rather than loading the message (and its content) first
+        updated = db.query(Message).filter(
             and_(
                 Message.id == message_id,
                 Message.recipient_id == user_id,
                 Message.read_at.is_(None)
             )
-        ).first()
+        ).update(
+            {Message.read_at: datetime.utcnow(), Message.status: MessageStatus.READ},
+            synchronize_session=False
+        )
         
-        if not message:
+        if not updated:
             return False
         
-        message.read_at = datetime.utcnow()
-        message.status = MessageStatus.READ
-        
         db.commit()
         
         return True
@@ -387,7 +445,7 @@ class CommunicationService:
             raise ValueError("Course not found or access denied")
         
         # Get recipients based on filter
-        recipients_query = db.query(User).join(Enrollment).filter(
+        recipients_query = db.query(Enrollment.user_id).filter(
             Enrollment.course_id == bulk_message_data.course_id
         )
         
@@ -408,7 +466,8 @@ class CommunicationService:
                 Enrollment.progress_percentage < 25.0
             )
         
-        recipients = recipients_query.all()
+        total_recipients = recipients_query.count()
+        sent_at = datetime.utcnow()
         
         # Create bulk message
         bulk_message = BulkMessage(
@@ -417,25 +476,31 @@ class CommunicationService:
             sender_id=sender_id,
             course_id=bulk_message_data.course_id,
             recipient_filter=bulk_message_data.recipient_filter,
-            total_recipients=len(recipients),
+            total_recipients=total_recipients,
             send_email=bulk_message_data.send_email,
             send_notification=bulk_message_data.send_notification,
-            sent_at=datetime.utcnow()
+            sent_at=sent_at
         )
         
         db.add(bulk_message)
         db.flush()  # Get the ID
         
-        # Create individual recipient records
-        for recipient in recipients:
-            bulk_recipient = BulkMessageRecipient(
-                bulk_message_id=bulk_message.id,
-                recipient_id=recipient.id,
-                delivered_at=datetime.utcnow()
+        # Create individual recipient records in one INSERT ... SELECT, so the
+        # fan-out never loads the recipients into Python
+        recipient_table = BulkMessageRecipient.__table__
+        db.execute(
+            insert(recipient_table).from_select(
+                ["bulk_message_id", "recipient_id", "status", "delivered_at"],
+                recipients_query.with_entities(
+                    literal(bulk_message.id),
+                    Enrollment.user_id,
+                    literal(MessageStatus.SENT, recipient_table.c.status.type),
+                    literal(sent_at, DateTime(timezone=True))
+                )
             )
-            db.add(bulk_recipient)
+        )
         
-        bulk_message.delivered_count = len(recipients)
+        bulk_message.delivered_count = total_recipients
         
         db.commit()
         db.refresh(bulk_message)
@@ -3,14 +3,15 @@ Course service for handling course management business logic.
 """
 
 from typing import List, Optional, Tuple
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, func, desc
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy import Select, and_, or_, func, desc, literal, select
 from fastapi import HTTPException, status
 from datetime import datetime
 
-from ..models.course import Course, CourseCategory, Section, Lecture, CourseStatus
+from ..models.course import Course, CourseCategory, Section, Lecture, CourseStatus, price_to_cents
 from ..models.user import User, UserRole
 from ..models.taxonomy import Tag
+from .. import queries
 from ..schemas.course import (
     CourseCreate, 
     CourseUpdate, 
@@ -56,6 +57,7 @@ class CourseService:
             )
         
         # Validate parent category exists if provided
+        parent_category = None
         if category_data.parent_id:
             parent_category = self.db.query(CourseCategory).filter(
                 CourseCategory.id == category_data.parent_id
@@ -68,6 +70,12 @@ class CourseService:
         
         category = CourseCategory(**category_data.model_dump())
         self.db.add(category)
+        self.db.flush()
+        
+        # Extend the parent's path, or start a new tree
+        parent_path = self._category_path(parent_category) if parent_category else ""
+        category.path = f"{parent_path}{category.id}/"
+        
         self.db.commit()
         self.db.refresh(category)
         return category
@@ -108,13 +116,67 @@ class CourseService:
         
         # Update category fields
         update_data = category_data.model_dump(exclude_unset=True)
+        new_parent_id = update_data.pop("parent_id", category.parent_id)
         for field, value in update_data.items():
             setattr(category, field, value)
         
+        if new_parent_id != category.parent_id:
+            self._move_category(category, new_parent_id)
+        
         self.db.commit()
         self.db.refresh(category)
         return category
     
+    def _move_category(self, category: CourseCategory, parent_id: Optional[int]):
+        """Re-parent a category and rewrite the paths of its whole subtree."""
+        parent_path = ""
+        if parent_id:
+            parent_category = self.get_category_by_id(parent_id)
+            if not parent_category:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Parent category not found"
+                )
+            parent_path = self._category_path(parent_category)
+            if parent_path.startswith(self._category_path(category)):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Category cannot be moved under itself or its subcategories"
+                )
+        
+        old_path = self._category_path(category)
+        new_path = f"{parent_path}{category.id}/"
+        category.parent_id = parent_id
+        # Write out any path rebuilt above so the UPDATE below matches it
+        self.db.flush()
+        
+        # One UPDATE swaps the prefix on the category and every descendant
+        self.db.query(CourseCategory).filter(
+            CourseCategory.path.like(f"{old_path}%")
+        ).update(
+            {CourseCategory.path: literal(new_path).concat(func.substr(CourseCategory.path, len(old_path) + 1))},
+            synchronize_session=False
+        )
+        category.path = new_path
+    
+    def _category_path(self, category: CourseCategory) -> str:
+        """Return a category's path, rebuilding it from parent_id if it was never set."""
+        if category.path is None:
+            parent_path = ""
+            if category.parent_id:
+                parent_path = self._category_path(self.get_category_by_id(category.parent_id))
+            category.path = f"{parent_path}{category.id}/"
+        return category.path
+    
+    def get_category_subtree_ids(self, category_id: int) -> Select:
+        """Select the IDs of a category and all of its subcategories."""
+        path = self.db.query(CourseCategory.path).filter(
+            CourseCategory.id == category_id
+        ).scalar()
+        if path is None:
+            return select(CourseCategory.id).where(CourseCategory.id == category_id)
+        return select(CourseCategory.id).where(CourseCategory.path.like(f"{path}%"))
+    
     def delete_category(self, category_id: int) -> bool:
         """Delete course category."""
         category = self.get_category_by_id(category_id)
@@ -234,7 +296,10 @@ class CourseService:
                 )
             
             if filters.category_id:
-                query = query.filter(Course.category_id == filters.category_id)
+                # Courses filed under subcategories belong to the category too
+                query = query.filter(
+                    Course.category_id.in_(self.get_category_subtree_ids(filters.category_id))
+                )
             
             if filters.status:
                 query = query.filter(Course.status == filters.status)
@@ -244,18 +309,18 @@ class CourseService:
             
             if filters.is_free is not None:
                 if filters.is_free:
-                    query = query.filter(Course.price == 0)
+                    query = query.filter(Course.price_cents == 0)
                 else:
-                    query = query.filter(Course.price > 0)
+                    query = query.filter(Course.price_cents > 0)
             
             if filters.is_featured is not None:
                 query = query.filter(Course.is_featured == filters.is_featured)
             
             if filters.min_price is not None:
-                query = query.filter(Course.price >= filters.min_price)
+                query = query.filter(Course.price_cents >= price_to_cents(filters.min_price))
             
             if filters.max_price is not None:
-                query = query.filter(Course.price <= filters.max_price)
+                query = query.filter(Course.price_cents <= price_to_cents(filters.max_price))
         
         # Get total count
         total = query.count()
@@ -269,12 +334,11 @@ class CourseService:
     
     def get_course_by_id(self, course_id: int, include_sections: bool = False) -> Optional[Course]:
         """Get course by ID with optional sections."""
-        query = self.db.query(Course)
-        if include_sections:
-            query = query.options(
-                joinedload(Course.sections).joinedload(Section.lectures)
-            )
-        return query.filter(Course.id == course_id).first()
+        if not include_sections:
+            return queries.get_course(self.db, course_id)
+        return self.db.query(Course).options(
+            selectinload(Course.sections).selectinload(Section.lectures)
+        ).filter(Course.id == course_id).first()
     
     def update_course(self, course_id: int, course_data: CourseUpdate, user_id: int) -> Course:
         """Update course information."""
@@ -499,11 +563,9 @@ class CourseService:
                 detail="Insufficient permissions to delete this section"
             )
         
+        # Course totals are kept by database triggers
         self.db.delete(section)
         self.db.commit()
-        
-        # Update course totals
-        self._update_course_totals(section.course_id)
         return True
     
     # Lecture Methods
@@ -535,14 +597,11 @@ class CourseService:
         lecture_dict['section_id'] = section_id
         lecture = Lecture(**lecture_dict)
         
+        # Section and course totals are kept by database triggers
         self.db.add(lecture)
         self.db.commit()
         self.db.refresh(lecture)
         
-        # Update section and course totals
-        self._update_section_totals(section_id)
-        self._update_course_totals(section.course_id)
-        
         return lecture
     
     def get_lectures_by_section(self, section_id: int) -> List[Lecture]:
@@ -580,9 +639,6 @@ class CourseService:
                 detail="Insufficient permissions to update this lecture"
             )
         
-        # Store old duration for totals update
-        old_duration = lecture.duration
-        
         # Update lecture fields
         update_data = lecture_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
@@ -591,11 +647,6 @@ class CourseService:
         self.db.commit()
         self.db.refresh(lecture)
         
-        # Update totals if duration changed
-        if old_duration != lecture.duration:
-            self._update_section_totals(lecture.section_id)
-            self._update_course_totals(section.course_id)
-        
         return lecture
     
     def delete_lecture(self, lecture_id: int, user_id: int) -> bool:
@@ -623,33 +674,8 @@ class CourseService:
                 detail="Insufficient permissions to delete this lecture"
             )
         
-        section_id = lecture.section_id
-        course_id = section.course_id
-        
+        # Section and course totals are kept by database triggers
         self.db.delete(lecture)
         self.db.commit()
         
-        # Update section and course totals
-        self._update_section_totals(section_id)
-        self._update_course_totals(course_id)
-        
         return True
-    
-    # Helper Methods
-    def _update_section_totals(self, section_id: int):
-        """Update section total duration and lecture count."""
-        section = self.get_section_by_id(section_id)
-        if section:
-            lectures = self.get_lectures_by_section(section_id)
-            section.total_duration = sum(lecture.duration for lecture in lectures)
-            section.total_lectures = len(lectures)
-            self.db.commit()
-    
-    def _update_course_totals(self, course_id: int):
-        """Update course total duration and lecture count."""
-        course = self.get_course_by_id(course_id)
-        if course:
-            sections = self.get_sections_by_course(course_id)
-            course.total_duration = sum(section.total_duration for section in sections)
-            course.total_lectures = sum(section.total_lectures for section in sections)
-            self.db.commit()
\ No newline at end of file
@@ -2,14 +2,18 @@
 Enrollment service for handling course enrollment and progress tracking.
 """
 
-from typing import List, Optional
+import logging
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, func, select, tuple_, update
 from fastapi import HTTPException, status
 from datetime import datetime
 
+from ..database import engine
+from ..utils.buffered_writer import BufferedWriter
+from .. import queries
 from ..models.enrollment import Enrollment, CourseProgress, LectureProgress
-from ..models.course import Course, CourseStatus
+from ..models.course import Course, CourseStatus, Lecture, Section
 from ..models.user import User
 from ..schemas.enrollment import (
     EnrollmentCreate,
@@ -18,6 +22,76 @@ from ..schemas.enrollment import (
     PaymentIntentResponse
 )
 
+logger = logging.getLogger(__name__)
+
+# Player heartbeats (position and watch time only) are buffered in memory, keyed
+# by (user_id, lecture_id) so only the latest update per lecture is kept, and
+# written by heartbeat_writer with one upsert per batch. The same transaction
+# brings CourseProgress.total_watch_time and Enrollment.last_accessed up to
+# date for the courses involved.
+HEARTBEAT_FLUSH_INTERVAL_SECONDS = 2.0
+HEARTBEAT_FLUSH_BATCH_SIZE = 10_000
+
+
+def _refresh_course_watch_time(conn, rows: List[Dict[str, int]]):
+    """Recompute course watch time and touch the enrollments behind a heartbeat batch."""
+    lecture_courses = dict(conn.execute(
+        select(Lecture.id, Section.course_id)
+        .join(Section, Lecture.section_id == Section.id)
+        .where(Lecture.id.in_({row["lecture_id"] for row in rows}))
+    ).all())
+    user_courses = {
+        (row["user_id"], lecture_courses[row["lecture_id"]])
+        for row in rows if row["lecture_id"] in lecture_courses
+    }
+    if not user_courses:
+        return
+    
+    # Whole minutes watched across the course, as the synchronous path computes it
+    watch_time = (
+        select(func.coalesce(func.sum(LectureProgress.watch_time), 0) // 60)
+        .select_from(LectureProgress)
+        .join(Lecture, LectureProgress.lecture_id == Lecture.id)
+        .join(Section, Lecture.section_id == Section.id)
+        .where(
+            LectureProgress.user_id == CourseProgress.user_id,
+            Section.course_id == CourseProgress.course_id
+        )
+        .scalar_subquery()
+    )
+    conn.execute(
+        update(CourseProgress)
+        .where(tuple_(CourseProgress.user_id, CourseProgress.course_id).in_(user_courses))
+        .values(total_watch_time=watch_time)
+    )
+    conn.execute(
+        update(Enrollment)
+        .where(tuple_(Enrollment.user_id, Enrollment.course_id).in_(user_courses))
+        .values(last_accessed=func.now())
+    )
+
+
+def _write_heartbeats(conn, rows: List[Dict[str, int]]):
+    """Upsert a batch of heartbeats and refresh the course progress they affect."""
+    LectureProgress.bulk_upsert(conn, rows)
+    _refresh_course_watch_time(conn, rows)
+
+
+heartbeat_writer = BufferedWriter(
+    "lecture heartbeats", _write_heartbeats, engine,
+    interval=HEARTBEAT_FLUSH_INTERVAL_SECONDS, batch_size=HEARTBEAT_FLUSH_BATCH_SIZE
+)
+
+
+def buffer_lecture_heartbeat(user_id: int, lecture_id: int, watch_time: int, last_position: int):
+    """Queue a heartbeat, replacing any pending one for the same lecture."""
+    heartbeat_writer.add({
+        "user_id": user_id,
+        "lecture_id": lecture_id,
+        "watch_time": watch_time,
+        "last_position": last_position,
+    }, key=(user_id, lecture_id))
+
 
 class EnrollmentService:
     """Service class for enrollment management operations."""
@@ -93,12 +167,7 @@ class EnrollmentService:
     
     def get_enrollment(self, user_id: int, course_id: int) -> Optional[Enrollment]:
         """Get specific enrollment for user and course."""
-        return self.db.query(Enrollment).filter(
-            and_(
-                Enrollment.user_id == user_id,
-                Enrollment.course_id == course_id
-            )
-        ).first()
+        return queries.get_enrollment(self.db, user_id, course_id)
     
     def is_user_enrolled(self, user_id: int, course_id: int) -> bool:
         """Check if user is enrolled in a course."""
@@ -132,12 +201,21 @@ class EnrollmentService:
             LectureProgress: Updated lecture progress
         """
         # Get or create lecture progress
-        lecture_progress = self.db.query(LectureProgress).filter(
-            and_(
-                LectureProgress.user_id == user_id,
-                LectureProgress.lecture_id == lecture_id
-            )
-        ).first()
+        lecture_progress = self.get_lecture_progress(user_id, lecture_id)
+        
+        # Plain heartbeats on an existing row are buffered and written in
+        # batches; the response reflects the update before it is flushed
+        update_data = progress_data.model_dump(exclude_unset=True)
+        is_heartbeat = (
+            update_data.keys() == {"watch_time", "last_position"}
+            and None not in update_data.values()
+        )
+        if lecture_progress and is_heartbeat:
+            self.db.expunge(lecture_progress)
+            lecture_progress.watch_time = update_data["watch_time"]
+            lecture_progress.last_position = update_data["last_position"]
+            buffer_lecture_heartbeat(user_id, lecture_id, **update_data)
+            return lecture_progress
         
         if not lecture_progress:
             lecture_progress = LectureProgress(
@@ -146,8 +224,14 @@ class EnrollmentService:
             )
             self.db.add(lecture_progress)
         
+        # A pending heartbeat would overwrite this update when flushed, so
+        # fold it in first
+        pending = heartbeat_writer.pop((user_id, lecture_id))
+        if pending:
+            lecture_progress.watch_time = pending["watch_time"]
+            lecture_progress.last_position = pending["last_position"]
+        
         # Update progress fields
-        update_data = progress_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(lecture_progress, field, value)
         
@@ -165,12 +249,7 @@ class EnrollmentService:
     
     def get_lecture_progress(self, user_id: int, lecture_id: int) -> Optional[LectureProgress]:
         """Get lecture progress for a user."""
-        return self.db.query(LectureProgress).filter(
-            and_(
-                LectureProgress.user_id == user_id,
-                LectureProgress.lecture_id == lecture_id
-            )
-        ).first()
+        return queries.get_lecture_progress(self.db, user_id, lecture_id)
     
     def _update_course_progress(self, user_id: int, lecture_id: int):
         """Update course progress based on lecture completion."""
@@ -266,7 +345,7 @@ class EnrollmentService:
             )
         
         # Check if course is free
-        if course.price == 0:
+        if course.is_free:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="This course is free and does not require payment"
@@ -282,7 +361,7 @@ class EnrollmentService:
         
         # For now, return a mock payment intent
         # In a real implementation, this would integrate with Stripe
-        amount_cents = int(course.price * 100)  # Convert to cents
+        amount_cents = course.price_cents
         
         # Mock client secret - in real implementation, this would come from Stripe
         client_secret = f"pi_mock_{course.id}_{user_id}_secret"
@@ -185,7 +185,7 @@ class FinancialAnalyticsService:
                 Transaction.completed_at <= period_end
             )
         ).group_by(
-            Course.id, Course.title, Course.price, User.full_name
+            Course.id, Course.title, Course.price_cents, User.full_name
         ).order_by(desc('gross_revenue')).limit(limit).all()
 
         results = []
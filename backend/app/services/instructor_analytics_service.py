@@ -162,7 +162,7 @@ class InstructorAnalyticsService:
              Transaction.created_at >= start_date,
              Transaction.created_at <= end_date
          )).filter(Course.instructor_id == instructor_id)\
-         .group_by(Course.id, Course.title, Course.price, Course.status, Course.created_at)\
+         .group_by(Course.id, Course.title, Course.price_cents, Course.status, Course.created_at)\
          .all()
         
         course_performance = []
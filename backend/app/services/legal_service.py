@@ -3,13 +3,15 @@ Legal document service for handling policy and legal document management.
 """
 
 from typing import List, Optional, Dict, Any, Tuple
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import and_, or_, desc, func, insert, literal, select
+from sqlalchemy.engine import Row
 from fastapi import HTTPException, status
 from datetime import datetime
 
-from ..models.legal import LegalDocument, UserPolicyAcceptance, PolicyUpdateNotification, DocumentType
+from ..models.legal import LegalDocument, UserPolicyAcceptance, PolicyUpdateNotification, DocumentType, NotificationChannel
 from ..models.user import User
+from ..utils.snapshot_cache import SnapshotCache
 from ..schemas.legal import (
     LegalDocumentCreate,
     LegalDocumentUpdate,
@@ -20,6 +22,25 @@ from ..schemas.legal import (
     DocumentArchiveRequest
 )
 
+# Current published documents change rarely but are read on every policy check
+# and footer render, so each worker caches them as plain rows.
+CURRENT_DOCUMENTS_CACHE_TTL_SECONDS = 300
+current_documents_cache = SnapshotCache(CURRENT_DOCUMENTS_CACHE_TTL_SECONDS, LegalDocument)
+
+# Columns served from the cache (everything LegalDocumentPublicResponse needs)
+_CURRENT_DOCUMENT_COLUMNS = (
+    LegalDocument.id,
+    LegalDocument.document_type,
+    LegalDocument.title,
+    LegalDocument.slug,
+    LegalDocument.content,
+    LegalDocument.version,
+    LegalDocument.effective_date,
+    LegalDocument.is_published,
+    LegalDocument.requires_acceptance,
+    LegalDocument.updated_at,
+)
+
 
 class LegalService:
     """Service class for legal document management operations."""
@@ -67,12 +88,12 @@ class LegalService:
     
     def get_documents(
         self, 
-        document_type: Optional[str] = None,
+        document_type: Optional[DocumentType] = None,
         published_only: bool = False,
         current_only: bool = True
     ) -> List[LegalDocument]:
         """Get legal documents with optional filtering."""
-        query = self.db.query(LegalDocument)
+        query = self.db.query(LegalDocument).options(raiseload("*"))
         
         if document_type:
             query = query.filter(LegalDocument.document_type == document_type)
@@ -85,24 +106,42 @@ class LegalService:
         
         return query.order_by(LegalDocument.document_type, desc(LegalDocument.created_at)).all()
     
+    def get_current_documents(self, document_type: Optional[DocumentType] = None) -> List[Row]:
+        """
+        Get the current published documents, optionally of one type.
+        
+        Served from a per-worker cache refreshed every
+        CURRENT_DOCUMENTS_CACHE_TTL_SECONDS or after any committed document write.
+        Rows are read-only and carry the public document fields.
+        """
+        documents = current_documents_cache.get(lambda: self.db.execute(
+            select(*_CURRENT_DOCUMENT_COLUMNS).where(
+                and_(
+                    LegalDocument.is_published == True,
+                    LegalDocument.is_current == True
+                )
+            ).order_by(LegalDocument.document_type, desc(LegalDocument.created_at))
+        ))
+        
+        if document_type:
+            return [doc for doc in documents if doc.document_type is document_type]
+        return list(documents)
+    
+    def get_current_document(self, document_type: DocumentType) -> Optional[Row]:
+        """Get the current published document of a type (cached)."""
+        documents = self.get_current_documents(document_type)
+        return documents[0] if documents else None
+    
     def get_document_by_id(self, document_id: int) -> Optional[LegalDocument]:
         """Get document by ID."""
         return self.db.query(LegalDocument).filter(LegalDocument.id == document_id).first()
     
-    def get_document_by_slug(self, slug: str, document_type: Optional[str] = None) -> Optional[LegalDocument]:
-        """Get current document by slug."""
-        query = self.db.query(LegalDocument).filter(
-            and_(
-                LegalDocument.slug == slug,
-                LegalDocument.is_current == True,
-                LegalDocument.is_published == True
-            )
-        )
-        
-        if document_type:
-            query = query.filter(LegalDocument.document_type == document_type)
-        
-        return query.first()
+    def get_document_by_slug(self, slug: str, document_type: Optional[DocumentType] = None) -> Optional[Row]:
+        """Get current published document by slug (cached)."""
+        for document in self.get_current_documents(document_type):
+            if document.slug == slug:
+                return document
+        return None
     
     def update_document(self, document_id: int, document_data: LegalDocumentUpdate) -> LegalDocument:
         """Update legal document."""
@@ -150,6 +189,7 @@ class LegalService:
             "requires_acceptance": document_data.requires_acceptance if document_data.requires_acceptance is not None else current_document.requires_acceptance,
             "created_by": created_by,
             "previous_version_id": current_document.id,
+            "root_id": current_document.root_id,
             "is_current": True,
             "is_published": document_data.is_published if document_data.is_published is not None else False
         }
@@ -223,11 +263,18 @@ class LegalService:
                 detail="Cannot delete document that has user acceptances"
             )
         
+        # Later versions point back at this one
+        if self.db.query(LegalDocument.id).filter(LegalDocument.previous_version_id == document_id).first():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Cannot delete document that has later versions"
+            )
+        
         self.db.delete(document)
         self.db.commit()
         return True
     
-    def get_document_versions(self, document_type: str, slug: str) -> List[LegalDocument]:
+    def get_document_versions(self, document_type: DocumentType, slug: str) -> List[LegalDocument]:
         """Get all versions of a document."""
         return self.db.query(LegalDocument).filter(
             and_(
@@ -308,13 +355,10 @@ class LegalService:
     def get_user_policy_status(self, user_id: int) -> List[Dict[str, Any]]:
         """Get user's policy acceptance status for all required documents."""
         # Get all published documents that require acceptance
-        required_documents = self.db.query(LegalDocument).filter(
-            and_(
-                LegalDocument.is_published == True,
-                LegalDocument.is_current == True,
-                LegalDocument.requires_acceptance == True
-            )
-        ).all()
+        required_documents = [
+            document for document in self.get_current_documents()
+            if document.requires_acceptance
+        ]
         
         status_list = []
         
@@ -366,17 +410,19 @@ class LegalService:
     # Notification Management
     def _notify_users_of_update(self, document: LegalDocument, custom_message: Optional[str] = None):
         """Send notifications to users about policy updates."""
-        # Get all active users
-        users = self.db.query(User).filter(User.is_active == True).all()
-        
-        for user in users:
-            notification = PolicyUpdateNotification(
-                document_id=document.id,
-                user_id=user.id,
-                notification_type="email"
+        # One INSERT ... SELECT over all active users; no user rows are loaded
+        # and no per-row INSERT round trips are made
+        active_users = select(
+            literal(document.id),
+            User.id,
+            literal(NotificationChannel.EMAIL, PolicyUpdateNotification.notification_type.type)
+        ).where(User.is_active == True)
+        
+        self.db.execute(
+            insert(PolicyUpdateNotification).from_select(
+                ["document_id", "user_id", "notification_type"], active_users
             )
-            self.db.add(notification)
-        
+        )
         self.db.commit()
     
     def mark_notification_viewed(self, notification_id: int, user_id: int) -> bool:
@@ -4,10 +4,10 @@ Content moderation service for admin course management.
 
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import and_, or_, desc, func
 from ..models.user import User, UserRole
-from ..models.course import Course, CourseStatus
+from ..models.course import Course, CourseStatus, Section
 from ..models.enrollment import Enrollment
 
 
@@ -216,7 +216,11 @@ class ModerationService:
         Returns:
             Dict containing detailed course information
         """
-        course = db.query(Course).filter(Course.id == course_id).first()
+        course = db.query(Course).options(
+            joinedload(Course.instructor),
+            joinedload(Course.category),
+            selectinload(Course.sections).selectinload(Section.lectures)
+        ).filter(Course.id == course_id).first()
         if not course:
             raise ValueError("Course not found")
         
@@ -5,7 +5,7 @@ Application monitoring and error tracking service.
 import time
 import psutil
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from collections import defaultdict, deque
@@ -631,6 +631,20 @@ class MonitoringService:
         """Track request performance."""
         self.performance_monitor.track_request(method, path, response_time, status_code, user_id)
     
+    def track_request_performance_bulk(
+        self,
+        rows: List[Tuple[str, str, float, int, Optional[int]]]
+    ):
+        """
+        Track a batch of buffered request samples.
+        
+        Args:
+            rows: (method, path, response_time, status_code, user_id) tuples
+        """
+        track_request = self.performance_monitor.track_request
+        for method, path, response_time, status_code, user_id in rows:
+            track_request(method, path, response_time, status_code, user_id)
+    
     def track_error(
         self,
         error: Exception,
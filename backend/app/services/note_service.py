@@ -140,9 +140,17 @@ class NoteService:
         Raises:
             HTTPException: If note not found or access denied
         """
-        note = NoteService.get_note(db, user_id, note_id)
+        # Delete in place rather than loading the note (and its content) first
+        deleted = db.query(Note).filter(
+            and_(Note.id == note_id, Note.user_id == user_id)
+        ).delete(synchronize_session=False)
+        
+        if not deleted:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Note not found"
+            )
         
-        db.delete(note)
         db.commit()
         
         return True
@@ -2,10 +2,14 @@
 Service layer for Q&A and discussion operations.
 """
 
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import and_, or_, desc, func
+from sqlalchemy.dialects.mysql import match
 from typing import Optional, Tuple, List
+from datetime import datetime
+import base64
 from ..models import QAQuestion, QAAnswer, Lecture, Course, Enrollment, User
+from .. import queries
 from ..schemas.qa import (
     QAQuestionCreate, QAQuestionUpdate, QAAnswerCreate, QAAnswerUpdate,
     QASearchFilters, QAModerationAction, QAAnswerModerationAction
@@ -13,10 +17,31 @@ from ..schemas.qa import (
 from fastapi import HTTPException, status
 import math
 
+# Shortest search the ngram FULLTEXT index can answer (MySQL's ngram_token_size default)
+NGRAM_TOKEN_SIZE = 2
+
 
 class QAService:
     """Service class for Q&A operations."""
 
+    @staticmethod
+    def encode_cursor(question: QAQuestion) -> str:
+        """Opaque keyset cursor pointing just past a question."""
+        raw = f"{question.created_at.isoformat()}|{question.id}"
+        return base64.urlsafe_b64encode(raw.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """Split a cursor back into (created_at, id)."""
+        try:
+            created_at, question_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            return datetime.fromisoformat(created_at), int(question_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor"
+            )
+
     @staticmethod
     def create_question(db: Session, user_id: int, question_data: QAQuestionCreate) -> QAQuestion:
         """
@@ -43,12 +68,7 @@ class QAService:
         
         # Check if user is enrolled in the course or is the instructor
         course_id = lecture.section.course_id
-        enrollment = db.query(Enrollment).filter(
-            and_(
-                Enrollment.user_id == user_id,
-                Enrollment.course_id == course_id
-            )
-        ).first()
+        enrollment = queries.get_enrollment(db, user_id, course_id)
         
         is_instructor = lecture.section.course.instructor_id == user_id
         
@@ -90,7 +110,7 @@ class QAService:
             HTTPException: If question not found or access denied
         """
         question = db.query(QAQuestion).options(
-            joinedload(QAQuestion.answers).joinedload(QAAnswer.user),
+            selectinload(QAQuestion.answers).joinedload(QAAnswer.user),
             joinedload(QAQuestion.user)
         ).filter(QAQuestion.id == question_id).first()
         
@@ -102,12 +122,7 @@ class QAService:
         
         # Check if user has access to this question (enrolled in course or instructor)
         course_id = question.lecture.section.course_id
-        enrollment = db.query(Enrollment).filter(
-            and_(
-                Enrollment.user_id == user_id,
-                Enrollment.course_id == course_id
-            )
-        ).first()
+        enrollment = queries.get_enrollment(db, user_id, course_id)
         
         is_instructor = question.lecture.section.course.instructor_id == user_id
         
@@ -229,12 +244,7 @@ class QAService:
         
         # Check if user is enrolled in the course or is the instructor
         course_id = question.lecture.section.course_id
-        enrollment = db.query(Enrollment).filter(
-            and_(
-                Enrollment.user_id == user_id,
-                Enrollment.course_id == course_id
-            )
-        ).first()
+        enrollment = queries.get_enrollment(db, user_id, course_id)
         
         is_instructor = question.lecture.section.course.instructor_id == user_id
         
@@ -361,7 +371,7 @@ class QAService:
             Tuple of (questions list, total count)
         """
         query = db.query(QAQuestion).options(
-            joinedload(QAQuestion.answers).joinedload(QAAnswer.user),
+            selectinload(QAQuestion.answers).joinedload(QAAnswer.user),
             joinedload(QAQuestion.user)
         )
         
@@ -382,13 +392,20 @@ class QAService:
             query = query.filter(QAQuestion.is_featured == filters.is_featured)
         
         if filters.search:
-            search_term = f"%{filters.search}%"
-            query = query.filter(
-                or_(
-                    QAQuestion.title.ilike(search_term),
-                    QAQuestion.content.ilike(search_term)
+            phrase = filters.search.replace('"', " ").strip()
+            if db.get_bind().dialect.name == "mysql" and len(phrase) >= NGRAM_TOKEN_SIZE:
+                # Phrase search on the ngram FULLTEXT index behaves like a substring match
+                query = query.filter(
+                    match(QAQuestion.title, QAQuestion.content, against=f'"{phrase}"').in_boolean_mode()
+                )
+            else:
+                search_term = f"%{filters.search}%"
+                query = query.filter(
+                    or_(
+                        QAQuestion.title.ilike(search_term),
+                        QAQuestion.content.ilike(search_term)
+                    )
                 )
-            )
         
         # Check access permissions - only show questions from courses user is enrolled in or instructs
         user_courses = db.query(Course.id).filter(
@@ -407,10 +424,27 @@ class QAService:
         # Get total count
         total = query.count()
         
-        # Apply pagination and ordering
-        questions = query.order_by(desc(QAQuestion.created_at)).offset(
-            (filters.page - 1) * filters.per_page
-        ).limit(filters.per_page).all()
+        # Newest first; id breaks ties so every question has a unique position
+        query = query.order_by(desc(QAQuestion.created_at), desc(QAQuestion.id))
+        
+        if filters.cursor:
+            # Keyset pagination: seek past the cursor instead of skipping rows.
+            # Spelled out rather than as a row comparison so MySQL can range-scan
+            # ix_qa_q_lecture_created.
+            cursor_created_at, cursor_id = QAService._decode_cursor(filters.cursor)
+            query = query.filter(
+                or_(
+                    QAQuestion.created_at < cursor_created_at,
+                    and_(
+                        QAQuestion.created_at == cursor_created_at,
+                        QAQuestion.id < cursor_id
+                    )
+                )
+            )
+        else:
+            query = query.offset((filters.page - 1) * filters.per_page)
+        
+        questions = query.limit(filters.per_page).all()
         
         return questions, total
 
@@ -436,12 +470,7 @@ class QAService:
             )
         
         course_id = lecture.section.course_id
-        enrollment = db.query(Enrollment).filter(
-            and_(
-                Enrollment.user_id == user_id,
-                Enrollment.course_id == course_id
-            )
-        ).first()
+        enrollment = queries.get_enrollment(db, user_id, course_id)
         
         is_instructor = lecture.section.course.instructor_id == user_id
         
@@ -452,7 +481,7 @@ class QAService:
             )
         
         return db.query(QAQuestion).options(
-            joinedload(QAQuestion.answers).joinedload(QAAnswer.user),
+            selectinload(QAQuestion.answers).joinedload(QAAnswer.user),
             joinedload(QAQuestion.user)
         ).filter(QAQuestion.lecture_id == lecture_id).order_by(
             desc(QAQuestion.is_featured),
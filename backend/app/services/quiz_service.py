@@ -5,7 +5,7 @@ Service layer for quiz and assessment operations.
 from sqlalchemy.orm import Session
 from sqlalchemy import and_, desc, func
 from typing import Optional, Tuple, List, Dict, Any
-from ..models import Quiz, Question, QuizAttempt, Course, Enrollment, User
+from ..models import Quiz, Question, QuizAttempt, QuestionType, Course, Enrollment, User
 from ..schemas.quiz import (
     QuizCreate, QuizUpdate, QuestionCreate, QuestionUpdate, 
     QuizAttemptSubmission, QuizAttemptAnswer
@@ -475,11 +475,11 @@ class QuizService:
         correct_answer = question.correct_answer.strip().lower()
         user_answer = user_answer.strip().lower()
         
-        if question.question_type.value == "multiple_choice":
+        if question.question_type == QuestionType.MULTIPLE_CHOICE:
             return user_answer == correct_answer
-        elif question.question_type.value == "true_false":
+        elif question.question_type == QuestionType.TRUE_FALSE:
             return user_answer == correct_answer
-        elif question.question_type.value == "short_answer":
+        elif question.question_type == QuestionType.SHORT_ANSWER:
             # For short answers, we can implement fuzzy matching later
             return user_answer == correct_answer
         else:
@@ -2,13 +2,46 @@
 Service layer for resource management operations.
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import Optional
+import logging
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, raiseload
+from typing import Dict, List, Optional
+from ..database import engine
+from ..utils.buffered_writer import BufferedWriter
 from ..models import LectureResource, ResourceDownload, Lecture, Course, Enrollment, User
+from .. import queries
 from ..schemas.resource import LectureResourceCreate, LectureResourceUpdate, ResourceDownloadCreate
 from fastapi import HTTPException, status
 
+logger = logging.getLogger(__name__)
+
+# Download records are append-only, so they are queued in memory and written by
+# download_writer as one multi-row INSERT per batch instead of one round trip
+# per download. downloaded_at is filled in by the database.
+DOWNLOAD_FLUSH_INTERVAL_SECONDS = 0.1
+DOWNLOAD_FLUSH_BATCH_SIZE = 1_000
+
+
+def _insert_downloads(conn, rows: List[Dict]):
+    """Insert a batch of download records."""
+    conn.execute(insert(ResourceDownload), rows)
+
+
+download_writer = BufferedWriter(
+    "resource downloads", _insert_downloads, engine,
+    interval=DOWNLOAD_FLUSH_INTERVAL_SECONDS, batch_size=DOWNLOAD_FLUSH_BATCH_SIZE
+)
+
+
+def enqueue_download(user_id: int, resource_id: int, ip_address: Optional[str] = None, user_agent: Optional[str] = None):
+    """Queue a download record for the next flush."""
+    download_writer.add({
+        "user_id": user_id,
+        "resource_id": resource_id,
+        "ip_address": ip_address,
+        "user_agent": user_agent,
+    })
+
 
 class ResourceService:
     """Service class for resource operations."""
@@ -185,12 +218,7 @@ class ResourceService:
         
         # Check if user is enrolled in the course or is the instructor
         course_id = lecture.section.course_id
-        enrollment = db.query(Enrollment).filter(
-            and_(
-                Enrollment.user_id == user_id,
-                Enrollment.course_id == course_id
-            )
-        ).first()
+        enrollment = queries.get_enrollment(db, user_id, course_id)
         
         is_instructor = lecture.section.course.instructor_id == user_id
         
@@ -200,7 +228,7 @@ class ResourceService:
                 detail="You must be enrolled in this course to view resources"
             )
         
-        return db.query(LectureResource).filter(
+        return db.query(LectureResource).options(raiseload("*")).filter(
             LectureResource.lecture_id == lecture_id
         ).order_by(LectureResource.created_at.asc()).all()
 
@@ -237,12 +265,7 @@ class ResourceService:
         
         # Check if user is enrolled in the course or is the instructor
         course_id = resource.lecture.section.course_id
-        enrollment = db.query(Enrollment).filter(
-            and_(
-                Enrollment.user_id == user_id,
-                Enrollment.course_id == course_id
-            )
-        ).first()
+        enrollment = queries.get_enrollment(db, user_id, course_id)
         
         is_instructor = resource.lecture.section.course.instructor_id == user_id
         
@@ -253,15 +276,13 @@ class ResourceService:
             )
         
         # Record the download
-        download_record = ResourceDownload(
-            user_id=user_id,
-            resource_id=resource_id,
+        enqueue_download(
+            user_id,
+            resource_id,
             ip_address=download_data.ip_address if download_data else None,
             user_agent=download_data.user_agent if download_data else None
         )
         
-        db.add(download_record)
-        
         # Increment download count
         resource.download_count += 1
         
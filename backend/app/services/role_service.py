@@ -3,7 +3,7 @@ Service for role assignment and validation operations.
 """
 
 from typing import Optional, List
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 from fastapi import HTTPException, status
 
 from ..models.user import User, UserRole
@@ -103,6 +103,7 @@ class RoleService:
         """
         return (
             self.db.query(User)
+            .options(raiseload("*"))
             .filter(User.role == role)
             .offset(offset)
             .limit(limit)
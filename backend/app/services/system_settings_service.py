@@ -2,13 +2,14 @@
 System settings service for handling configuration management.
 """
 
-from typing import List, Optional, Dict, Any, Union
+from typing import List, NamedTuple, Optional, Dict, Any, Tuple, Union
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, or_, select
 from fastapi import HTTPException, status
 import json
 
-from ..models.system_settings import SystemSetting, EmailTemplate, PaymentGatewayConfiguration
+from ..models.system_settings import SystemSetting, EmailTemplate, PaymentGatewayConfiguration, SettingType
+from ..utils.snapshot_cache import SnapshotCache
 from ..schemas.system_settings import (
     SystemSettingCreate,
     SystemSettingUpdate,
@@ -20,6 +21,20 @@ from ..schemas.system_settings import (
 )
 
 
+class CachedSetting(NamedTuple):
+    """Read-only snapshot of a setting served without authentication."""
+    setting_key: str
+    setting_type: SettingType
+    is_public: bool
+    value: Any
+
+
+# Public and site configuration settings are read on every page load, so each
+# worker prefetches them in one query and serves them from memory.
+PUBLIC_SETTINGS_CACHE_TTL_SECONDS = 300
+public_settings_cache = SnapshotCache(PUBLIC_SETTINGS_CACHE_TTL_SECONDS, SystemSetting)
+
+
 class SystemSettingsService:
     """Service class for system settings management operations."""
     
@@ -61,7 +76,7 @@ class SystemSettingsService:
         self.db.refresh(setting)
         return setting
     
-    def get_settings(self, setting_type: Optional[str] = None, public_only: bool = False) -> List[SystemSetting]:
+    def get_settings(self, setting_type: Optional[SettingType] = None, public_only: bool = False) -> List[SystemSetting]:
         """Get system settings with optional filtering."""
         query = self.db.query(SystemSetting)
         
@@ -73,6 +88,44 @@ class SystemSettingsService:
         
         return query.order_by(SystemSetting.setting_type, SystemSetting.setting_key).all()
     
+    def _load_cached_settings(self):
+        """Query the public and site configuration settings for the cache."""
+        rows = self.db.execute(
+            select(
+                SystemSetting.setting_key,
+                SystemSetting.setting_type,
+                SystemSetting.is_public,
+                SystemSetting.json_value,
+                SystemSetting.string_value
+            ).where(
+                or_(
+                    SystemSetting.is_public == True,
+                    SystemSetting.setting_type == SettingType.SITE_CONFIGURATION
+                )
+            ).order_by(SystemSetting.setting_type, SystemSetting.setting_key)
+        )
+        return (
+            CachedSetting(
+                row.setting_key,
+                row.setting_type,
+                row.is_public,
+                row.json_value if row.json_value is not None else row.string_value
+            )
+            for row in rows
+        )
+    
+    def _get_cached_settings(self) -> Tuple[CachedSetting, ...]:
+        """
+        Get public and site configuration settings from the per-worker cache.
+        
+        Reloaded every PUBLIC_SETTINGS_CACHE_TTL_SECONDS or after any committed setting write.
+        """
+        return public_settings_cache.get(self._load_cached_settings)
+    
+    def get_public_settings(self) -> List[CachedSetting]:
+        """Get settings that can be read without authentication (cached)."""
+        return [setting for setting in self._get_cached_settings() if setting.is_public]
+    
     def get_setting_by_key(self, setting_key: str) -> Optional[SystemSetting]:
         """Get setting by key."""
         return self.db.query(SystemSetting).filter(SystemSetting.setting_key == setting_key).first()
@@ -164,7 +217,7 @@ class SystemSettingsService:
                 # Create setting if it doesn't exist
                 setting_data = SystemSettingCreate(
                     setting_key=setting_key,
-                    setting_type="site_configuration",
+                    setting_type=SettingType.SITE_CONFIGURATION,
                     display_name=key.replace('_', ' ').title(),
                     value=value,
                     is_public=True,
@@ -176,11 +229,12 @@ class SystemSettingsService:
         return updated_settings
     
     def get_site_configuration(self) -> Dict[str, Any]:
-        """Get all site configuration settings."""
-        settings = self.get_settings(setting_type="site_configuration")
+        """Get all site configuration settings (cached)."""
         config = {}
         
-        for setting in settings:
+        for setting in self._get_cached_settings():
+            if setting.setting_type is not SettingType.SITE_CONFIGURATION:
+                continue
             # Remove 'site_' prefix from key
             key = setting.setting_key.replace('site_', '', 1)
             config[key] = setting.value
@@ -332,70 +386,70 @@ class SystemSettingsService:
             # Site Configuration
             {
                 "setting_key": "site_name",
-                "setting_type": "site_configuration",
+                "setting_type": SettingType.SITE_CONFIGURATION,
                 "display_name": "Site Name",
                 "value": "Learning Management System",
                 "is_public": True
             },
             {
                 "setting_key": "site_description",
-                "setting_type": "site_configuration",
+                "setting_type": SettingType.SITE_CONFIGURATION,
                 "display_name": "Site Description",
                 "value": "A comprehensive learning management system",
                 "is_public": True
             },
             {
                 "setting_key": "site_logo_url",
-                "setting_type": "site_configuration",
+                "setting_type": SettingType.SITE_CONFIGURATION,
                 "display_name": "Site Logo URL",
                 "value": "/images/logo.png",
                 "is_public": True
             },
             {
                 "setting_key": "site_favicon_url",
-                "setting_type": "site_configuration",
+                "setting_type": SettingType.SITE_CONFIGURATION,
                 "display_name": "Site Favicon URL",
                 "value": "/images/favicon.ico",
                 "is_public": True
             },
             {
                 "setting_key": "contact_email",
-                "setting_type": "site_configuration",
+                "setting_type": SettingType.SITE_CONFIGURATION,
                 "display_name": "Contact Email",
                 "value": "contact@example.com",
                 "is_public": True
             },
             {
                 "setting_key": "support_email",
-                "setting_type": "site_configuration",
+                "setting_type": SettingType.SITE_CONFIGURATION,
                 "display_name": "Support Email",
                 "value": "support@example.com",
                 "is_public": True
             },
             {
                 "setting_key": "allow_registration",
-                "setting_type": "site_configuration",
+                "setting_type": SettingType.SITE_CONFIGURATION,
                 "display_name": "Allow Registration",
                 "value": True,
                 "is_public": True
             },
             {
                 "setting_key": "maintenance_mode",
-                "setting_type": "site_configuration",
+                "setting_type": SettingType.SITE_CONFIGURATION,
                 "display_name": "Maintenance Mode",
                 "value": False,
                 "is_public": True
             },
             {
                 "setting_key": "default_currency",
-                "setting_type": "site_configuration",
+                "setting_type": SettingType.SITE_CONFIGURATION,
                 "display_name": "Default Currency",
                 "value": "USD",
                 "is_public": True
             },
             {
                 "setting_key": "timezone",
-                "setting_type": "site_configuration",
+                "setting_type": SettingType.SITE_CONFIGURATION,
                 "display_name": "Default Timezone",
                 "value": "UTC",
                 "is_public": True
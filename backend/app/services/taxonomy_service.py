@@ -9,6 +9,7 @@ from fastapi import HTTPException, status
 
 from ..models.taxonomy import Tag, DifficultyConfiguration, course_tags
 from ..models.course import Course
+from .. import queries
 from ..schemas.taxonomy import (
     TagCreate,
     TagUpdate,
@@ -123,7 +124,7 @@ class TaxonomyService:
     
     def assign_tags_to_course(self, course_id: int, tag_assignment: TagAssignment) -> Course:
         """Assign tags to a course."""
-        course = self.db.query(Course).filter(Course.id == course_id).first()
+        course = queries.get_course(self.db, course_id)
         if not course:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -152,7 +153,7 @@ class TaxonomyService:
     
     def get_course_tags(self, course_id: int) -> List[Tag]:
         """Get all tags assigned to a course."""
-        course = self.db.query(Course).filter(Course.id == course_id).first()
+        course = queries.get_course(self.db, course_id)
         if not course:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -6,7 +6,7 @@ import json
 import re
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 from sqlalchemy import desc, and_
 
 from ..models.theme import ThemeConfiguration, ThemeAuditLog, ThemeValidationResult, ThemeStatus
@@ -311,7 +311,7 @@ class ThemeService:
             components=components_dict,
             version=theme_data.version,
             created_by=user_id,
-            status=ThemeStatus.DRAFT.value
+            status=ThemeStatus.DRAFT
         )
         
         self.db.add(theme)
@@ -338,10 +338,10 @@ class ThemeService:
         offset: int = 0
     ) -> List[ThemeConfiguration]:
         """Get theme configurations with filtering."""
-        query = self.db.query(ThemeConfiguration)
+        query = self.db.query(ThemeConfiguration).options(raiseload("*"))
         
         if status:
-            query = query.filter(ThemeConfiguration.status == status.value)
+            query = query.filter(ThemeConfiguration.status == status)
         
         if not include_system:
             query = query.filter(ThemeConfiguration.is_system == False)
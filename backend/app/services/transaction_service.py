@@ -5,16 +5,17 @@ Transaction service for handling payments and financial operations.
 import uuid
 import json
 import logging
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Dict, Any
 from datetime import datetime, timedelta
 from decimal import Decimal
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, raiseload
 from sqlalchemy import and_, or_, desc, func
 
 from ..models.transaction import Transaction, TransactionStatus, PaymentMethod, InstructorPayout
 from ..models.user import User
 from ..models.course import Course
 from ..models.enrollment import Enrollment
+from .. import queries
 from ..schemas.transaction import (
     TransactionCreate, TransactionUpdate, TransactionFilter,
     RefundCreate, InstructorPayoutCreate, InstructorPayoutUpdate,
@@ -156,7 +157,8 @@ class TransactionService:
         Returns:
             Tuple[List[Transaction], int]: List of transactions and total count
         """
-        query = db.query(Transaction)
+        # The list response only carries columns; any relationship access is an N+1
+        query = db.query(Transaction).options(raiseload("*"))
         
         # Apply filters
         if filters:
@@ -191,7 +193,7 @@ class TransactionService:
     def complete_transaction(
         db: Session,
         transaction_id: str,
-        gateway_response: Optional[str] = None
+        gateway_response: Optional[Dict[str, Any]] = None
     ) -> Optional[Transaction]:
         """
         Mark a transaction as completed and handle enrollment.
@@ -216,12 +218,7 @@ class TransactionService:
         
         # If this is a course purchase, create enrollment
         if transaction.course_id and transaction.status == TransactionStatus.COMPLETED:
-            existing_enrollment = db.query(Enrollment).filter(
-                and_(
-                    Enrollment.user_id == transaction.user_id,
-                    Enrollment.course_id == transaction.course_id
-                )
-            ).first()
+            existing_enrollment = queries.get_enrollment(db, transaction.user_id, transaction.course_id)
             
             if not existing_enrollment:
                 enrollment = Enrollment(
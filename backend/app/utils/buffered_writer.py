@@ -0,0 +1,89 @@
+"""
+In-memory write buffer for high-rate, loss-tolerant rows (player heartbeats,
+download records) that are written to the database in batches.
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from sqlalchemy.engine import Connection, Engine
+
+logger = logging.getLogger(__name__)
+
+Row = Dict[str, Any]
+
+
+class BufferedWriter:
+    """
+    Collect rows from request handlers and write them from a background task.
+
+    Rows added under a key replace any pending row with the same key, so only
+    the latest one is written; rows added without a key are all kept, in order.
+    ``run()`` writes the pending rows every ``interval`` seconds, off the event
+    loop, and once more when cancelled so they survive a clean shutdown.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        write_batch: Callable[[Connection, List[Row]], None],
+        engine: Engine,
+        interval: float,
+        batch_size: int
+    ):
+        """
+        Args:
+            name: What the rows are, for log messages
+            write_batch: Writes one batch of rows on a connection inside a transaction
+            engine: Engine each batch is written through
+            interval: Seconds between flushes
+            batch_size: Maximum rows per transaction
+        """
+        self.name = name
+        self.write_batch = write_batch
+        self.engine = engine
+        self.interval = interval
+        self.batch_size = batch_size
+        self._rows: Dict[Hashable, Row] = {}
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+
+    def add(self, row: Row, key: Optional[Hashable] = None):
+        """Queue a row for the next flush, replacing any pending row with the same key."""
+        with self._lock:
+            self._rows[next(self._sequence) if key is None else key] = row
+
+    def pop(self, key: Hashable) -> Optional[Row]:
+        """Remove and return the pending row for a key, if any."""
+        with self._lock:
+            return self._rows.pop(key, None)
+
+    def take(self) -> List[Row]:
+        """Swap out the pending rows."""
+        with self._lock:
+            rows, self._rows = list(self._rows.values()), {}
+        return rows
+
+    def flush(self, rows: List[Row]):
+        """Write rows in transactions of at most batch_size rows each."""
+        for start in range(0, len(rows), self.batch_size):
+            batch = rows[start:start + self.batch_size]
+            try:
+                with self.engine.begin() as conn:
+                    self.write_batch(conn, batch)
+            except Exception as e:
+                logger.error("Failed to flush %d %s: %s", len(batch), self.name, e)
+
+    async def run(self):
+        """Drain the buffer forever. Run as a background task."""
+        try:
+            while True:
+                await asyncio.sleep(self.interval)
+                rows = self.take()
+                if rows:
+                    await asyncio.to_thread(self.flush, rows)
+        finally:
+            self.flush(self.take())
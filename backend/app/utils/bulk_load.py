@@ -0,0 +1,146 @@
+"""
+Bulk loading utilities for append-heavy tables (audit logs, security events, seed data).
+"""
+
+from contextlib import contextmanager, nullcontext
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Union
+
+from sqlalchemy import Table, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Rows per executemany batch. Large enough to amortize round-trips and statement
+# parsing, small enough to stay well under MySQL's default max_allowed_packet.
+DEFAULT_BATCH_SIZE = 10_000
+
+
+def iter_batches(rows: Iterable[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Split an iterable of rows into lists of at most ``batch_size`` rows.
+
+    Args:
+        rows: Iterable of row mappings
+        batch_size: Maximum number of rows per batch
+
+    Yields:
+        List of row mappings
+    """
+    if batch_size <= 0:
+        raise ValueError("batch_size must be positive")
+
+    iterator = iter(rows)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+@contextmanager
+def relaxed_constraint_checks(conn: Connection) -> Iterator[None]:
+    """
+    Temporarily disable per-row unique and foreign key checks on MySQL.
+
+    The previous session values are restored on exit. On other dialects
+    this is a no-op.
+
+    Args:
+        conn: Database connection the load runs on
+    """
+    if conn.dialect.name != "mysql":
+        yield
+        return
+
+    unique_checks, foreign_key_checks = conn.execute(
+        text("SELECT @@SESSION.unique_checks, @@SESSION.foreign_key_checks")
+    ).one()
+    conn.execute(text("SET SESSION unique_checks = 0"))
+    conn.execute(text("SET SESSION foreign_key_checks = 0"))
+    try:
+        yield
+    finally:
+        conn.execute(text("SET SESSION unique_checks = :value"), {"value": unique_checks})
+        conn.execute(text("SET SESSION foreign_key_checks = :value"), {"value": foreign_key_checks})
+
+
+@contextmanager
+def relaxed_durability(bind: Union[Connection, Session]) -> Iterator[None]:
+    """
+    Skip the per-commit log flush for a one-shot load.
+
+    On PostgreSQL this sets ``synchronous_commit = OFF`` for the current
+    transaction. On other dialects this is a no-op: MySQL only offers the
+    server-wide ``innodb_flush_log_at_trx_commit``, and loading inside one
+    explicit transaction already costs a single log flush.
+
+    Args:
+        bind: Connection or session the load runs on
+    """
+    dialect_name = (bind.get_bind() if isinstance(bind, Session) else bind).dialect.name
+
+    if dialect_name == "postgresql":
+        bind.execute(text("SET LOCAL synchronous_commit = OFF"))
+    yield
+
+
+def bulk_insert(
+    conn: Connection,
+    table: Union[Table, Any],
+    rows: Iterable[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    relax_checks: bool = True
+) -> int:
+    """
+    Insert rows in fixed-size executemany batches on an existing connection.
+
+    Usable from Alembic migrations via ``bulk_insert(op.get_bind(), table, rows)``.
+
+    Args:
+        conn: Database connection (the caller owns the transaction)
+        table: Table or declarative model class to insert into
+        rows: Iterable of row mappings keyed by column name
+        batch_size: Number of rows sent per executemany call
+        relax_checks: Disable unique/foreign key checks during the load (MySQL only)
+
+    Returns:
+        int: Number of rows inserted
+    """
+    table = getattr(table, "__table__", table)
+    insert_stmt = table.insert()
+    total = 0
+
+    with (relaxed_constraint_checks(conn) if relax_checks else nullcontext()):
+        for batch in iter_batches(rows, batch_size):
+            conn.execute(insert_stmt, batch)
+            total += len(batch)
+
+    logger.info("Bulk loaded %d rows into %s", total, table.name)
+    return total
+
+
+def bulk_load(
+    engine: Engine,
+    table: Union[Table, Any],
+    rows: Iterable[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    relax_checks: bool = True
+) -> int:
+    """
+    Load rows into a table inside a single transaction.
+
+    Args:
+        engine: SQLAlchemy engine
+        table: Table or declarative model class to insert into
+        rows: Iterable of row mappings keyed by column name
+        batch_size: Number of rows sent per executemany call
+        relax_checks: Disable unique/foreign key checks during the load (MySQL only)
+
+    Returns:
+        int: Number of rows inserted
+    """
+    with engine.begin() as conn:
+        return bulk_insert(conn, table, rows, batch_size=batch_size, relax_checks=relax_checks)
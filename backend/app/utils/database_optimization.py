@@ -37,22 +37,24 @@ class DatabaseOptimizer:
             "CREATE INDEX IF NOT EXISTS idx_courses_category ON courses(category_id)",
             "CREATE INDEX IF NOT EXISTS idx_courses_published ON courses(is_published)",
             "CREATE INDEX IF NOT EXISTS idx_courses_created_at ON courses(created_at)",
-            "CREATE INDEX IF NOT EXISTS idx_courses_price ON courses(price)",
+            "CREATE INDEX IF NOT EXISTS idx_courses_price ON courses(price_cents)",
             "CREATE INDEX IF NOT EXISTS idx_courses_difficulty ON courses(difficulty_level)",
             
             # Enrollment indexes
-            "CREATE INDEX IF NOT EXISTS idx_enrollments_user ON enrollments(user_id)",
-            "CREATE INDEX IF NOT EXISTS idx_enrollments_course ON enrollments(course_id)",
             "CREATE INDEX IF NOT EXISTS idx_enrollments_date ON enrollments(enrolled_at)",
-            "CREATE INDEX IF NOT EXISTS idx_enrollments_user_course ON enrollments(user_id, course_id)",
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_enrollment_user_course ON enrollments(user_id, course_id)",
+            "CREATE INDEX IF NOT EXISTS ix_enrollment_course_progress ON enrollments(course_id, is_completed)",
             
             # Progress indexes
             "CREATE INDEX IF NOT EXISTS idx_course_progress_user ON course_progress(user_id)",
             "CREATE INDEX IF NOT EXISTS idx_course_progress_course ON course_progress(course_id)",
             "CREATE INDEX IF NOT EXISTS idx_course_progress_user_course ON course_progress(user_id, course_id)",
-            "CREATE INDEX IF NOT EXISTS idx_lecture_progress_user ON lecture_progress(user_id)",
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_lecprog_user_lecture ON lecture_progress(user_id, lecture_id)",
             "CREATE INDEX IF NOT EXISTS idx_lecture_progress_lecture ON lecture_progress(lecture_id)",
             
+            # Announcement indexes
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_annread_ann_user ON announcement_reads(announcement_id, user_id)",
+            
             # Transaction indexes
             "CREATE INDEX IF NOT EXISTS idx_transactions_user ON transactions(user_id)",
             "CREATE INDEX IF NOT EXISTS idx_transactions_course ON transactions(course_id)",
@@ -63,25 +65,27 @@ class DatabaseOptimizer:
             "CREATE INDEX IF NOT EXISTS idx_quiz_attempts_user ON quiz_attempts(user_id)",
             "CREATE INDEX IF NOT EXISTS idx_quiz_attempts_quiz ON quiz_attempts(quiz_id)",
             "CREATE INDEX IF NOT EXISTS idx_quiz_attempts_date ON quiz_attempts(attempted_at)",
+            "CREATE INDEX IF NOT EXISTS ix_quiz_attempts_user_quiz ON quiz_attempts(user_id, quiz_id)",
             
             # Audit log indexes
-            "CREATE INDEX IF NOT EXISTS idx_audit_logs_user ON audit_logs(user_id)",
-            "CREATE INDEX IF NOT EXISTS idx_audit_logs_timestamp ON audit_logs(timestamp)",
-            "CREATE INDEX IF NOT EXISTS idx_audit_logs_method ON audit_logs(method)",
-            "CREATE INDEX IF NOT EXISTS idx_audit_logs_path ON audit_logs(path)",
-            "CREATE INDEX IF NOT EXISTS idx_audit_logs_client_ip ON audit_logs(client_ip)",
+            "CREATE INDEX IF NOT EXISTS idx_audit_logs_id ON audit_logs(id)",
+            "CREATE INDEX IF NOT EXISTS idx_audit_logs_user_ts ON audit_logs(user_id, timestamp)",
+            "CREATE INDEX IF NOT EXISTS idx_audit_logs_path ON audit_logs(path(64))",
+            "CREATE INDEX IF NOT EXISTS idx_audit_logs_client_ip_ts ON audit_logs(client_ip, timestamp)",
             
             # Security event indexes
-            "CREATE INDEX IF NOT EXISTS idx_security_events_type ON security_events(event_type)",
-            "CREATE INDEX IF NOT EXISTS idx_security_events_severity ON security_events(severity)",
-            "CREATE INDEX IF NOT EXISTS idx_security_events_timestamp ON security_events(timestamp)",
-            "CREATE INDEX IF NOT EXISTS idx_security_events_resolved ON security_events(resolved)",
+            "CREATE INDEX IF NOT EXISTS idx_security_events_type_ts ON security_events(event_type, timestamp)",
+            "CREATE INDEX IF NOT EXISTS idx_security_events_id ON security_events(id)",
             
             # Composite indexes for common queries
             "CREATE INDEX IF NOT EXISTS idx_courses_published_category ON courses(is_published, category_id)",
-            "CREATE INDEX IF NOT EXISTS idx_courses_published_price ON courses(is_published, price)",
+            "CREATE INDEX IF NOT EXISTS idx_courses_published_price ON courses(is_published, price_cents)",
+            "CREATE INDEX IF NOT EXISTS ix_courses_published_list ON courses(status, created_at, price_cents)",
+            "CREATE INDEX IF NOT EXISTS ix_messages_inbox ON messages(recipient_id, is_archived_by_recipient, sent_at)",
             "CREATE INDEX IF NOT EXISTS idx_enrollments_user_date ON enrollments(user_id, enrolled_at)",
-            "CREATE INDEX IF NOT EXISTS idx_transactions_user_status ON transactions(user_id, status)",
+            "CREATE INDEX IF NOT EXISTS ix_transactions_user_status_created ON transactions(user_id, status, created_at)",
+            "CREATE INDEX IF NOT EXISTS ix_upa_user_doc ON user_policy_acceptances(user_id, document_id)",
+            "CREATE INDEX IF NOT EXISTS ix_rd_user_resource ON resource_downloads(user_id, resource_id)",
         ]
         
         for index_sql in indexes:
@@ -304,7 +308,7 @@ class QueryOptimizer:
         Returns:
             Optimized SQLAlchemy query
         """
-        from ..models.course import Course
+        from ..models.course import Course, price_to_cents
         from ..models.user import User
         from ..models.category import Category
         from sqlalchemy.orm import joinedload
@@ -326,10 +330,10 @@ class QueryOptimizer:
             query = query.filter(Course.instructor_id == filters['instructor_id'])
         
         if filters.get('min_price') is not None:
-            query = query.filter(Course.price >= filters['min_price'])
+            query = query.filter(Course.price_cents >= price_to_cents(filters['min_price']))
         
         if filters.get('max_price') is not None:
-            query = query.filter(Course.price <= filters['max_price'])
+            query = query.filter(Course.price_cents <= price_to_cents(filters['max_price']))
         
         if filters.get('difficulty_level'):
             query = query.filter(Course.difficulty_level == filters['difficulty_level'])
@@ -369,12 +373,12 @@ class QueryOptimizer:
         from ..models.enrollment import Enrollment
         from ..models.course_progress import CourseProgress
         from ..models.course import Course
-        from sqlalchemy.orm import joinedload
+        from sqlalchemy.orm import joinedload, selectinload
         
         query = db.query(Enrollment).filter(
             Enrollment.user_id == user_id
         ).options(
-            joinedload(Enrollment.course).joinedload(Course.sections),
+            joinedload(Enrollment.course).selectinload(Course.sections),
             joinedload(Enrollment.progress)
         ).order_by(Enrollment.enrolled_at.desc())
         
@@ -0,0 +1,75 @@
+"""
+Per-worker snapshots of small, rarely written, frequently read row sets.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Iterable, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+# Session.info key for the caches a transaction has written to
+_PENDING_INVALIDATIONS = "snapshot_caches_to_invalidate"
+
+
+class SnapshotCache:
+    """
+    Read-only tuple of rows, reloaded every ``ttl`` seconds or after a write.
+
+    Writes to the watched models invalidate the snapshot when their session
+    commits, so a reload cannot pick up rows the writer may still roll back.
+    Other workers pick the change up within the TTL.
+    """
+
+    def __init__(self, ttl: float, *models: Any):
+        """
+        Args:
+            ttl: Seconds a loaded snapshot is served for
+            models: Mapped classes whose committed writes invalidate the snapshot
+        """
+        self.ttl = ttl
+        self._rows: Tuple[Any, ...] = ()
+        self._expires_at = 0.0
+        self._generation = 0  # bumped on every invalidation so in-flight reloads are discarded
+        self._lock = threading.Lock()
+        for model in models:
+            for event_name in ("after_insert", "after_update", "after_delete"):
+                event.listen(model, event_name, self._mark_pending)
+
+    def get(self, load: Callable[[], Iterable[Any]]) -> Tuple[Any, ...]:
+        """Return the snapshot, calling ``load`` for fresh rows if it has expired."""
+        rows = self._rows
+        if time.time() >= self._expires_at:
+            generation = self._generation
+            rows = tuple(load())
+            with self._lock:
+                if generation == self._generation:
+                    self._rows = rows
+                    self._expires_at = time.time() + self.ttl
+        return rows
+
+    def invalidate(self):
+        """Drop the snapshot; the next read reloads it."""
+        with self._lock:
+            self._expires_at = 0.0
+            self._generation += 1
+
+    def _mark_pending(self, mapper, connection, target):
+        """Invalidate once the session that wrote ``target`` commits."""
+        session = object_session(target)
+        if session is None:
+            self.invalidate()
+        else:
+            session.info.setdefault(_PENDING_INVALIDATIONS, set()).add(self)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    for cache in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session):
+    session.info.pop(_PENDING_INVALIDATIONS, None)
@@ -7,7 +7,7 @@ from decimal import Decimal
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.models.course import Course, CourseCategory, CourseStatus, DifficultyLevel, Section, Lecture
+from app.models.course import Course, CourseCategory, CourseStatus, DifficultyLevel, Section, Lecture, media_key, media_url
 from app.models.user import User, UserRole
 from faker import Faker
 
@@ -384,4 +384,19 @@ class TestLectureModel:
         assert lecture.section is not None
         assert lecture.section.id == section.id
         assert len(section.lectures) == 1
-        assert section.lectures[0].id == lecture.id
\ No newline at end of file
+        assert section.lectures[0].id == lecture.id
+
+
+class TestMediaKeys:
+    """Test cases for media URL storage keys."""
+    
+    def test_local_urls_round_trip_through_keys(self):
+        """Test that URLs under MEDIA_BASE_URL are stored without the prefix."""
+        assert media_key("/uploads/images/cover.png") == "images/cover.png"
+        assert media_url("images/cover.png") == "/uploads/images/cover.png"
+    
+    def test_other_urls_are_stored_verbatim(self):
+        """Test that external and other local URLs are kept as given."""
+        for url in ("https://cdn.example.com/video.mp4", "/static/logo.png", None, ""):
+            assert media_key(url) == url
+            assert media_url(media_key(url)) == url
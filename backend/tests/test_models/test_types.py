@@ -0,0 +1,41 @@
+"""
+Unit tests for custom model column types.
+"""
+import pytest
+from sqlalchemy import Column, MetaData, Table, select
+
+from app.models.course import CourseStatus
+from app.models.types import IntEnumType
+
+
+class TestIntEnumType:
+    """Test cases for IntEnumType."""
+    
+    def test_binds_members_values_and_names_as_codes(self):
+        """Test that members, values and names all bind to the member's position."""
+        column_type = IntEnumType(CourseStatus)
+        
+        assert column_type.process_bind_param(CourseStatus.DRAFT, None) == 0
+        assert column_type.process_bind_param("published", None) == 1
+        assert column_type.process_bind_param("ARCHIVED", None) == 2
+        assert column_type.process_bind_param(None, None) is None
+    
+    def test_loads_codes_as_members(self):
+        """Test that stored codes load back as enum members."""
+        column_type = IntEnumType(CourseStatus)
+        
+        assert column_type.process_result_value(1, None) is CourseStatus.PUBLISHED
+        assert column_type.process_result_value(None, None) is None
+    
+    def test_rejects_unknown_values(self):
+        """Test that values outside the enum are rejected."""
+        with pytest.raises(LookupError):
+            IntEnumType(CourseStatus).process_bind_param("deleted", None)
+    
+    def test_filters_compile_to_integer_compare(self):
+        """Test that enum filters compile to a cacheable integer comparison."""
+        table = Table("t", MetaData(), Column("status", IntEnumType(CourseStatus)))
+        stmt = select(table).where(table.c.status == CourseStatus.PUBLISHED)
+        
+        assert "status = 1" in str(stmt.compile(compile_kwargs={"literal_binds": True}))
+        assert stmt._generate_cache_key() is not None
@@ -256,6 +256,25 @@ class TestUserModel:
         if hasattr(user, 'full_name'):
             assert user.full_name == "John Doe"
     
+    def test_user_full_name_in_query(self, db_session: Session):
+        """Test that full name can be filtered and sorted on in SQL."""
+        for first_name, last_name in [("Zoe", "Adams"), ("Amy", "Young")]:
+            db_session.add(User(
+                email=fake.email(),
+                username=fake.user_name(),
+                first_name=first_name,
+                last_name=last_name,
+                hashed_password=fake.password()
+            ))
+        db_session.commit()
+        
+        names = [
+            name for (name,) in db_session.query(User.full_name)
+            .filter(User.full_name.in_(["Zoe Adams", "Amy Young"]))
+            .order_by(User.full_name)
+        ]
+        assert names == ["Amy Young", "Zoe Adams"]
+    
     def test_user_is_instructor_property(self, db_session: Session):
         """Test user role checking properties if they exist."""
         instructor = User(
@@ -0,0 +1,312 @@
+"""
+Tests for monitoring middleware functionality.
+"""
+
+import asyncio
+import re
+import time
+import pytest
+from unittest.mock import patch, MagicMock
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.middleware import monitoring_middleware
+from app.middleware.monitoring_middleware import (
+    ObservabilityMiddleware,
+    flush_performance_metrics
+)
+
+
+def _make_app():
+    """Build a minimal app wrapped in the observability middleware."""
+    test_app = FastAPI()
+    test_app.add_middleware(ObservabilityMiddleware)
+    
+    @test_app.get("/ok")
+    async def ok_endpoint():
+        return {"message": "ok"}
+    
+    @test_app.get("/whoami")
+    async def whoami_endpoint(request: Request):
+        return {"user_id": getattr(request.state, "user_id", None)}
+    
+    @test_app.get("/items/{item_id}")
+    async def item_endpoint(item_id: int):
+        from fastapi import HTTPException
+        raise HTTPException(status_code=404, detail="Item not found")
+    
+    @test_app.get("/missing")
+    async def missing_endpoint():
+        from fastapi import HTTPException
+        raise HTTPException(status_code=404, detail="Not found")
+    
+    return test_app
+
+
+class TestRequestTracking:
+    """Test request timing and user tracking."""
+    
+    @patch.object(ObservabilityMiddleware, '_track_performance')
+    def test_adds_response_time_header(self, mock_track):
+        """Test that the response time header is added and the request is tracked."""
+        client = TestClient(_make_app())
+        
+        response = client.get("/ok")
+        
+        assert response.status_code == 200
+        assert re.fullmatch(r"\d+\.\d{3}ms", response.headers["x-response-time"])
+        method, path, _, status_code, user_id = mock_track.call_args[0]
+        assert (method, path, status_code, user_id) == ("GET", "/ok", 200, None)
+    
+    @patch('app.middleware.monitoring_middleware.extract_user_id_from_token', return_value=42)
+    @patch.object(ObservabilityMiddleware, '_track_performance')
+    def test_extracts_user_id_from_bearer_token(self, mock_track, mock_extract):
+        """Test that the user ID is read from the Authorization header."""
+        client = TestClient(_make_app())
+        
+        client.get("/ok", headers={"Authorization": "Bearer abc.def.ghi"})
+        
+        mock_extract.assert_called_once_with("abc.def.ghi")
+        assert mock_track.call_args[0][4] == 42
+    
+    @patch('app.middleware.monitoring_middleware.extract_user_id_from_token', return_value=42)
+    @patch.object(ObservabilityMiddleware, '_track_performance')
+    def test_shares_user_id_on_request_state(self, mock_track, mock_extract):
+        """Test that the decoded user ID is available to the endpoint."""
+        client = TestClient(_make_app())
+        
+        response = client.get("/whoami", headers={"Authorization": "Bearer abc.def.ghi"})
+        
+        assert response.json() == {"user_id": 42}
+    
+    @patch.object(ObservabilityMiddleware, '_track_performance')
+    def test_invalid_token_is_not_shared(self, mock_track):
+        """Test that an invalid token leaves the user ID unset."""
+        client = TestClient(_make_app())
+        
+        response = client.get("/whoami", headers={"Authorization": "Bearer not-a-jwt"})
+        
+        assert response.json() == {"user_id": None}
+        assert mock_track.call_args[0][4] is None
+    
+    @patch('app.middleware.monitoring_middleware._flush_performance_rows')
+    def test_metrics_are_buffered_and_flushed(self, mock_flush):
+        """Test that request metrics are queued and flushed in one batch."""
+        queue = monitoring_middleware._metrics_queue
+        while not queue.empty():
+            queue.get_nowait()
+        client = TestClient(_make_app())
+        
+        client.get("/ok")
+        client.get("/missing")
+        
+        async def flush_once():
+            task = asyncio.create_task(flush_performance_metrics())
+            await asyncio.sleep(0)
+            monitoring_middleware._metrics_flush_requested.set()
+            for _ in range(5):
+                await asyncio.sleep(0)
+            assert mock_flush.call_count == 1
+            task.cancel()
+        
+        asyncio.run(flush_once())
+        
+        rows = mock_flush.call_args[0][0]
+        assert [(row[1], row[3]) for row in rows] == [("/ok", 200), ("/missing", 404)]
+    
+    @patch('app.middleware.monitoring_middleware._flush_performance_rows')
+    def test_pending_metrics_flushed_on_shutdown(self, mock_flush):
+        """Test that metrics still queued when the flusher is cancelled are written."""
+        queue = monitoring_middleware._metrics_queue
+        while not queue.empty():
+            queue.get_nowait()
+        
+        async def run_then_cancel():
+            task = asyncio.create_task(flush_performance_metrics())
+            await asyncio.sleep(0)
+            queue.put_nowait(("GET", "/ok", 0.01, 200, None))
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        
+        asyncio.run(run_then_cancel())
+        
+        mock_flush.assert_called_once_with([("GET", "/ok", 0.01, 200, None)])
+
+
+    def test_background_jobs_handed_to_the_lifespan(self):
+        """Test that the periodic jobs are exposed to the app lifespan, not started per request."""
+        test_app = _make_app()
+        
+        with TestClient(test_app) as client:
+            client.get("/ok")
+            observability = test_app.state.observability
+        
+        assert isinstance(observability, ObservabilityMiddleware)
+        jobs = observability.background_jobs()
+        assert len(jobs) == 2
+        for job in jobs:
+            job.close()
+
+
+class TestHealthCheck:
+    """Test the /health short-circuit."""
+    
+    @patch('app.middleware.monitoring_middleware.cache_service')
+    @patch('app.middleware.monitoring_middleware.SessionLocal')
+    @patch('app.middleware.monitoring_middleware.get_monitoring_service')
+    def test_health_check_short_circuits(self, mock_service, mock_session, mock_cache):
+        """Test that /health is answered by the middleware."""
+        mock_cache.get.return_value = None
+        mock_service.return_value.get_health_status.return_value = {'status': 'healthy'}
+        client = TestClient(_make_app())
+        
+        response = client.get("/health")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == {'status': 'healthy', 'ready': True}
+    
+    @patch('app.middleware.monitoring_middleware.cache_service')
+    @patch('app.middleware.monitoring_middleware.SessionLocal')
+    @patch('app.middleware.monitoring_middleware.get_monitoring_service')
+    def test_critical_health_returns_503(self, mock_service, mock_session, mock_cache):
+        """Test that a critical health status is reported as unavailable."""
+        mock_cache.get.return_value = None
+        mock_service.return_value.get_health_status.return_value = {'status': 'critical'}
+        client = TestClient(_make_app())
+        
+        response = client.get("/health")
+        
+        assert response.status_code == 503
+    
+    @patch('app.middleware.monitoring_middleware.cache_service')
+    @patch('app.middleware.monitoring_middleware.get_monitoring_service')
+    def test_fresh_health_status_skips_recompute(self, mock_service, mock_cache):
+        """Test that a fresh cached health status is served without recomputing."""
+        mock_cache.get.return_value = (time.time(), {'status': 'warning'})
+        client = TestClient(_make_app())
+        
+        response = client.get("/health")
+        
+        assert response.status_code == 200
+        assert response.json() == {'status': 'warning', 'ready': True}
+        mock_service.assert_not_called()
+    
+    @patch('app.middleware.monitoring_middleware.cache_service')
+    @patch('app.middleware.monitoring_middleware.SessionLocal')
+    @patch('app.middleware.monitoring_middleware.get_monitoring_service')
+    def test_stale_health_status_served_while_refreshing(self, mock_service, mock_session, mock_cache):
+        """Test that a stale health status is returned and refreshed in the background."""
+        mock_cache.get.return_value = (time.time() - 5, {'status': 'healthy'})
+        mock_service.return_value.get_health_status.return_value = {'status': 'critical'}
+        client = TestClient(_make_app())
+        
+        response = client.get("/health")
+        
+        assert response.status_code == 200
+        assert response.json() == {'status': 'healthy', 'ready': True}
+    
+    def test_other_paths_pass_through(self):
+        """Test that non-health requests reach the application."""
+        client = TestClient(_make_app())
+        
+        response = client.get("/ok")
+        
+        assert response.status_code == 200
+        assert response.json() == {"message": "ok"}
+
+
+class TestReadinessGate:
+    """Test request gating while the app is warming up."""
+    
+    def test_requests_rejected_until_ready(self):
+        """Test that non-health paths get 503 before the app is ready."""
+        test_app = _make_app()
+        test_app.state.ready = False
+        client = TestClient(test_app)
+        
+        response = client.get("/ok")
+        
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "1"
+        assert response.json()["error"]["code"] == "SERVICE_STARTING"
+        
+        test_app.state.ready = True
+        assert client.get("/ok").status_code == 200
+    
+    def test_health_reports_not_ready(self):
+        """Test that /health answers immediately during warm-up."""
+        test_app = _make_app()
+        test_app.state.ready = False
+        client = TestClient(test_app)
+        
+        response = client.get("/health")
+        
+        assert response.status_code == 200
+        assert response.json() == {'status': 'starting', 'ready': False}
+    
+    def test_health_reports_startup_failure(self):
+        """Test that /health reports a failed warm-up as unhealthy."""
+        test_app = _make_app()
+        test_app.state.ready = False
+        test_app.state.startup_error = "Failed to create database tables"
+        client = TestClient(test_app)
+        
+        response = client.get("/health")
+        
+        assert response.status_code == 503
+        assert response.json() == {
+            'status': 'unhealthy', 'ready': False, 'error': "Failed to create database tables"
+        }
+
+
+class TestAlerting:
+    """Test error tracking for alerts."""
+    
+    @patch.object(ObservabilityMiddleware, '_track_error_for_alerting')
+    def test_tracks_error_responses(self, mock_track):
+        """Test that 4xx/5xx responses are tracked for alerting."""
+        client = TestClient(_make_app())
+        
+        client.get("/ok")
+        mock_track.assert_not_called()
+        
+        client.get("/missing")
+        mock_track.assert_called_once_with("/missing", 404)
+    
+    @patch.object(ObservabilityMiddleware, '_track_error_for_alerting')
+    def test_errors_keyed_by_route_template(self, mock_track):
+        """Test that errors are grouped by route and unknown URLs share one key."""
+        client = TestClient(_make_app())
+        
+        client.get("/items/1")
+        client.get("/no/such/page")
+        
+        assert mock_track.call_args_list[0][0] == ("/items/{item_id}", 404)
+        assert mock_track.call_args_list[1][0] == ("<unmatched>", 404)
+    
+    def test_error_window_expires_old_entries(self):
+        """Test that errors older than an hour leave the sliding window."""
+        middleware = ObservabilityMiddleware(MagicMock())
+        
+        with patch('app.middleware.monitoring_middleware.time.time', return_value=1000.0):
+            middleware._track_error_for_alerting("/api/courses", 500)
+            middleware._track_error_for_alerting("/api/courses", 404)
+        with patch('app.middleware.monitoring_middleware.time.time', return_value=4700.0):
+            middleware._track_error_for_alerting("/api/courses", 503)
+        
+        assert list(middleware.error_counts["/api/courses"]) == [(4700.0, 503)]
+        assert middleware.server_error_counts["/api/courses"] == 1
+    
+    @patch('app.middleware.monitoring_middleware.cache_service')
+    def test_alerts_kept_in_bounded_ring(self, mock_cache):
+        """Test that alerts go to a fixed-size ring published under one key."""
+        middleware = ObservabilityMiddleware(MagicMock())
+        
+        for i in range(monitoring_middleware.RECENT_ALERTS_SIZE + 10):
+            middleware._send_alert(f"Alert {i}", "message")
+        
+        assert len(middleware.recent_alerts) == monitoring_middleware.RECENT_ALERTS_SIZE
+        assert middleware.recent_alerts[0]['title'] == "Alert 10"
+        assert {call[0][0] for call in mock_cache.set.call_args_list} == {"recent_alerts"}
@@ -0,0 +1,83 @@
+"""
+Unit tests for the in-memory BufferedWriter.
+"""
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+from app.utils.buffered_writer import BufferedWriter
+
+
+def _writer(write_batch=None, batch_size=10):
+    """Build a writer over a mock engine."""
+    return BufferedWriter("rows", write_batch or MagicMock(), MagicMock(), interval=0.01, batch_size=batch_size)
+
+
+class TestBufferedWriter:
+    """Test cases for BufferedWriter."""
+
+    def test_keyed_rows_keep_latest(self):
+        """Test that rows added under one key collapse into the latest one."""
+        writer = _writer()
+        writer.add({"n": 1}, key="a")
+        writer.add({"n": 2}, key="b")
+        writer.add({"n": 3}, key="a")
+
+        assert writer.take() == [{"n": 3}, {"n": 2}]
+        assert writer.take() == []
+
+    def test_unkeyed_rows_all_kept_in_order(self):
+        """Test that rows without a key are never merged."""
+        writer = _writer()
+        writer.add({"n": 1})
+        writer.add({"n": 1})
+
+        assert writer.take() == [{"n": 1}, {"n": 1}]
+
+    def test_pop_claims_single_row(self):
+        """Test that a pending row can be removed by key."""
+        writer = _writer()
+        writer.add({"n": 1}, key="a")
+        writer.add({"n": 2}, key="b")
+
+        assert writer.pop("a") == {"n": 1}
+        assert writer.pop("a") is None
+        assert writer.take() == [{"n": 2}]
+
+    def test_flush_splits_into_batches(self):
+        """Test that each batch is written in its own transaction."""
+        write_batch = MagicMock()
+        writer = _writer(write_batch, batch_size=2)
+
+        writer.flush([{"n": n} for n in range(5)])
+
+        assert [len(call.args[1]) for call in write_batch.call_args_list] == [2, 2, 1]
+        assert writer.engine.begin.call_count == 3
+
+    def test_failed_batch_does_not_stop_the_flush(self):
+        """Test that a failing batch is logged and later batches still run."""
+        write_batch = MagicMock(side_effect=[RuntimeError("down"), None])
+        writer = _writer(write_batch, batch_size=1)
+
+        writer.flush([{"n": 1}, {"n": 2}])
+
+        assert write_batch.call_count == 2
+
+    def test_run_flushes_pending_rows_when_cancelled(self):
+        """Test that rows still buffered at shutdown are written."""
+        write_batch = MagicMock()
+        writer = _writer(write_batch)
+        writer.interval = 60
+
+        async def run_then_cancel():
+            task = asyncio.create_task(writer.run())
+            await asyncio.sleep(0)
+            writer.add({"n": 1})
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run_then_cancel())
+
+        write_batch.assert_called_once()
+        assert write_batch.call_args.args[1] == [{"n": 1}]
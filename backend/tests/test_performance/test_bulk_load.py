@@ -0,0 +1,60 @@
+"""
+Tests for bulk loading utilities.
+"""
+
+import pytest
+from sqlalchemy import create_engine, Column, Integer, MetaData, String, Table, func, select
+
+from app.utils.bulk_load import iter_batches, bulk_insert, bulk_load
+
+
+@pytest.fixture
+def events_table():
+    """Create an in-memory table for bulk loading."""
+    engine = create_engine("sqlite://")
+    metadata = MetaData()
+    table = Table(
+        "events", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("name", String(50), nullable=False),
+    )
+    metadata.create_all(engine)
+    yield engine, table
+    engine.dispose()
+
+
+class TestBulkLoad:
+    """Test bulk loading helpers."""
+
+    def test_iter_batches_splits_rows(self):
+        """Test rows are split into fixed-size batches."""
+        batches = list(iter_batches(({"n": i} for i in range(25)), batch_size=10))
+        assert [len(batch) for batch in batches] == [10, 10, 5]
+
+    def test_iter_batches_rejects_invalid_size(self):
+        """Test non-positive batch sizes are rejected."""
+        with pytest.raises(ValueError):
+            list(iter_batches([], batch_size=0))
+
+    def test_bulk_load_inserts_all_rows(self, events_table):
+        """Test bulk_load inserts every row across batches."""
+        engine, table = events_table
+        rows = [{"name": f"event-{i}"} for i in range(2500)]
+
+        inserted = bulk_load(engine, table, rows, batch_size=1000)
+
+        assert inserted == 2500
+        with engine.connect() as conn:
+            assert conn.execute(select(func.count()).select_from(table)).scalar() == 2500
+
+    def test_bulk_insert_uses_callers_transaction(self, events_table):
+        """Test bulk_insert leaves transaction control to the caller."""
+        engine, table = events_table
+
+        with engine.connect() as conn:
+            trans = conn.begin()
+            bulk_insert(conn, table, [{"name": "a"}, {"name": "b"}])
+            trans.rollback()
+
+        with engine.connect() as conn:
+            assert conn.execute(select(func.count()).select_from(table)).scalar() == 0
@@ -0,0 +1,140 @@
+"""
+Unit tests for buffered lecture progress heartbeats.
+"""
+import pytest
+from unittest.mock import MagicMock
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.dialects import mysql
+
+from app.database import Base
+from app.models.course import Course, Lecture, Section
+from app.models.enrollment import CourseProgress, Enrollment, LectureProgress
+from app.services.enrollment_service import buffer_lecture_heartbeat, heartbeat_writer
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer():
+    """Start and finish every test with no pending heartbeats."""
+    heartbeat_writer.take()
+    yield
+    heartbeat_writer.take()
+
+
+class TestHeartbeatBuffer:
+    """Test cases for buffering heartbeats."""
+
+    def test_keeps_latest_heartbeat_per_lecture(self):
+        """Test that repeated heartbeats for one lecture collapse into one row."""
+        buffer_lecture_heartbeat(1, 10, watch_time=5, last_position=5)
+        buffer_lecture_heartbeat(1, 10, watch_time=9, last_position=8)
+        buffer_lecture_heartbeat(2, 10, watch_time=3, last_position=3)
+
+        rows = sorted(heartbeat_writer.take(), key=lambda row: row["user_id"])
+
+        assert rows == [
+            {"user_id": 1, "lecture_id": 10, "watch_time": 9, "last_position": 8},
+            {"user_id": 2, "lecture_id": 10, "watch_time": 3, "last_position": 3},
+        ]
+
+    def test_pending_heartbeat_claimed_by_lecture(self):
+        """Test that a synchronous update can claim its pending heartbeat."""
+        buffer_lecture_heartbeat(1, 10, watch_time=5, last_position=5)
+
+        assert heartbeat_writer.pop((1, 10))["watch_time"] == 5
+        assert heartbeat_writer.take() == []
+
+
+class TestLectureProgressBulkUpsert:
+    """Test cases for LectureProgress.bulk_upsert."""
+
+    def test_emits_single_multi_row_upsert(self):
+        """Test that a batch becomes one INSERT ... ON DUPLICATE KEY UPDATE."""
+        conn = MagicMock()
+        conn.dialect.name = "mysql"
+        rows = [
+            {"user_id": 1, "lecture_id": 10, "watch_time": 9, "last_position": 8},
+            {"user_id": 2, "lecture_id": 10, "watch_time": 3, "last_position": 3},
+        ]
+
+        LectureProgress.bulk_upsert(conn, rows)
+
+        conn.execute.assert_called_once()
+        sql = str(conn.execute.call_args.args[0].compile(dialect=mysql.dialect()))
+        assert sql.count("INSERT INTO lecture_progress") == 1
+        assert "ON DUPLICATE KEY UPDATE" in sql
+        assert "watch_time = VALUES(watch_time)" in sql
+        assert "last_position = VALUES(last_position)" in sql
+        assert "last_accessed = now()" in sql
+
+    def test_empty_batch_is_noop(self):
+        """Test that an empty batch does not touch the connection."""
+        conn = MagicMock()
+
+        LectureProgress.bulk_upsert(conn, [])
+
+        conn.execute.assert_not_called()
+
+
+class TestHeartbeatFlush:
+    """Test cases for flushing heartbeats into a real database."""
+
+    @pytest.fixture
+    def engine(self, monkeypatch):
+        """Create an in-memory database with one enrolled user watching two lectures."""
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine, tables=[
+            Course.__table__, Section.__table__, Lecture.__table__, Enrollment.__table__,
+            CourseProgress.__table__, LectureProgress.__table__
+        ])
+        with engine.begin() as conn:
+            conn.execute(insert(Section.__table__), [{"id": 1, "title": "Intro", "course_id": 7}])
+            conn.execute(insert(Lecture.__table__), [
+                {"id": 10, "title": "One", "section_id": 1},
+                {"id": 11, "title": "Two", "section_id": 1},
+            ])
+            conn.execute(insert(Enrollment.__table__), [{"user_id": 1, "course_id": 7}])
+            conn.execute(insert(CourseProgress.__table__), [{"user_id": 1, "course_id": 7}])
+            conn.execute(insert(LectureProgress.__table__), [
+                {"user_id": 1, "lecture_id": 10, "watch_time": 60, "last_position": 60},
+                {"user_id": 1, "lecture_id": 11, "watch_time": 0, "last_position": 0},
+            ])
+        monkeypatch.setattr(heartbeat_writer, "engine", engine)
+        yield engine
+        engine.dispose()
+
+    def test_flush_updates_lecture_and_course_progress(self, engine):
+        """Test that a flush upserts positions and refreshes course watch time and last access."""
+        buffer_lecture_heartbeat(1, 11, watch_time=130, last_position=125)
+
+        heartbeat_writer.flush(heartbeat_writer.take())
+
+        with engine.connect() as conn:
+            lecture = conn.execute(
+                select(LectureProgress.watch_time, LectureProgress.last_position)
+                .where(LectureProgress.lecture_id == 11)
+            ).one()
+            total_watch_time = conn.scalar(select(CourseProgress.total_watch_time))
+            last_accessed = conn.scalar(select(Enrollment.last_accessed))
+
+        assert tuple(lecture) == (130, 125)
+        assert total_watch_time == 3  # (60 + 130) seconds in whole minutes
+        assert last_accessed is not None
+
+    def test_upsert_without_native_support(self, engine, monkeypatch):
+        """Test that dialects without an upsert update existing rows and insert the rest."""
+        monkeypatch.setattr(engine.dialect, "name", "generic")
+
+        with engine.begin() as conn:
+            LectureProgress.bulk_upsert(conn, [
+                {"user_id": 1, "lecture_id": 11, "watch_time": 40, "last_position": 35},
+                {"user_id": 2, "lecture_id": 10, "watch_time": 5, "last_position": 5},
+            ])
+
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(
+                    LectureProgress.user_id, LectureProgress.lecture_id,
+                    LectureProgress.watch_time, LectureProgress.last_position
+                ).order_by(LectureProgress.user_id, LectureProgress.lecture_id)
+            ).all()
+        assert [tuple(row) for row in rows] == [(1, 10, 60, 60), (1, 11, 40, 35), (2, 10, 5, 5)]
@@ -0,0 +1,122 @@
+"""
+Query-count tests for list helpers that guard against N+1 loading.
+"""
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.legal import DocumentType, LegalDocument
+from app.models.transaction import Transaction, TransactionStatus, PaymentMethod
+from app.models.user import User, UserRole
+from app.services.legal_service import LegalService
+from app.services.role_service import RoleService
+from app.services.transaction_service import TransactionService
+
+
+@contextmanager
+def count_queries(engine):
+    """Collect every SQL statement the engine executes inside the block."""
+    queries = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        queries.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def session():
+    """Create an in-memory database holding a few users, transactions and documents."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        User.__table__, Transaction.__table__, LegalDocument.__table__
+    ])
+    db = sessionmaker(bind=engine)()
+
+    for i in range(3):
+        user = User(
+            email=f"user{i}@example.com",
+            username=f"user{i}",
+            first_name="Test",
+            last_name=f"User{i}",
+            hashed_password="x",
+            role=UserRole.LEARNER
+        )
+        db.add(user)
+        db.flush()
+        db.add(Transaction(
+            transaction_id=f"txn_{i}",
+            user_id=user.id,
+            amount=10,
+            payment_method=PaymentMethod.STRIPE,
+            status=TransactionStatus.COMPLETED
+        ))
+        db.add(LegalDocument(
+            document_type=DocumentType.TERMS_OF_SERVICE,
+            title=f"Terms {i}",
+            slug=f"terms-{i}",
+            content="Terms",
+            version=f"1.{i}",
+            is_current=True,
+            effective_date=datetime(2024, 1, 1),
+            is_published=True,
+            created_by=user.id
+        ))
+    db.commit()
+    db.expunge_all()
+
+    yield engine, db
+
+    db.close()
+    engine.dispose()
+
+
+class TestListQueryCounts:
+    """List helpers issue a constant number of queries regardless of row count."""
+
+    def test_list_transactions(self, session):
+        """Test listing transactions runs only the count and page queries."""
+        engine, db = session
+        with count_queries(engine) as queries:
+            transactions, total = TransactionService.list_transactions(db)
+            rows = [(t.transaction_id, t.net_amount) for t in transactions]
+
+        assert total == 3 and len(rows) == 3
+        assert len(queries) <= 2
+
+    def test_list_transactions_rejects_lazy_relationship(self, session):
+        """Test undeclared relationship access raises instead of issuing a query."""
+        _, db = session
+        transactions, _ = TransactionService.list_transactions(db)
+
+        with pytest.raises(InvalidRequestError):
+            transactions[0].user
+
+    def test_get_users_by_role(self, session):
+        """Test listing users by role runs a single query."""
+        engine, db = session
+        with count_queries(engine) as queries:
+            users = RoleService(db).get_users_by_role(UserRole.LEARNER)
+            names = [user.full_name for user in users]
+
+        assert len(names) == 3
+        assert len(queries) <= 2
+
+    def test_get_documents(self, session):
+        """Test listing legal documents runs a single query."""
+        engine, db = session
+        with count_queries(engine) as queries:
+            documents = LegalService(db).get_documents()
+            titles = [document.title for document in documents]
+
+        assert len(titles) == 3
+        assert len(queries) <= 2
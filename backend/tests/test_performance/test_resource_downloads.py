@@ -0,0 +1,37 @@
+"""
+Unit tests for buffered resource download records.
+"""
+import pytest
+from sqlalchemy import create_engine, select
+
+from app.models.resource import ResourceDownload
+from app.services.resource_service import download_writer, enqueue_download
+
+
+@pytest.fixture
+def download_engine(monkeypatch):
+    """Point the download writer at an in-memory database with nothing pending."""
+    engine = create_engine("sqlite://")
+    ResourceDownload.__table__.create(engine)
+    monkeypatch.setattr(download_writer, "engine", engine)
+    monkeypatch.setattr(download_writer, "batch_size", 2)
+    download_writer.take()
+    yield engine
+    download_writer.take()
+    engine.dispose()
+
+
+class TestDownloadBuffer:
+    """Test cases for buffered download records."""
+
+    def test_every_download_is_inserted(self, download_engine):
+        """Test that repeated downloads are all written, with server timestamps."""
+        for user_id in (0, 1, 1, 2, 3):
+            enqueue_download(user_id, 10, ip_address=f"10.0.0.{user_id}")
+
+        download_writer.flush(download_writer.take())
+
+        with download_engine.connect() as conn:
+            rows = conn.execute(select(ResourceDownload.user_id, ResourceDownload.downloaded_at)).all()
+        assert sorted(user_id for user_id, _ in rows) == [0, 1, 1, 2, 3]
+        assert all(downloaded_at is not None for _, downloaded_at in rows)
@@ -0,0 +1,92 @@
+"""
+Tests for role-based permission checks.
+"""
+
+import pytest
+from types import SimpleNamespace
+
+from app.models.user import User, UserRole
+from app.permissions import (
+    Permission,
+    PermissionChecker,
+    ROLE_PERMISSIONS,
+    permission_mask
+)
+
+
+class TestPermissionChecker:
+    """Test bitmask-based permission checks against the role mapping."""
+    
+    @pytest.mark.parametrize("role", list(UserRole))
+    def test_has_permission_matches_role_mapping(self, role):
+        """Test that every permission check agrees with ROLE_PERMISSIONS."""
+        for permission in Permission:
+            expected = permission in ROLE_PERMISSIONS.get(role, set())
+            assert PermissionChecker.has_permission(role, permission) is expected
+    
+    def test_can_access_resource_needs_any_permission(self):
+        """Test that one matching permission is enough."""
+        permissions = [Permission.MANAGE_SETTINGS, Permission.TAKE_QUIZ]
+        
+        assert PermissionChecker.can_access_resource(UserRole.LEARNER, permissions)
+        assert not PermissionChecker.can_access_resource(
+            UserRole.LEARNER, [Permission.MANAGE_SETTINGS]
+        )
+        assert not PermissionChecker.can_access_resource(UserRole.LEARNER, [])
+    
+    def test_requires_all_permissions(self):
+        """Test that every permission must be held."""
+        permissions = [Permission.CREATE_COURSE, Permission.UPLOAD_CONTENT]
+        
+        assert PermissionChecker.requires_all_permissions(UserRole.INSTRUCTOR, permissions)
+        assert not PermissionChecker.requires_all_permissions(UserRole.LEARNER, permissions)
+        assert PermissionChecker.requires_all_permissions(UserRole.LEARNER, [])
+    
+    def test_precomputed_mask_checks(self):
+        """Test checks against a mask built once up front."""
+        mask = permission_mask([Permission.VIEW_ANALYTICS, Permission.EXPORT_ANALYTICS])
+        
+        assert PermissionChecker.has_all_of_mask(UserRole.SUPER_ADMIN, mask)
+        assert not PermissionChecker.has_any_of_mask(UserRole.INSTRUCTOR, mask)
+    
+    @pytest.mark.parametrize("permissions", [
+        [Permission.TAKE_QUIZ],
+        [Permission.CREATE_COURSE, Permission.UPLOAD_CONTENT],
+        [Permission.VIEW_ANALYTICS, Permission.MANAGE_SETTINGS],
+    ])
+    def test_roles_resolved_from_mask(self, permissions):
+        """Test that mask-to-role resolution agrees with the per-role checks."""
+        mask = permission_mask(permissions)
+        
+        any_roles = PermissionChecker.roles_with_any_of_mask(mask)
+        all_roles = PermissionChecker.roles_with_all_of_mask(mask)
+        
+        for role in UserRole:
+            assert (role in any_roles) is PermissionChecker.can_access_resource(role, permissions)
+            assert (role in all_roles) is PermissionChecker.requires_all_permissions(role, permissions)
+
+
+def _user(role):
+    """Stand-in carrying only the role ``User.has_permission`` reads."""
+    return SimpleNamespace(role=role)
+
+
+class TestUserHasPermission:
+    """Test the permission check on the user model."""
+    
+    def test_super_admin_holds_every_permission(self):
+        """Test that the super admin shortcut agrees with the role mapping."""
+        assert ROLE_PERMISSIONS[UserRole.SUPER_ADMIN] == set(Permission)
+    
+    @pytest.mark.parametrize("role", list(UserRole))
+    def test_enum_and_string_permissions_agree(self, role):
+        """Test that string permissions resolve the same as their enum members."""
+        user = _user(role)
+        for permission in Permission:
+            expected = permission in ROLE_PERMISSIONS[role]
+            assert User.has_permission(user, permission) is expected
+            assert User.has_permission(user, permission.value) is expected
+    
+    def test_unknown_string_permission_is_denied(self):
+        """Test that an unknown permission string is never granted."""
+        assert not User.has_permission(_user(UserRole.SUPER_ADMIN), "not_a_permission")
@@ -2,16 +2,17 @@
 Tests for security middleware functionality.
 """
 
+import json
 import pytest
 import time
+from datetime import datetime
 from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 
 from app.main import app
 from app.middleware.security_middleware import (
-    RateLimitMiddleware,
-    InputValidationMiddleware,
-    SecurityHeadersMiddleware
+    SecurityMiddleware,
+    get_client_ip
 )
 
 
@@ -34,7 +35,7 @@ class TestRateLimitMiddleware:
         from starlette.middleware.base import BaseHTTPMiddleware
         
         test_app = FastAPI()
-        test_app.add_middleware(RateLimitMiddleware, calls=2, period=1)
+        test_app.add_middleware(SecurityMiddleware, calls=2, period=1)
         
         @test_app.get("/test")
         async def test_endpoint():
@@ -52,6 +53,88 @@ class TestRateLimitMiddleware:
         response3 = client.get("/test")
         assert response3.status_code == 429
         assert "rate limit exceeded" in response3.json()["error"]["message"].lower()
+    
+    def test_rate_limit_replenishes_over_time(self):
+        """Test that allowance is regained one emission interval at a time."""
+        from fastapi import FastAPI
+        
+        test_app = FastAPI()
+        test_app.add_middleware(SecurityMiddleware, calls=2, period=60)
+        
+        @test_app.get("/test")
+        async def test_endpoint():
+            return {"message": "test"}
+        
+        client = TestClient(test_app)
+        second = 1_000_000_000
+        
+        with patch('app.middleware.security_middleware.time.monotonic_ns', return_value=120 * second):
+            assert client.get("/test").status_code == 200
+            assert client.get("/test").status_code == 200
+            response = client.get("/test")
+            assert response.status_code == 429
+            assert response.json()["error"]["retry_after"] == 30
+        
+        # One emission interval (period / calls) later, exactly one call is allowed
+        with patch('app.middleware.security_middleware.time.monotonic_ns', return_value=150 * second):
+            assert client.get("/test").status_code == 200
+            assert client.get("/test").status_code == 429
+    
+    def test_rate_limit_evicts_least_recent_ip(self):
+        """Test that tracked client IPs are capped with LRU eviction."""
+        from fastapi import FastAPI
+        
+        test_app = FastAPI()
+        test_app.add_middleware(SecurityMiddleware, calls=1, period=60, max_ips=2)
+        
+        @test_app.get("/test")
+        async def test_endpoint():
+            return {"message": "test"}
+        
+        client = TestClient(test_app)
+        
+        # A single shard makes the eviction order deterministic
+        with patch('app.middleware.security_middleware.RATE_LIMIT_SHARDS', 1), \
+                patch('app.middleware.security_middleware.time.monotonic_ns', return_value=120_000_000_000):
+            for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.1", "10.0.0.3"):
+                client.get("/test", headers={"X-Forwarded-For": ip})
+            
+            # 10.0.0.1 was seen recently and is still limited; 10.0.0.2 was the
+            # least recent and got evicted, so it starts over
+            assert client.get("/test", headers={"X-Forwarded-For": "10.0.0.1"}).status_code == 429
+            assert client.get("/test", headers={"X-Forwarded-For": "10.0.0.2"}).status_code == 200
+
+
+class TestClientIp:
+    """Test client IP extraction shared by the security middleware."""
+    
+    @staticmethod
+    def _request(headers):
+        from starlette.requests import Request
+        
+        return Request({
+            "type": "http",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "client": ("127.0.0.1", 5000),
+        })
+    
+    def test_prefers_first_forwarded_address(self):
+        """Test that the first X-Forwarded-For hop wins over X-Real-IP."""
+        request = self._request({"X-Forwarded-For": " 10.0.0.1 , 10.0.0.2", "X-Real-IP": "10.0.0.3"})
+        
+        assert get_client_ip(request) == "10.0.0.1"
+    
+    def test_falls_back_to_real_ip_then_peer(self):
+        """Test the X-Real-IP and direct connection fallbacks."""
+        assert get_client_ip(self._request({"X-Real-IP": "10.0.0.3"})) == "10.0.0.3"
+        assert get_client_ip(self._request({})) == "127.0.0.1"
+    
+    def test_computed_once_per_request(self):
+        """Test that the IP is cached on request state."""
+        request = self._request({})
+        request.state.client_ip = "10.9.9.9"
+        
+        assert get_client_ip(request) == "10.9.9.9"
 
 
 class TestInputValidationMiddleware:
@@ -95,13 +178,173 @@ class TestInputValidationMiddleware:
         
         # This would typically be tested on a POST endpoint that accepts JSON
         # For now, we'll test the validation logic directly
-        from app.middleware.security_middleware import InputValidationMiddleware
         
-        middleware = InputValidationMiddleware(app)
+        middleware = SecurityMiddleware(app)
         
         # Test the malicious content detection
         assert middleware._contains_malicious_content("<script>alert('xss')</script>")
         assert not middleware._contains_malicious_content("Normal content")
+    
+    @pytest.mark.parametrize("content", [
+        "<iframe src='x'></iframe>",
+        "%3Cscript%3Ealert(1)%3C%2Fscript%3E",
+        "1 OR 1=1",
+        "name'; DROP TABLE users",
+        "x UNION SELECT password",
+    ])
+    def test_single_pass_detects_xss_and_sql(self, content):
+        """Test that the combined pattern catches both XSS and SQL injection."""
+        middleware = SecurityMiddleware(app)
+        
+        assert middleware._contains_malicious_content(content)
+    
+    def test_clean_content_skips_full_scan(self):
+        """Test that content without any trigger substring is not scanned."""
+        middleware = SecurityMiddleware(app)
+        middleware.malicious_db = None
+        middleware.malicious_regex = MagicMock()
+        
+        assert not middleware._contains_malicious_content('{"name": "python programming"}')
+        middleware.malicious_regex.search.assert_not_called()
+    
+    @pytest.mark.parametrize("content", [
+        "<SCRIPT src=x>",
+        "JavaScript:alert(1)",
+        "x onerror =1",
+        "%3Ciframe",
+        "1 Or 1 = 1",
+        "a' aNd 'b'='b",
+        "x -- y",
+        "x # y",
+        "/* y",
+        "DROP table",
+        "uNiOn   SeLeCt",
+    ])
+    def test_prescreen_passes_every_pattern_family(self, content):
+        """Test that the trigger prescreen never hides a real match."""
+        middleware = SecurityMiddleware(app)
+        middleware.malicious_db = None
+        
+        assert middleware._contains_malicious_content(content)
+    
+    @pytest.mark.parametrize("content", [
+        "on" * 100_000,
+        "OR " + "a" * 200_000,
+        "<iframe " + "x" * 200_000,
+    ])
+    def test_adversarial_input_scans_in_linear_time(self, content):
+        """Test that near-miss inputs cannot trigger catastrophic backtracking."""
+        middleware = SecurityMiddleware(app)
+        middleware.malicious_db = None
+        
+        start = time.perf_counter()
+        middleware._contains_malicious_content(content)
+        
+        assert time.perf_counter() - start < 1.0
+    
+    @pytest.mark.parametrize("content", [
+        "<script>alert('xss')</script>",
+        "1 OR 1=1",
+        "Normal content",
+        "python programming",
+    ])
+    def test_regex_fallback_matches_accelerated_scan(self, content):
+        """Test that the re fallback and the Hyperscan scan agree."""
+        middleware = SecurityMiddleware(app)
+        fallback = SecurityMiddleware(app)
+        fallback.malicious_db = None
+        
+        assert (
+            middleware._contains_malicious_content(content)
+            == fallback._contains_malicious_content(content)
+        )
+
+
+class TestInputValidationBodyStreaming:
+    """Test chunk-by-chunk request body scanning."""
+    
+    @staticmethod
+    def _make_app():
+        from fastapi import FastAPI, Request
+        
+        test_app = FastAPI()
+        test_app.add_middleware(SecurityMiddleware)
+        
+        @test_app.post("/echo")
+        async def echo(request: Request):
+            return {"body": (await request.body()).decode()}
+        
+        return test_app
+    
+    def test_blocks_malicious_body(self):
+        """Test that a malicious JSON body is rejected before the endpoint runs."""
+        client = TestClient(self._make_app())
+        
+        response = client.post("/echo", json={"name": "<script>alert('xss')</script>"})
+        
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "INVALID_INPUT"
+    
+    def test_rejects_mixed_case_body(self):
+        """Test that body matching is case-insensitive."""
+        client = TestClient(self._make_app())
+    
+        response = client.post("/echo", json={"name": "<ScRiPt>alert(1)</sCrIpT>"})
+    
+        assert response.status_code == 400
+        assert response.json()["error"]["code"] == "INVALID_INPUT"
+    
+    @pytest.mark.parametrize("stream_scan", [True, False])
+    def test_scans_non_utf8_body_as_bytes(self, stream_scan):
+        """Test that bodies are matched as raw bytes, without decoding them."""
+        import asyncio
+        
+        middleware = SecurityMiddleware(app)
+        if not stream_scan:
+            middleware.malicious_stream_db = None
+        
+        async def scan(body):
+            messages = iter([{"type": "http.request", "body": body, "more_body": False}])
+            
+            async def receive():
+                return next(messages)
+            
+            return await middleware._receive_and_scan_body(receive)
+        
+        assert asyncio.run(scan(b"\xff\xfe<script>"))[1]
+        assert not asyncio.run(scan(b"\xff\xfe plain bytes"))[1]
+    
+    def test_replays_clean_body_to_endpoint(self):
+        """Test that a clean body reaches the endpoint unchanged."""
+        client = TestClient(self._make_app())
+        
+        response = client.post("/echo", content=b'{"name": "python programming"}')
+        
+        assert response.status_code == 200
+        assert response.json()["body"] == '{"name": "python programming"}'
+    
+    @pytest.mark.parametrize("stream_scan", [True, False])
+    def test_detects_pattern_split_across_chunks(self, stream_scan):
+        """Test that a match spanning chunk and percent-escape boundaries is found."""
+        import asyncio
+        
+        middleware = SecurityMiddleware(app)
+        if not stream_scan:
+            middleware.malicious_stream_db = None
+        
+        messages = iter([
+            {"type": "http.request", "body": b"name=%3Cscr", "more_body": True},
+            {"type": "http.request", "body": b"ipt%", "more_body": True},
+            {"type": "http.request", "body": b"3Ex</script>", "more_body": False},
+        ])
+        
+        async def receive():
+            return next(messages)
+        
+        body, malicious = asyncio.run(middleware._receive_and_scan_body(receive))
+        
+        assert malicious
+        assert body.startswith(b"name=%3Cscr")
 
 
 class TestSecurityHeadersMiddleware:
@@ -130,6 +373,26 @@ class TestSecurityHeadersMiddleware:
         assert "default-src 'self'" in response.headers["Content-Security-Policy"]
 
 
+class TestSecurityHeadersApplied:
+    """Test security headers on a minimal app."""
+    
+    def test_headers_added_once(self):
+        """Test that every precomputed header is sent exactly once."""
+        from fastapi import FastAPI
+        
+        test_app = FastAPI()
+        test_app.add_middleware(SecurityMiddleware)
+        
+        @test_app.get("/test")
+        async def test_endpoint():
+            return {"message": "test"}
+        
+        response = TestClient(test_app).get("/test")
+        
+        for name, value in SecurityMiddleware.HEADERS.items():
+            assert response.headers.get_list(name) == [value]
+
+
 class TestAuditLogging:
     """Test audit logging functionality."""
     
@@ -150,6 +413,62 @@ class TestAuditLogging:
         assert mock_logger.info.called or response.status_code in [200, 401, 422]
 
 
+    @pytest.mark.parametrize("method,path,expected", [
+        ("POST", "/api/auth/login", True),
+        ("PUT", "/api/users/42", True),
+        ("DELETE", "/api/courses/7", True),
+        ("GET", "/api/users/42", False),
+        ("PUT", "/api/users", False),
+        ("POST", "/v2/api/users", False),
+    ])
+    def test_should_audit_matches_prefixes(self, method, path, expected):
+        """Test that audit matching is a per-method anchored prefix check."""
+        middleware = SecurityMiddleware(app)
+        
+        assert middleware._should_audit(method, path) is expected
+
+
+    def test_audit_record_queued_and_flushed_in_batch(self):
+        """Test that audited requests are queued, then written in one batch."""
+        from fastapi import FastAPI
+        from app.middleware import security_middleware
+        
+        while not security_middleware._audit_queue.empty():
+            security_middleware._audit_queue.get_nowait()
+        
+        test_app = FastAPI()
+        test_app.add_middleware(SecurityMiddleware)
+        
+        @test_app.post("/api/courses")
+        async def create_course():
+            return {"id": 1}
+        
+        client = TestClient(test_app)
+        client.post("/api/courses?draft=1")
+        client.post("/api/courses")
+        
+        records = [security_middleware._audit_queue.get_nowait() for _ in range(2)]
+        assert security_middleware._audit_queue.empty()
+        assert records[0]["path"] == "/api/courses"
+        assert records[0]["query_params"] == {"draft": "1"}
+        assert records[0]["status_code"] == 200
+        assert isinstance(records[0]["ts"], float)
+        
+        with patch('app.middleware.security_middleware.SessionLocal') as mock_session_local, \
+                patch('app.middleware.security_middleware.AuditService') as mock_audit_service, \
+                patch('app.middleware.security_middleware.security_logger') as mock_logger:
+            security_middleware._flush_audit_records(records)
+        
+        mock_audit_service.return_value.log_audit_events_bulk.assert_called_once_with(records)
+        assert all(isinstance(record["timestamp"], datetime) for record in records)
+        mock_session_local.return_value.close.assert_called_once()
+        assert mock_logger.info.call_count == 2
+        
+        logged = json.loads(mock_logger.info.call_args[0][1])
+        assert logged["path"] == "/api/courses"
+        assert logged["timestamp"].endswith("+00:00")
+
+
 @pytest.fixture
 def mock_redis():
     """Mock Redis for testing."""
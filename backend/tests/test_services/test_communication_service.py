@@ -0,0 +1,80 @@
+"""
+Unit tests for CommunicationService direct messages.
+"""
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+import app.models  # noqa: F401 - register every mapper
+import app.models.communication  # noqa: F401
+from app.models.user import User, UserRole
+from app.schemas.communication import MessageCreate
+from app.services.communication_service import CommunicationService
+
+
+@pytest.fixture
+def db():
+    """Session on an in-memory database with three learners."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.execute(insert(User), [
+        {
+            "id": user_id, "email": f"user{user_id}@example.com", "username": f"user{user_id}",
+            "first_name": "User", "last_name": str(user_id), "hashed_password": "x",
+            "role": UserRole.LEARNER
+        }
+        for user_id in (1, 2, 3)
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _send(db, sender_id, recipient_id, parent_message_id=None):
+    """Send a short direct message."""
+    return CommunicationService.send_direct_message(
+        db,
+        MessageCreate(
+            subject="Hello", content="Hello", recipient_id=recipient_id,
+            parent_message_id=parent_message_id
+        ),
+        sender_id
+    )
+
+
+class TestDirectMessages:
+    """Test cases for direct message threads."""
+
+    def test_reply_extends_parent_thread(self, db):
+        """Test that a reply by a participant joins the parent's thread."""
+        parent = _send(db, 1, 2)
+        reply = _send(db, 2, 1, parent_message_id=parent.id)
+
+        assert reply.thread_path == f"{parent.id}/{reply.id}/"
+
+    def test_reply_by_outsider_rejected(self, db):
+        """Test that a user outside a conversation cannot reply into it."""
+        parent = _send(db, 1, 2)
+
+        with pytest.raises(ValueError, match="Parent message not found"):
+            _send(db, 3, 1, parent_message_id=parent.id)
+
+    def test_reply_to_missing_parent_rejected(self, db):
+        """Test that replying to an unknown message fails."""
+        with pytest.raises(ValueError, match="Parent message not found"):
+            _send(db, 1, 2, parent_message_id=999)
+
+    def test_thread_only_shows_own_replies(self, db):
+        """Test that a thread lists only the replies the user sent or received."""
+        parent = _send(db, 1, 2)
+        reply = _send(db, 2, 1, parent_message_id=parent.id)
+        forwarded = _send(db, 2, 3, parent_message_id=reply.id)
+
+        _, replies = CommunicationService.get_message_thread(db, parent.id, 1)
+        assert [message.id for message in replies] == [reply.id]
+
+        _, replies = CommunicationService.get_message_thread(db, parent.id, 2)
+        assert [message.id for message in replies] == [reply.id, forwarded.id]
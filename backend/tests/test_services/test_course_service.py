@@ -9,7 +9,7 @@ from decimal import Decimal
 
 from app.services.course_service import CourseService
 from app.schemas.course import CourseCreate, CourseUpdate, CourseStatusUpdate
-from app.models.course import Course, CourseStatus, DifficultyLevel
+from app.models.course import Course, CourseCategory, CourseStatus, DifficultyLevel
 from app.models.user import User, UserRole
 from faker import Faker
 
@@ -285,4 +285,177 @@ class TestCourseService:
             course_service.create_course(course_data, test_instructor.id)
         
         assert exc_info.value.status_code == 400
-        assert "Price cannot be negative" in str(exc_info.value.detail)
\ No newline at end of file
+        assert "Price cannot be negative" in str(exc_info.value.detail)
+
+@pytest.fixture
+def memory_engine():
+    """In-memory database built with create_all, like init_db."""
+    from sqlalchemy import create_engine
+    from app.database import Base
+    import app.models  # noqa: F401 - register every mapper
+    import app.models.communication  # noqa: F401
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def memory_session(memory_engine):
+    """Session on the in-memory database, configured like SessionLocal."""
+    from sqlalchemy.orm import sessionmaker
+
+    session = sessionmaker(autocommit=False, autoflush=False, bind=memory_engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def totals_db(memory_session):
+    """An instructor and an empty course."""
+    session = memory_session
+    instructor = User(
+        email="totals@example.com", username="totals", first_name="Totals", last_name="Instructor",
+        hashed_password="x", role=UserRole.INSTRUCTOR
+    )
+    session.add(instructor)
+    session.flush()
+    course = Course(title="Totals", description="Totals", instructor_id=instructor.id)
+    session.add(course)
+    session.commit()
+    return session, course, instructor
+
+
+class TestCourseTotals:
+    """Test cases for section and course totals kept by the lecture triggers."""
+
+    def test_totals_follow_lecture_changes(self, totals_db):
+        """Test that creating, updating and deleting lectures keeps the totals."""
+        from app.schemas.course import LectureCreate, LectureUpdate, SectionCreate
+
+        session, course, instructor = totals_db
+        service = CourseService(session)
+        section = service.create_section(course.id, SectionCreate(title="Intro"), instructor.id)
+
+        first = service.create_lecture(section.id, LectureCreate(title="One", duration=10), instructor.id)
+        service.create_lecture(section.id, LectureCreate(title="Two", duration=5), instructor.id)
+        session.refresh(section)
+        session.refresh(course)
+        assert (section.total_duration, section.total_lectures) == (15, 2)
+        assert (course.total_duration, course.total_lectures) == (15, 2)
+
+        service.update_lecture(first.id, LectureUpdate(duration=20), instructor.id)
+        session.refresh(course)
+        assert (course.total_duration, course.total_lectures) == (25, 2)
+
+        service.delete_lecture(first.id, instructor.id)
+        session.refresh(section)
+        session.refresh(course)
+        assert (section.total_duration, section.total_lectures) == (5, 1)
+        assert (course.total_duration, course.total_lectures) == (5, 1)
+
+        service.delete_section(section.id, instructor.id)
+        session.refresh(course)
+        assert (course.total_duration, course.total_lectures) == (0, 0)
+
+
+class TestCategoryPaths:
+    """Test cases for materialized category paths."""
+
+    def _add_unpathed_category(self, session, name, parent_id=None):
+        """Insert a category the way the old seed did, with no path."""
+        from sqlalchemy import insert
+
+        return session.execute(
+            insert(CourseCategory).values(name=name, parent_id=parent_id)
+        ).inserted_primary_key[0]
+
+    def test_seeded_categories_have_paths(self, memory_engine, monkeypatch):
+        """Test that init_db seeds root categories with their own id as path."""
+        from sqlalchemy import select
+        from app import init_db
+
+        monkeypatch.setattr(init_db, "engine", memory_engine)
+        assert init_db.seed_initial_data()
+
+        with memory_engine.connect() as conn:
+            rows = conn.execute(select(CourseCategory.id, CourseCategory.path)).all()
+        assert rows
+        assert all(path == f"{category_id}/" for category_id, path in rows)
+
+    def test_create_under_unpathed_parent(self, memory_session):
+        """Test that a child of a category without a path gets the full path."""
+        from app.schemas.course import CourseCategoryCreate
+
+        root_id = self._add_unpathed_category(memory_session, "Root")
+        service = CourseService(memory_session)
+
+        child = service.create_category(CourseCategoryCreate(name="Child", parent_id=root_id))
+
+        assert child.path == f"{root_id}/{child.id}/"
+        assert service.get_category_by_id(root_id).path == f"{root_id}/"
+
+    def test_move_under_unpathed_parent(self, memory_session):
+        """Test that moving under a category without a path rebuilds it instead of failing."""
+        from app.schemas.course import CourseCategoryCreate, CourseCategoryUpdate
+
+        root_id = self._add_unpathed_category(memory_session, "Root")
+        nested_id = self._add_unpathed_category(memory_session, "Nested", parent_id=root_id)
+        service = CourseService(memory_session)
+        moved = service.create_category(CourseCategoryCreate(name="Moved"))
+        leaf = service.create_category(CourseCategoryCreate(name="Leaf", parent_id=moved.id))
+
+        service.update_category(moved.id, CourseCategoryUpdate(parent_id=nested_id))
+
+        memory_session.refresh(leaf)
+        assert moved.path == f"{root_id}/{nested_id}/{moved.id}/"
+        assert leaf.path == f"{root_id}/{nested_id}/{moved.id}/{leaf.id}/"
+
+    def test_move_unpathed_category_with_child(self, memory_session):
+        """Test that moving a category without a path carries its subtree along."""
+        from sqlalchemy import update
+        from app.schemas.course import CourseCategoryCreate, CourseCategoryUpdate
+
+        service = CourseService(memory_session)
+        root = service.create_category(CourseCategoryCreate(name="Root"))
+        moved = service.create_category(CourseCategoryCreate(name="Moved", parent_id=root.id))
+        child = service.create_category(CourseCategoryCreate(name="Child", parent_id=moved.id))
+        memory_session.execute(update(CourseCategory).where(CourseCategory.id == moved.id).values(path=None))
+        memory_session.commit()
+
+        service.update_category(moved.id, CourseCategoryUpdate(parent_id=None))
+
+        memory_session.refresh(moved)
+        memory_session.refresh(child)
+        assert moved.path == f"{moved.id}/"
+        assert child.path == f"{moved.id}/{child.id}/"
+        assert set(memory_session.scalars(service.get_category_subtree_ids(moved.id))) == {moved.id, child.id}
+
+    def test_move_under_own_subtree_rejected(self, memory_session):
+        """Test that a category cannot be moved below one of its descendants."""
+        from app.schemas.course import CourseCategoryCreate, CourseCategoryUpdate
+
+        service = CourseService(memory_session)
+        root = service.create_category(CourseCategoryCreate(name="Root"))
+        child = service.create_category(CourseCategoryCreate(name="Child", parent_id=root.id))
+
+        with pytest.raises(HTTPException) as exc_info:
+            service.update_category(root.id, CourseCategoryUpdate(parent_id=child.id))
+
+        assert exc_info.value.status_code == 400
+
+    def test_subtree_filtering(self, memory_session):
+        """Test that a subtree covers the category and its descendants only."""
+        from app.schemas.course import CourseCategoryCreate
+
+        service = CourseService(memory_session)
+        root = service.create_category(CourseCategoryCreate(name="Root"))
+        child = service.create_category(CourseCategoryCreate(name="Child", parent_id=root.id))
+        grandchild = service.create_category(CourseCategoryCreate(name="Grandchild", parent_id=child.id))
+        other = service.create_category(CourseCategoryCreate(name="Other"))
+
+        subtree = set(memory_session.scalars(service.get_category_subtree_ids(root.id)))
+        assert subtree == {root.id, child.id, grandchild.id}
+        assert set(memory_session.scalars(service.get_category_subtree_ids(child.id))) == {child.id, grandchild.id}
+        assert other.id not in subtree
@@ -0,0 +1,198 @@
+"""
+Unit tests for LegalService.
+"""
+import pytest
+from fastapi import HTTPException
+from datetime import datetime
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.legal import DocumentType, LegalDocument, UserPolicyAcceptance
+from app.models.user import User
+from app.schemas.legal import LegalDocumentUpdate
+from app.services.legal_service import LegalService, current_documents_cache
+
+
+@pytest.fixture
+def session():
+    """Create an in-memory database holding one published privacy policy."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[
+        User.__table__, LegalDocument.__table__, UserPolicyAcceptance.__table__
+    ])
+    db = sessionmaker(bind=engine)()
+    db.add(LegalDocument(
+        document_type=DocumentType.PRIVACY_POLICY,
+        title="Privacy Policy",
+        slug="privacy",
+        content="Privacy",
+        effective_date=datetime(2024, 1, 1),
+        is_published=True,
+        created_by=1
+    ))
+    db.commit()
+    current_documents_cache.invalidate()
+
+    yield engine, db
+
+    db.close()
+    engine.dispose()
+    current_documents_cache.invalidate()
+
+
+class TestCurrentDocumentCache:
+    """Test cases for the cached current documents."""
+
+    def test_repeated_reads_hit_the_cache(self, session):
+        """Test that only the first read queries the database."""
+        engine, db = session
+        service = LegalService(db)
+        queries = []
+        event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+        for _ in range(3):
+            document = service.get_current_document(DocumentType.PRIVACY_POLICY)
+            assert document.title == "Privacy Policy"
+        assert service.get_document_by_slug("privacy").slug == "privacy"
+        assert service.get_current_document(DocumentType.TERMS_OF_SERVICE) is None
+
+        assert len(queries) == 1
+
+    def test_document_writes_invalidate_the_cache(self, session):
+        """Test that updating or adding a document is seen on the next read."""
+        _, db = session
+        service = LegalService(db)
+        assert len(service.get_current_documents()) == 1
+
+        db.query(LegalDocument).one().title = "Updated Privacy Policy"
+        db.add(LegalDocument(
+            document_type=DocumentType.TERMS_OF_SERVICE,
+            title="Terms",
+            slug="terms",
+            content="Terms",
+            effective_date=datetime(2024, 1, 1),
+            is_published=True,
+            created_by=1
+        ))
+        db.commit()
+
+        assert service.get_current_document(DocumentType.PRIVACY_POLICY).title == "Updated Privacy Policy"
+        assert service.get_current_document(DocumentType.TERMS_OF_SERVICE).slug == "terms"
+
+    def test_cache_invalidated_on_commit_only(self, session):
+        """Test that uncommitted and rolled back writes leave the cached rows in place."""
+        _, db = session
+        service = LegalService(db)
+        assert service.get_current_document(DocumentType.PRIVACY_POLICY).title == "Privacy Policy"
+
+        # Reloading here would read the flushed row through the writer's own transaction
+        db.query(LegalDocument).one().title = "Draft Title"
+        db.flush()
+        assert service.get_current_document(DocumentType.PRIVACY_POLICY).title == "Privacy Policy"
+        db.rollback()
+        assert service.get_current_document(DocumentType.PRIVACY_POLICY).title == "Privacy Policy"
+
+        db.query(LegalDocument).one().title = "Committed Title"
+        db.commit()
+        assert service.get_current_document(DocumentType.PRIVACY_POLICY).title == "Committed Title"
+
+    def test_unpublished_documents_are_not_served(self, session):
+        """Test that drafts never appear among the current documents."""
+        _, db = session
+        db.add(LegalDocument(
+            document_type=DocumentType.COOKIE_POLICY,
+            title="Cookies",
+            slug="cookies",
+            content="Cookies",
+            effective_date=datetime(2024, 1, 1),
+            created_by=1
+        ))
+        db.commit()
+
+        assert LegalService(db).get_current_document(DocumentType.COOKIE_POLICY) is None
+
+
+class TestCurrentDocumentUniqueness:
+    """Test cases for the one-current-document constraint."""
+
+    def test_second_current_document_is_rejected(self, session):
+        """Test that the database refuses two current documents with one slug."""
+        _, db = session
+        db.add(LegalDocument(
+            document_type=DocumentType.PRIVACY_POLICY,
+            title="Privacy Policy",
+            slug="privacy",
+            content="Privacy",
+            effective_date=datetime(2024, 1, 1),
+            created_by=1
+        ))
+
+        with pytest.raises(IntegrityError):
+            db.commit()
+
+    def test_new_version_replaces_current_document(self, session):
+        """Test that a new version takes over as the only current document."""
+        _, db = session
+        current = db.query(LegalDocument).one()
+
+        new_version = LegalService(db).create_new_version(current.id, LegalDocumentUpdate(), created_by=1)
+
+        assert new_version.current_slug == "privacy"
+        assert current.current_slug is None
+
+
+class TestDocumentVersions:
+    """Test cases for the root_id version chain."""
+
+    def test_first_version_is_its_own_root(self, session):
+        """Test that a first version points root_id at itself."""
+        _, db = session
+        document = db.query(LegalDocument).one()
+
+        assert document.root_id == document.id
+
+    def test_new_versions_share_the_root(self, session):
+        """Test that every revision keeps the first version's root_id."""
+        _, db = session
+        service = LegalService(db)
+        first = db.query(LegalDocument).one()
+
+        second = service.create_new_version(first.id, LegalDocumentUpdate(), created_by=1)
+        third = service.create_new_version(second.id, LegalDocumentUpdate(), created_by=1)
+
+        assert second.root_id == third.root_id == first.id
+        assert [version.id for version in third.versions] == [first.id, second.id, third.id]
+
+    def test_root_is_copied_without_the_service(self, session):
+        """Test that a revision added directly still inherits its root."""
+        _, db = session
+        first = db.query(LegalDocument).one()
+        first.is_current = False
+        revision = LegalDocument(
+            document_type=DocumentType.PRIVACY_POLICY,
+            title="Privacy Policy",
+            slug="privacy",
+            content="Privacy v2",
+            effective_date=datetime(2024, 6, 1),
+            previous_version_id=first.id,
+            created_by=1
+        )
+        db.add(revision)
+        db.commit()
+
+        assert revision.root_id == first.id
+
+    def test_document_with_later_versions_is_not_deleted(self, session):
+        """Test that deleting a replaced version is refused instead of cascading."""
+        _, db = session
+        service = LegalService(db)
+        first = db.query(LegalDocument).one()
+        first.is_published = False
+        db.commit()
+        service.create_new_version(first.id, LegalDocumentUpdate(), created_by=1)
+
+        with pytest.raises(HTTPException):
+            service.delete_document(first.id)
+        assert db.query(LegalDocument).count() == 2
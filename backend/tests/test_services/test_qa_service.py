@@ -0,0 +1,67 @@
+"""
+Unit tests for Q&A question listing.
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+import app.models  # noqa: F401 - register every mapper
+import app.models.communication  # noqa: F401
+from app.models.course import Course, Lecture, Section
+from app.models.interaction import QAQuestion
+from app.models.user import User, UserRole
+from app.routers.qa import get_questions
+
+
+@pytest.fixture
+def db():
+    """Session on an in-memory database with three questions asked at the same instant."""
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    session.execute(insert(User).values(
+        id=1, email="instructor@example.com", username="instructor", first_name="Course",
+        last_name="Instructor", hashed_password="x", role=UserRole.INSTRUCTOR
+    ))
+    session.execute(insert(Course).values(id=1, title="Course", description="Course", instructor_id=1))
+    session.execute(insert(Section).values(id=1, title="Intro", course_id=1))
+    session.execute(insert(Lecture).values(id=1, title="One", section_id=1))
+    asked_at = datetime(2026, 1, 1, 12, 0, 0)
+    session.execute(insert(QAQuestion), [
+        {"id": question_id, "user_id": 1, "lecture_id": 1, "title": "Question", "content": "Question", "created_at": asked_at}
+        for question_id in (1, 2, 3)
+    ])
+    session.commit()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def _list(db, page=1, cursor=None):
+    """Call the list endpoint for two questions per page."""
+    return asyncio.run(get_questions(
+        lecture_id=None, course_id=None, is_answered=None, is_featured=None, search=None,
+        page=page, per_page=2, cursor=cursor, db=db, current_user=db.get(User, 1)
+    ))
+
+
+class TestQuestionCursorPaging:
+    """Test cases for walking questions by cursor."""
+
+    def test_cursor_walks_ties_by_id(self, db):
+        """Test that cursor pages split equal created_at values on id, without repeats."""
+        first = _list(db)
+        assert [question.id for question in first.questions] == [3, 2]
+        assert first.page == 1
+        assert first.has_next and not first.has_prev
+
+        second = _list(db, cursor=first.next_cursor)
+        assert [question.id for question in second.questions] == [1]
+        assert second.page is None and second.total_pages is None
+        assert second.has_prev
+        assert not second.has_next
+        assert second.next_cursor is None
@@ -0,0 +1,90 @@
+"""
+Unit tests for SystemSettingsService.
+"""
+import pytest
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import sessionmaker
+
+import app.models.communication  # noqa: F401  (models User's relationships point at)
+from app.models.system_settings import SettingType, SystemSetting
+from app.services.system_settings_service import SystemSettingsService, public_settings_cache
+
+
+@pytest.fixture
+def session():
+    """Create an in-memory database holding public, private and site settings."""
+    engine = create_engine("sqlite://")
+    SystemSetting.__table__.create(engine)
+    db = sessionmaker(bind=engine)()
+    for key, setting_type, is_public, value in [
+        ("site_name", SettingType.SITE_CONFIGURATION, True, "LMS"),
+        ("site_theme", SettingType.SITE_CONFIGURATION, False, {"primary": "#000000"}),
+        ("branding_logo", SettingType.BRANDING, True, "/logo.png"),
+        ("security_secret", SettingType.SECURITY, False, "hidden"),
+    ]:
+        setting = SystemSetting(
+            setting_key=key,
+            setting_type=setting_type,
+            display_name=key,
+            is_public=is_public
+        )
+        setting.value = value
+        db.add(setting)
+    db.commit()
+    public_settings_cache.invalidate()
+
+    yield engine, db
+
+    db.close()
+    engine.dispose()
+    public_settings_cache.invalidate()
+
+
+class TestSettingValue:
+    """Test cases for the value hybrid property."""
+
+    def test_value_is_selectable(self, session):
+        """Test that values can be selected and filtered in SQL."""
+        _, db = session
+        rows = db.execute(
+            select(SystemSetting.setting_key, SystemSetting.value)
+            .where(SystemSetting.value == "LMS")
+        ).all()
+
+        assert rows == [("site_name", "LMS")]
+
+    def test_value_expression_casts_json_on_mysql(self):
+        """Test that JSON values are cast to text ahead of string values."""
+        sql = str(select(SystemSetting.value).compile(dialect=mysql.dialect()))
+
+        assert "coalesce(nullif(CAST(system_settings.json_value AS CHAR), %s), system_settings.string_value)" in sql
+
+
+class TestPublicSettingsCache:
+    """Test cases for the cached public settings."""
+
+    def test_public_settings_served_from_cache(self, session):
+        """Test that public and site settings load once and keep JSON values."""
+        engine, db = session
+        service = SystemSettingsService(db)
+        queries = []
+        event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+        for _ in range(3):
+            public = {setting.setting_key: setting.value for setting in service.get_public_settings()}
+            config = service.get_site_configuration()
+
+        assert public == {"branding_logo": "/logo.png", "site_name": "LMS"}
+        assert config == {"name": "LMS", "theme": {"primary": "#000000"}}
+        assert len(queries) == 1
+
+    def test_setting_writes_invalidate_the_cache(self, session):
+        """Test that an updated setting is seen on the next read."""
+        _, db = session
+        service = SystemSettingsService(db)
+        assert service.get_site_configuration()["name"] == "LMS"
+
+        service.update_setting_by_key("site_name", "Academy")
+
+        assert service.get_site_configuration()["name"] == "Academy"